@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+
+def hash_document(*parts) -> str:
+    """
+    Get the SHA-256 hash of JSON values, independent of the order of the keys of objects.
+    """
+    document_hash = hashlib.sha256()
+
+    for part in parts:
+        document_hash.update(json.dumps(part, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8"))
+        document_hash.update(b"\0")
+
+    return document_hash.hexdigest()
+
+
+class ResultCache:
+    """
+    The results of converted specs by content hash, shared by every conversion inside a long running process
+
+    The least recently used results are dropped once the cache is full. The cache can be used from multiple threads.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize cache
+
+        Arguments:
+        max_entries -- The maximum amount of results kept in memory
+        """
+        self.max_entries: int = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: str):
+        """
+        Get a result, or None if it is not cached.
+        """
+        with self.__lock:
+            if key not in self.__entries:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.__entries.move_to_end(key)
+
+            return self.__entries[key]
+
+    def put(self, key: str, value):
+        """
+        Cache a result, dropping the least recently used result if the cache is full.
+        """
+        with self.__lock:
+            self.__entries[key] = value
+            self.__entries.move_to_end(key)
+
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drop every result.
+        """
+        with self.__lock:
+            self.__entries.clear()
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import copy
+import glob
+import json
+import os
+
+from app.utils.errors import InvalidOpenAPIError
+
+# The default configuration files shipped with the converter (app/config)
+DEFAULT_CONFIG_FOLDER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config")
+
+# The filenames of the configuration files that can be customized
+CONFIG_FILENAMES = ("endpoint.json", "backend.json", "krakend.json", "Dockerfile")
+
+# The default configuration files never change while running, so they are read once per process
+_default_cache: dict = {}
+
+
+class ConverterConfig:
+    """
+    The KrakenD configuration fragments used by the converter
+
+    Every configuration file is read once and cached. Custom configuration files inside the `config` folder of the
+    input folder take precedence over the default configuration files. Custom configuration can also be given in memory,
+    in which case no `config` folder is read.
+    """
+
+    def __init__(self, input_folder_path: str | None = None, files: dict | None = None, flat: bool = False,
+                 multiple_envs: bool = False):
+        """
+        Initialize configuration
+
+        Arguments:
+        input_folder_path -- The path of the input folder that may contain a `config` folder with custom configuration
+        files -- Custom configuration by filename, used instead of a `config` folder (e.g. {"backend.json": {...},
+                 "Dockerfile": "FROM ..."})
+        flat -- Use the default Dockerfile for a flat krakend.json, which does not render templates
+        multiple_envs -- Use the default Dockerfile for the settings of multiple environments, which picks the
+                         environment using a build argument
+        """
+        self.flat: bool = flat
+        self.multiple_envs: bool = multiple_envs
+        self.__cache: dict = {}
+
+        if files is not None:
+            for filename, content in files.items():
+                self.__verify_file(filename, content)
+
+            self.custom_folder_path: str | None = None
+            self.custom_files: list = list(files)
+            self.__cache.update(files)
+        elif input_folder_path is not None:
+            self.custom_folder_path = os.path.join(input_folder_path, "config")
+            self.custom_files = [os.path.basename(path) for path in glob.glob(f"{self.custom_folder_path}/*")]
+        else:
+            self.custom_folder_path = None
+            self.custom_files = []
+
+    def is_custom(self, filename: str) -> bool:
+        """
+        Check if a custom configuration file is used instead of the default one.
+        """
+        return filename in self.custom_files
+
+    def get_path(self, filename: str) -> str | None:
+        """
+        Get the path of the configuration file that is used, or None if it has been given in memory.
+        """
+        if self.is_custom(filename):
+            return os.path.join(self.custom_folder_path, filename) if self.custom_folder_path is not None else None
+
+        return os.path.join(DEFAULT_CONFIG_FOLDER_PATH, filename)
+
+    @property
+    def endpoint(self) -> dict:
+        """
+        The configuration for the `endpoint` section of an endpoint (endpoint.json)
+        """
+        return self.__load("endpoint.json")
+
+    @property
+    def backend(self) -> dict:
+        """
+        The configuration for the `backend` section of an endpoint (backend.json)
+        """
+        return self.__load("backend.json")
+
+    @property
+    def krakend(self) -> dict:
+        """
+        The general KrakenD configuration (krakend.json)
+        """
+        return self.__load("krakend.json")
+
+    @property
+    def dockerfile_path(self) -> str | None:
+        """
+        The path of the Dockerfile that is copied to the output folder, or None if it has been given in memory
+        """
+        if self.flat and not self.is_custom("Dockerfile"):
+            return os.path.join(DEFAULT_CONFIG_FOLDER_PATH, "Dockerfile.flat")
+
+        if self.multiple_envs and not self.is_custom("Dockerfile"):
+            return os.path.join(DEFAULT_CONFIG_FOLDER_PATH, "Dockerfile.envs")
+
+        return self.get_path("Dockerfile")
+
+    @property
+    def dockerfile(self) -> str:
+        """
+        The contents of the Dockerfile
+        """
+        if "Dockerfile" not in self.__cache:
+            with open(self.dockerfile_path, "r", encoding="utf-8", newline="") as dockerfile:
+                self.__cache["Dockerfile"] = dockerfile.read()
+
+        return self.__cache["Dockerfile"]
+
+    @staticmethod
+    def merge(target: dict, fragment: dict) -> dict:
+        """
+        Merge a cached configuration fragment into the target.
+
+        The values are copied so the cached fragment can never be modified through the target.
+        """
+        for key in fragment:
+            target[key] = copy.deepcopy(fragment[key])
+
+        return target
+
+    def __load(self, filename: str) -> dict:
+        """
+        Load a JSON configuration file, or return it from the cache if it has been loaded before.
+
+        If a custom configuration file can not be read or is not valid JSON an InvalidOpenAPIError is raised, so a
+        half-written file is reported like an invalid OpenAPI file.
+        """
+        if filename not in self.__cache:
+            if self.is_custom(filename):
+                try:
+                    with open(self.get_path(filename), "r", encoding="utf-8") as config_file:
+                        self.__cache[filename] = json.load(config_file)
+                except (OSError, ValueError) as error:
+                    raise InvalidOpenAPIError(f"config/{filename}: {error}") from error
+            else:
+                if filename not in _default_cache:
+                    with open(self.get_path(filename), "r", encoding="utf-8") as config_file:
+                        _default_cache[filename] = json.load(config_file)
+
+                self.__cache[filename] = _default_cache[filename]
+
+        return self.__cache[filename]
+
+    @staticmethod
+    def __verify_file(filename: str, content):
+        """
+        Verify that a configuration file given in memory is known and has the right type.
+
+        If the verification fails a ValueError is raised.
+        """
+        if filename not in CONFIG_FILENAMES:
+            raise ValueError(f"Unknown configuration file '{filename}', expected one of {', '.join(CONFIG_FILENAMES)}")
+
+        expected = str if filename == "Dockerfile" else dict
+
+        if not isinstance(content, expected):
+            raise ValueError(f"Configuration file '{filename}' should be a {expected.__name__}")
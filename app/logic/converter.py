@@ -1,14 +1,56 @@
 from __future__ import annotations
 
-import glob
+import io
 import json
 import os
-import re
-import shutil
-
-from app.utils.customlogger import CustomLogger
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import TextIO
+
+from app.logic.cache import ResultCache, hash_document
+from app.logic.config import ConverterConfig
+from app.logic.encoding import is_manipulated, select_encoding
+from app.logic.emitter import FileSink, ListEmitter
+from app.logic.filtering import FILTERING_FIELDS, SchemaFlattener, get_allow_list
+from app.logic.loader import find_specs
+from app.logic.manifest import BuildManifest, FileHashCache
+from app.logic.options import ConverterOptions
+from app.logic.profiler import Profiler
+from app.logic.qos import get_endpoint_qos, merge_qos
+from app.logic.routes import RouteIndex
+from app.logic.spec import OpenAPISpec
+from app.logic.validation import validate_openapi
+from app.logic.writer import ConfigWriter, get_target_backend, get_template_path
+from app.utils.customlogger import CustomLogger, configure_logging
 from app.utils.errors import InvalidOpenAPIError, OpenAPIFileNotFoundError
 
+# The keys of a path item that contain an operation
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# The converter used by the current worker process of the process pool
+_worker: dict = {}
+
+
+def _init_worker(converter: OpenAPIToKrakenD):
+    """
+    Store the converter inside the worker process so it only has to be sent to every worker once.
+    """
+    _worker["converter"] = converter
+
+
+def _convert_spec_in_worker(path: str) -> tuple:
+    """
+    Convert a single OpenAPI file inside a worker process.
+
+    Only a summary of the spec is sent back to the main process, to avoid transferring the full document, together with
+    the profiler measurements of the spec.
+    """
+    converter = _worker["converter"]
+    spec = converter.convert_spec(path)
+
+    return spec.summary(), converter.profiler.pop_spec(spec.filename)
+
 
 # Disable pylint too-few-public-methods due to the converter only requiring one public method to work.
 # pylint: disable=too-few-public-methods
@@ -21,100 +63,525 @@ class OpenAPIToKrakenD:
     # pylint: disable=too-many-instance-attributes
     # Disable pylint too-many-arguments due to required attributes for the converter to work.
     # pylint: disable=too-many-arguments
-    def __init__(self, logging_mode: int, input_folder_path: str, output_folder_path: str, no_versioning: bool = False,
-                 env: str = None):
+    def __init__(self, logging_mode: int, input_folder_path: str | None, output_folder_path: str | None,
+                 no_versioning: bool = False, env: str | list = None, *, options: ConverterOptions | None = None,
+                 sink=None, config: ConverterConfig | None = None, cache: ResultCache | None = None, **overrides):
         """
         Initialize converter
 
         Arguments:
         logging_mode -- The logging mode used. Use the logging mode from the python logging library
-        input_folder_path -- The path of the input folder that contains the OpenAPI specifications
-        output_folder_path -- The path of the output folder where the configuration gets generated
-        env -- Set the backend target URL to the description of the server object inside the OpenAPI specification
-               (picks the first entry if not specified)
+        input_folder_path -- The path of the input folder that contains the OpenAPI specifications (None when only
+                             converting documents using `convert_documents`)
+        output_folder_path -- The path of the output folder where the configuration gets generated (None when a sink
+                              is given)
         no_versioning -- Disable automatic versioning based on the OpenAPI specification
-        """
+        env -- Set the backend target URL to the description of the server object inside the OpenAPI specification
+               (picks the first entry if not specified). Given a list of environments, the settings of every
+               environment are written to config/settings/<env>/service.json in a single pass
+        options -- The other options of the conversion (see app.logic.options.ConverterOptions), the defaults if not
+                   given
+        sink -- Where the generated files are written to (see app.logic.emitter), the output folder by default
+        config -- The KrakenD configuration fragments, read from the input folder by default
+        cache -- Reuse the results of documents converted before with the same content, options and configuration
+                 (only used by `convert_documents`)
+        overrides -- Options given by name instead, overriding `options` (e.g. flat=True)
+
+        If the options can not be combined a ValueError is raised.
+        """
+        if no_versioning:
+            overrides["no_versioning"] = no_versioning
+        if env is not None:
+            overrides["env"] = env
+
+        self.options: ConverterOptions = replace(options or ConverterOptions(), **overrides)
+
+        self.logging_mode: int = logging_mode
         self.logger = CustomLogger(logging_mode)
 
-        self.paths: list = glob.glob(f"{input_folder_path}/*.json")
-        self.config_paths: list = glob.glob(f"{input_folder_path}/config/*")
+        if self.options.incremental and (self.options.flat or self.options.sharded):
+            self.logger.warning("Flat and sharded configurations are always generated completely, ignoring incremental")
+
+        self.paths: list = find_specs(input_folder_path) if input_folder_path is not None else []
         self.files: list = []
-        self.config_files: list = []
-        self.input_folder_path: str = input_folder_path
-        self.output_folder_path: str = output_folder_path
+        self.specs: list[OpenAPISpec] = []
+        self.config: ConverterConfig = config if config is not None else \
+            ConverterConfig(input_folder_path, flat=self.options.flat, multiple_envs=self.options.multiple_envs)
+        self.input_folder_path: str | None = input_folder_path
+        self.output_folder_path: str | None = output_folder_path
+        self.sink = sink if sink is not None else FileSink(output_folder_path)
+
+        self.manifest: BuildManifest | None = None
+        self.hashes: FileHashCache = FileHashCache()
+
+        self.cache: ResultCache | None = cache
+
+        self.profiler: Profiler = Profiler(self.options.profile)
+
+    def __getstate__(self):
+        """
+        Exclude the logger when sending the converter to a worker process.
+        """
+        state = self.__dict__.copy()
+        del state["logger"]
+        return state
 
-        self.env = env
+    def __setstate__(self, state):
+        """
+        Recreate the logger inside the worker process, writing the log format of the run.
+        """
+        self.__dict__.update(state)
 
-        self.versioning: bool = not no_versioning
+        configure_logging(self.options.log_format)
+        self.logger = CustomLogger(self.logging_mode)
+
+    def reload(self, reload_config: bool = False):
+        """
+        Search the input folder for OpenAPI files again, and optionally reload the configuration files.
+        """
+        self.paths = find_specs(self.input_folder_path)
+
+        if reload_config:
+            self.config = ConverterConfig(self.input_folder_path, flat=self.options.flat,
+                                          multiple_envs=self.options.multiple_envs)
 
     def convert(self) -> OpenAPIToKrakenD:
         """
         Convert OpenAPI files to a flexible KrakenD configuration.
+
+        When converting incrementally, the manifest of the previous conversion by this converter is kept in memory,
+        so calling convert() again only parses the OpenAPI files that changed in between.
         """
-        for path in self.paths:
-            self.files.append(os.path.basename(path))
+        self.profiler.start()
+
+        try:
+            self.__convert()
+        except BaseException:
+            self.sink.discard()
+            raise
+        finally:
+            self.profiler.stop()
+
+        return self
+
+    def convert_documents(self, documents: dict) -> OpenAPIToKrakenD:
+        """
+        Convert already parsed OpenAPI specifications instead of the files inside the input folder.
+
+        The documents are a mapping of a filename (e.g. "F1.V1.json") to the parsed specification, converted in order.
+        External $ref pointers can not be resolved, as the documents have no location. The documents are never
+        modified.
+        """
+        self.profiler.start()
 
-        if len(self.paths) <= 0:
-            raise OpenAPIFileNotFoundError(f"No files found in '{self.input_folder_path}'")
+        try:
+            self.__convert(documents)
+        except BaseException:
+            self.sink.discard()
+            raise
+        finally:
+            self.profiler.stop()
 
-        if len(self.config_paths) > 0:
+        return self
+
+    def __convert(self, documents: dict | None = None):
+        """
+        Run every phase of the conversion, either of the files inside the input folder or of the given documents.
+        """
+        self.files = [os.path.basename(path) for path in self.paths] if documents is None else list(documents)
+        self.specs = []
+
+        if len(self.files) <= 0:
+            raise OpenAPIFileNotFoundError(f"No files found in '{self.input_folder_path}'" if documents is None
+                                           else "No OpenAPI specifications given")
+
+        self.__verify_template_names()
+
+        if len(self.config.custom_files) > 0:
             self.logger.info("Using custom configuration files")
-            for config_path in self.config_paths:
-                self.config_files.append(os.path.basename(config_path))
 
-        self.logger.info("Verifying OpenAPI files")
-        for file in self.files:
-            self.logger.info(f"Verifying {file}")
-            self.__verify_openapi(file)
-            self.logger.info(f"Verified {file}")
-        self.logger.info("Verified OpenAPI files")
+        manifest, previous_manifest = self.__load_manifests()
+        writer = ConfigWriter(self.config, self.options, self.logger, self.profiler)
 
         self.logger.info("Creating folders")
-        self.__create_folders()
+        with self.profiler.phase("create_folders"):
+            # Every shard gets its own folders, once the specs have been assigned to the shards
+            if not self.options.sharded:
+                writer.create_folders(self.sink)
+            self.sink.begin()
         self.logger.info("Created folder")
 
+        self.__convert_all(documents, manifest, previous_manifest)
+
+        writer.write(self.specs, self.sink, manifest, previous_manifest)
+
+        self.__publish()
+
+        if self.options.incremental:
+            with self.profiler.phase("manifest"):
+                manifest.save(self.output_folder_path)
+            self.manifest = manifest
+
+    def __load_manifests(self) -> tuple:
+        """
+        Create the manifest of the current build, and get the manifest of the previous build when building
+        incrementally.
+        """
+        with self.profiler.phase("manifest"):
+            manifest = self.__new_manifest()
+            previous_manifest = None
+            # A flat krakend.json contains the endpoints of every spec, so it is always built completely. So are shards,
+            # as adding a spec can move other specs to another shard
+            if self.options.incremental and not self.options.flat and not self.options.sharded:
+                previous_manifest = self.manifest or BuildManifest.load(self.output_folder_path)
+
+                if previous_manifest is None:
+                    self.logger.info("No previous build found, generating all files")
+
+        return manifest, previous_manifest
+
+    def __convert_all(self, documents: dict | None, manifest: BuildManifest, previous_manifest: BuildManifest | None):
+        """
+        Convert every spec, and verify the specs together.
+        """
         self.logger.info("Writing endpoint files")
-        for file in self.files:
-            self.logger.info(f"Writing {file[:-5]}.tmpl")
-            self.__format_endpoints(file, file[:-5].upper())
-            self.logger.info(f"Finished writing {file[:-5]}.tmpl")
+        with self.profiler.phase("specs"):
+            if documents is None:
+                self.__convert_changed_specs(manifest, previous_manifest)
+                self.__remove_stale_templates(manifest, previous_manifest)
+            else:
+                self.specs = [self.convert_document(filename, data) for filename, data in documents.items()]
+
+        if self.options.validate:
+            self.__verify_validation_errors()
+
+        with self.profiler.phase("routes"):
+            self.__verify_routes()
         self.logger.info("Finished writing endpoint files")
 
-        self.logger.info("Writing templates/Endpoints.tmpl")
-        self.__write_endpoints_template()
-        self.logger.info("Finished writing templates/Endpoints.tmpl")
+        if self.options.auto_encoding:
+            self.__log_encodings()
+
+    def __publish(self):
+        """
+        Publish the files written to the sink.
+        """
+        with self.profiler.phase("publish"):
+            changed = self.sink.publish()
+        self.logger.info("Published %d changed files", len(changed))
+        for path in changed:
+            self.logger.debug("Published %s", path)
+
+    def __verify_validation_errors(self):
+        """
+        Report the validation errors of every spec at once, and raise an InvalidOpenAPIError if there are any.
+        """
+        errors = [f"{spec.filename}: {error}" for spec in self.specs for error in spec.errors]
 
-        self.logger.info("Writing settings/service.json")
-        self.__write_service()
-        self.logger.info("Finished writing settings/service.json")
+        if not errors:
+            self.logger.info("Validated %d specs", len(self.specs))
+            return
 
-        self.logger.info("Writing krakend.json")
-        self.__write_krakend_json()
-        self.logger.info("Finished writing krakend.json")
+        for error in errors:
+            self.logger.error("%s", error)
 
-        self.logger.info("Writing Dockerfile")
-        self.__write_dockerfile()
-        self.logger.info("Finished writing Dockerfile")
+        invalid = sum(1 for spec in self.specs if spec.errors)
+        raise InvalidOpenAPIError(f"{len(errors)} validation errors in {invalid} specs:\n" + "\n".join(errors))
 
-        return self
+    def __log_encodings(self):
+        """
+        Log the encoding selected for every endpoint of the converted specs, and the amount of endpoints per encoding.
+        """
+        totals = {"json": 0, "no-op": 0}
+
+        for spec in self.specs:
+            for method, path, encoding, reason in spec.encodings:
+                totals[encoding] += 1
+                self.logger.info("Encoding %-5s %s /%s%s (%s)", encoding, method, spec.prefix, path, reason,
+                                 extra={"spec": spec.filename, "method": method, "endpoint": f"/{spec.prefix}{path}",
+                                        "encoding": encoding, "reason": reason})
+
+        self.logger.info("Selected json for %d and no-op for %d endpoints", totals["json"], totals["no-op"])
+
+    def write_profile(self, path: str):
+        """
+        Write the profiler measurements of the last conversion to a JSON report, and log the slowest specs.
+        """
+        options = self.options
+        self.profiler.save(path, versioning=options.versioning, env=options.env, envs=options.envs,
+                           all_envs=options.all_envs, jobs=options.jobs, incremental=options.incremental,
+                           streaming=options.streaming, flat=options.flat, validate=options.validate,
+                           shards=options.shards, shard_by=options.shard_by, shard_groups=options.shard_groups,
+                           http_cache=options.http_cache, qos_policy=options.qos_policy,
+                           auto_encoding=options.auto_encoding, allow_lists=options.allow_lists)
+
+        self.logger.info("Converted in %.3fs (peak memory %.1f MB)",
+                         self.profiler.total["wall"], self.profiler.total["peak_memory"] / 1024 / 1024)
+        for filename, wall in self.profiler.slowest_specs():
+            self.logger.info("Slowest spec: %s (%.3fs)", filename, wall)
+
+        self.logger.info("Written profile to %s", path)
+
+    def convert_spec(self, path: str) -> OpenAPISpec:
+        """
+        Load, verify and convert a single OpenAPI file, and write its endpoint template.
+
+        Any InvalidOpenAPIError raised is prefixed with the filename, so the failing file can always be identified.
+        """
+        filename = os.path.basename(path)
+
+        try:
+            start = time.perf_counter()
+
+            self.logger.debug("Loading %s", filename)
+            with self.profiler.phase("load", filename):
+                # Validating needs the complete specification, so streaming is ignored
+                spec = OpenAPISpec.load(path, self.options.versioning,
+                                        self.options.streaming and not self.options.validate, self.options.allow_lists)
+
+            return self.__write_spec(spec, start)
+        except InvalidOpenAPIError as error:
+            if self.options.validate:
+                return self.__invalid_spec(filename, str(error))
+
+            raise InvalidOpenAPIError(f"{filename}: {error}") from error
 
-    def __new_endpoint(self, endpoint: str, method: str, headers: list, query_strings: list):
+    def convert_document(self, filename: str, data: dict) -> OpenAPISpec:
+        """
+        Verify and convert a single parsed OpenAPI specification, and write its endpoint template.
+
+        Any InvalidOpenAPIError raised is prefixed with the filename, so the failing document can always be identified.
+        When caching, the result of a document converted before is reused instead.
+        """
+        if self.cache is None:
+            return self.__convert_document(filename, data)
+
+        key = self.__get_cache_key(filename, data)
+        cached = self.cache.get(key)
+
+        if cached is not None:
+            self.logger.debug("Reusing cached result of %s", filename)
+            # A shard writes the templates of its specs itself
+            if not self.options.flat and not self.options.sharded:
+                with self.sink.open(get_template_path(filename)) as template_file:
+                    template_file.write(cached.template)
+
+            return cached
+
+        spec = self.__convert_document(filename, data)
+
+        if not spec.errors:
+            self.cache.put(key, spec.summary())
+
+        return spec
+
+    def __convert_document(self, filename: str, data: dict) -> OpenAPISpec:
+        """
+        Verify and convert a single parsed OpenAPI specification.
+        """
+        try:
+            return self.__write_spec(OpenAPISpec(filename, data, self.options.versioning), time.perf_counter())
+        except InvalidOpenAPIError as error:
+            if self.options.validate:
+                return self.__invalid_spec(filename, str(error))
+
+            raise InvalidOpenAPIError(f"{filename}: {error}") from error
+
+    def __get_cache_key(self, filename: str, data: dict) -> str:
+        """
+        Get the key of the result of a document, which covers everything the endpoint template depends on.
+        """
+        # The endpoint templates only contain the host of the environment inside a flat configuration
+        options = {"versioning": self.options.versioning, "env": self.options.env if self.options.flat else None,
+                   "flat": self.options.flat, "compact": self.options.compact, "validate": self.options.validate,
+                   "http_cache": self.options.http_cache, "qos_policy": self.options.qos_policy,
+                   "auto_encoding": self.options.auto_encoding, "allow_lists": self.options.allow_lists}
+
+        return hash_document(filename, options, self.config.endpoint, self.config.backend, data)
+
+    def __invalid_spec(self, filename: str, error: str) -> OpenAPISpec:
+        """
+        Create an empty spec that records why a spec could not be converted, so the error is reported together with
+        the errors of the other specs.
+        """
+        spec = OpenAPISpec(filename, {}, self.options.versioning)
+        spec.errors = [error]
+
+        return spec
+
+    def __write_spec(self, spec: OpenAPISpec, start: float) -> OpenAPISpec:
+        """
+        Verify a loaded spec and write its endpoint template.
+        """
+        filename = spec.filename
+
+        if self.options.validate:
+            self.logger.debug("Validating %s", filename)
+            with self.profiler.phase("validate", filename):
+                spec.errors = validate_openapi(spec.data)
+
+            if spec.errors:
+                return spec
+
+        self.logger.debug("Verifying %s", filename)
+        with self.profiler.phase("verify", filename):
+            self.__verify_openapi(spec)
+
+        if self.options.flat:
+            with self.profiler.phase("format", filename), io.StringIO() as endpoints_file:
+                counts = self.__format_flat_endpoints(spec, endpoints_file)
+                spec.endpoints = endpoints_file.getvalue()
+
+            output = "krakend.json"
+        else:
+            self.logger.debug("Writing %s.tmpl", spec.template_name)
+            if self.cache is None and not self.options.sharded:
+                with self.profiler.phase("format", filename), \
+                        self.sink.open(get_template_path(filename)) as template_file:
+                    counts = self.__format_template(spec, template_file)
+            else:
+                # Keep the template, so it can be written again when the cached result is reused, or be written to the
+                # shard of the spec once every spec has been assigned to a shard
+                with self.profiler.phase("format", filename), io.StringIO() as buffer:
+                    counts = self.__format_template(spec, buffer)
+                    spec.template = buffer.getvalue()
+
+                if not self.options.sharded:
+                    with self.sink.open(get_template_path(filename)) as template_file:
+                        template_file.write(spec.template)
+
+            output = f"{spec.template_name}.tmpl"
+
+        # The files referenced by the spec are inputs of its template as well
+        spec.dependencies = spec.resolver.documents
+
+        for name, amount in counts.items():
+            self.profiler.count(filename, name, amount)
+
+        self.logger.info("Converted %s to %s: %d paths, %d endpoints, %d headers, %d query strings in %.3fs",
+                         filename, output, counts["paths"], counts["endpoints"], counts["headers"],
+                         counts["query_strings"], time.perf_counter() - start,
+                         extra={"spec": filename, "template": output, **counts})
+
+        return spec
+
+    def __convert_specs(self, paths: list) -> list:
+        """
+        Convert the OpenAPI files, either in this process or spread across a process pool.
+
+        The results are returned in the same order as the paths, so the output does not depend on the amount of jobs.
+        """
+        if self.options.jobs <= 1 or len(paths) <= 1:
+            return [self.convert_spec(path) for path in paths]
+
+        self.logger.info("Using %d processes", self.options.jobs)
+        with ProcessPoolExecutor(max_workers=self.options.jobs, initializer=_init_worker,
+                                 initargs=(self,)) as executor:
+            specs = []
+
+            for spec, measurements in executor.map(_convert_spec_in_worker, paths):
+                self.profiler.add_spec(spec.filename, measurements)
+                specs.append(spec)
+
+            return specs
+
+    def __convert_changed_specs(self, manifest: BuildManifest, previous_manifest: BuildManifest | None):
+        """
+        Convert the OpenAPI files that changed since the previous build and fill the list of specs.
+
+        Unchanged specs are restored from the summary inside the previous manifest instead of being parsed.
+        """
+        hashes = {path: self.hashes.get(path) for path in self.paths} if self.options.incremental else {}
+
+        changed_paths = [path for path in self.paths
+                         if not self.options.incremental
+                         or manifest.is_spec_changed(previous_manifest, os.path.basename(path), hashes[path],
+                                                     self.hashes)
+                         or self.__is_missing(get_template_path(os.path.basename(path)))]
+
+        results = dict(zip(changed_paths, self.__convert_specs(changed_paths)))
+
+        for path in self.paths:
+            if path in results:
+                spec = results[path]
+            else:
+                self.logger.info("Skipping %s, unchanged", os.path.basename(get_template_path(path)))
+                spec = previous_manifest.get_spec(os.path.basename(path), self.options.versioning)
+
+            self.specs.append(spec)
+
+            if self.options.incremental:
+                manifest.add_spec(spec, hashes[path], self.hashes)
+
+    def __new_manifest(self) -> BuildManifest:
+        """
+        Create the manifest of the current build.
+        """
+        options = {"versioning": self.options.versioning, "env": self.options.env}
+        if self.options.flat:
+            options["flat"] = True
+        if self.options.envs is not None:
+            options["envs"] = self.options.envs
+        if self.options.all_envs:
+            options["all_envs"] = True
+        if self.options.http_cache:
+            options["http_cache"] = True
+        if self.options.qos_policy is not None:
+            options["qos_policy"] = self.options.qos_policy
+        if self.options.auto_encoding:
+            options["auto_encoding"] = True
+        if self.options.allow_lists:
+            options["allow_lists"] = True
+        if self.options.sharded:
+            options["shards"] = {"shards": self.options.shards, "shard_by": self.options.shard_by,
+                                 "groups": self.options.shard_groups}
+        config = {}
+
+        if self.options.incremental:
+            for filename in ["endpoint.json", "backend.json", "krakend.json"]:
+                config[filename] = self.hashes.get(self.config.get_path(filename))
+
+            # The flat and multi-env builds use their own default Dockerfile
+            config["Dockerfile"] = self.hashes.get(self.config.dockerfile_path)
+
+        return BuildManifest(options, config)
+
+    def __remove_stale_templates(self, manifest: BuildManifest, previous_manifest: BuildManifest | None):
+        """
+        Remove the endpoint templates of OpenAPI files that no longer exist.
+        """
+        if previous_manifest is None:
+            return
+
+        for filename in previous_manifest.specs:
+            if filename not in manifest.specs:
+                self.logger.info("Removing %s", os.path.basename(get_template_path(filename)))
+                self.sink.remove(get_template_path(filename))
+
+    def __is_missing(self, path: str) -> bool:
+        """
+        Check if a file does not exist inside the output.
+        """
+        return not self.sink.exists(path)
+
+    def __new_endpoint(self, endpoint: str, method: str, headers: list, query_strings: list, *, prefix: str, host: str,
+                       qos: tuple):
         """
         Create a KrakenD formatted endpoint.
+
+        The settings of the operation itself (see app.logic.qos) are merged into endpoint.json and backend.json.
         """
-        self.logger.debug("Creating headers")
         headers.append("Content-Type")
 
-        self.logger.debug("Creating endpoint")
         formatted_endpoint = {
-            "endpoint": "{{ $prefix }}" + endpoint,
+            "endpoint": prefix + endpoint,
             "method": method,
             "backend": [
                 {
                     "url_pattern": endpoint,
                     "method": method,
                     "host": [
-                        "{{ $host }}"
+                        host
                     ],
                 }
             ],
@@ -122,34 +589,12 @@ class OpenAPIToKrakenD:
             "input_query_strings": query_strings
         }
 
-        self.logger.debug("Adding endpoint configuration")
-        if "endpoint.json" in self.config_files:
-            self.logger.debug("Using custom endpoint configuration")
-            with open(f"{self.input_folder_path}/config/endpoint.json", "r", encoding="utf-8") as endpoint_config_file:
-                endpoint_config = json.load(endpoint_config_file)
-        else:
-            self.logger.debug("Using default endpoint configuration")
-            with open("app/config/endpoint.json", "r", encoding="utf-8") as endpoint_config_file:
-                endpoint_config = json.load(endpoint_config_file)
-
-        for key in endpoint_config:
-            self.logger.debug(f"Adding {key}")
-            formatted_endpoint[key] = endpoint_config[key]
-        self.logger.debug("Added endpoint configuration")
-
-        self.logger.debug("Adding backend configuration")
-        if "backend.json" in self.config_files:
-            self.logger.debug("Using custom backend configuration")
-            with open(f"{self.input_folder_path}/config/backend.json", "r", encoding="utf-8") as backend_config_file:
-                backend_config = json.load(backend_config_file)
-        else:
-            self.logger.debug("Using default backend configuration")
-            with open("app/config/backend.json", "r", encoding="utf-8") as backend_config_file:
-                backend_config = json.load(backend_config_file)
+        self.config.merge(formatted_endpoint, self.config.endpoint)
+        self.config.merge(formatted_endpoint["backend"][0], self.config.backend)
 
-        for key in backend_config:
-            formatted_endpoint["backend"][0][key] = backend_config[key]
-        self.logger.debug("Added backend configuration")
+        endpoint_settings, backend_settings = qos
+        merge_qos(formatted_endpoint, endpoint_settings)
+        merge_qos(formatted_endpoint["backend"][0], backend_settings)
 
         return formatted_endpoint
 
@@ -159,364 +604,307 @@ class OpenAPIToKrakenD:
         """
         match security_scheme["type"]:
             case "http":
-                self.logger.debug("HTTP authentication schema found")
-
-                self.logger.debug("Setting security header to 'Authorization'")
                 return "Authorization"
             case "apiKey" if security_scheme["in"] == "header":
-                self.logger.debug("API Key Header authentication schema found")
-
-                self.logger.debug(f"Setting security header to '{security_scheme['name']}'")
                 return security_scheme["name"]
             case "oauth2" if "implicit" in security_scheme["flows"]:
-                self.logger.debug("OAuth2 Implicit Authentication schema found")
-
-                self.logger.debug("Setting security header to 'Authorization'")
                 return "Authorization"
             case _:
                 return None
 
-    def __get_api_define_prefix(self, filename: str, data: dict):
-        """
-        Get the API define and prefix based on the versioning system used.
+    def __verify_openapi(self, spec: OpenAPISpec):
         """
-        if ".V" in filename and not self.versioning:
-            api_prefix = filename.replace(".V", "/V").lower()
-            api_define = filename.replace(".V", "V")
-
-        elif ".V" in filename and self.versioning:
-            version = "V" + data["info"]["version"][0:1]
-            api_name = re.sub(r"\.V\d", "", filename)
+        Verify if the OpenAPI files contain all the required fields.
 
-            api_prefix = (api_name + "/" + version).lower()
-            api_define = api_name + version
+        If the verification fails an InvalidOpenAPIError is raised.
+        """
+        data = spec.data
 
-        elif self.versioning:
-            api_prefix = str(filename + "/V" + data["info"]["version"][0:1]).lower()
-            api_define = filename + "V" + data["info"]["version"][0:1]
+        self.logger.debug("Verifying server")
 
+        if "servers" in data.keys() and len(data["servers"]) >= 1 and "url" in data["servers"][0]:
+            server = data["servers"][0]["url"]
+            if "http://" not in server and "https://" not in server:  # NOSONAR
+                raise InvalidOpenAPIError("invalid server")
         else:
-            api_prefix = filename.lower()
-            api_define = filename
+            raise InvalidOpenAPIError("no servers defined")
+
+        self.logger.debug("Verifying version")
 
-        return [api_prefix, api_define]
+        if "info" not in data.keys() or "version" not in data["info"].keys():
+            raise InvalidOpenAPIError("no version found")
 
-    def __get_name_with_version(self, filename: str, data: dict):
+    def __verify_routes(self):
         """
-        Get the api name based on the versioning system used.
+        Verify that the endpoints of all specs together do not contain routes KrakenD can not tell apart.
+
+        Every conflict is logged. If any route is duplicated or conflicts with another route an InvalidOpenAPIError is
+        raised, routes that are only shadowed by a literal route are logged as a warning.
         """
-        name = filename.upper()[:-5]
+        routes = RouteIndex()
 
-        if ".V" in name and not self.versioning:
-            return name.replace(".V", "V")
+        for spec in self.specs:
+            for method, path in spec.routes:
+                routes.add(method, f"/{spec.prefix}{path}", spec.filename)
 
-        if ".V" in name and self.versioning:
-            version = "V" + data["info"]["version"][0:1]
-            api_name = re.sub(r"\.V\d", "", name)
+        for warning in routes.shadowed():
+            self.logger.warning("Route %s", warning)
 
-            return api_name + version
+        for error in routes.errors:
+            self.logger.error("Route %s", error)
 
-        if self.versioning:
-            return name + "V" + data["info"]["version"][0:1]
+        self.logger.debug("Verified %d routes", routes.count)
 
-        return name
+        if routes.errors:
+            raise InvalidOpenAPIError(f"{len(routes.errors)} conflicting routes, first: {routes.errors[0]}")
 
-    def __verify_openapi(self, file):
+    def __verify_template_names(self):
         """
-        Verify if the OpenAPI files contain all the required fields.
+        Verify that no two OpenAPI files create the same endpoint template (e.g. "F1.json" and "F1.yaml").
 
         If the verification fails an InvalidOpenAPIError is raised.
         """
-        with open(f"{self.input_folder_path}/{file}", "r", encoding="utf-8") as openapi_file:
-            data: dict = json.load(openapi_file)
-
-            self.logger.debug("Verifying server")
+        templates = {}
 
-            if "servers" in data.keys() and len(data["servers"]) >= 1 and "url" in data["servers"][0]:
-                server = data["servers"][0]["url"]
-                if "http://" not in server and "https://" not in server:  # NOSONAR
-                    raise InvalidOpenAPIError(f"{file}: invalid server")
-            else:
-                raise InvalidOpenAPIError(f"{file}: no servers defined")
+        for filename in self.files:
+            template_path = get_template_path(filename)
 
-            self.logger.debug("Verifying version")
+            if template_path in templates:
+                raise InvalidOpenAPIError(f"{templates[template_path]} and {filename} both create "
+                                          f"{os.path.basename(template_path)}")
 
-            if "info" not in data.keys() or "version" not in data["info"].keys():
-                raise InvalidOpenAPIError("No version found")
+            templates[template_path] = filename
 
-    def __write_dockerfile(self):
+    def __format_template(self, spec: OpenAPISpec, template_file: TextIO) -> dict:
         """
-        Copy the dockerfile to the output folder.
-        """
-        if "Dockerfile" in self.config_files:
-            self.logger.debug("Using custom Dockerfile")
-            shutil.copy(f"{self.input_folder_path}/config/Dockerfile", f"{self.output_folder_path}")
-        else:
-            self.logger.debug("Using default Dockerfile")
-            shutil.copy("app/config/Dockerfile", f"{self.output_folder_path}")
+        Write the endpoint template of a spec, which KrakenD renders with the host of the service.
 
-    def __write_endpoints_template(self):
-        """
-        Write the endpoints file which links the API definitions and services together.
+        Returns the amount of paths, endpoints, parameters, headers and query strings converted.
         """
-        service = "{{$service := .}}\n\n"
-        define = "{{define \"Endpoints\"}}\n\n"
-        end = "\n\n{{end}}"
-
-        with open(f"{self.output_folder_path}/config/templates/Endpoints.tmpl", "w+",
-                  encoding="utf-8") as endpoints_file:
-            self.logger.info("Formatting endpoints file")
-
-            self.logger.debug("Writing template")
-            endpoints_file.write(define + service)
+        host = "{{$host := .}}\n"
+        end = "\n\n\n{{end}}"
 
-            for file in self.files:
-                self.logger.debug(f"Loaded {file}")
+        # https://docs.python.org/3/library/string.html#format-string-syntax
+        define = f'{{{{define "{spec.name}"}}}}\n\n'
+        prefix = f'{{{{$prefix := "/{spec.prefix}"}}}}\n\n'
 
-                with open(f"{self.input_folder_path}/{file}", "r", encoding="utf-8") as json_file:
-                    data = json.load(json_file)
+        self.logger.debug("Write start template")
+        template_file.write(define + host + prefix)
 
-                name = self.__get_name_with_version(file, data)
+        counts = self.__format_endpoints(spec, ListEmitter(template_file), "{{ $prefix }}", "{{ $host }}", "")
 
-                # https://docs.python.org/3/library/string.html#format-string-syntax
-                data = f'{{{{template "{name}" $service.{name}}}}}\n'
+        self.logger.debug("Writing end template")
+        template_file.write(end)
 
-                self.logger.debug(f"Writing service {file[:-5].upper()}")
-                endpoints_file.write(data)
+        return counts
 
-            self.logger.debug("Writing end template")
-            endpoints_file.write(end)
+    def __format_flat_endpoints(self, spec: OpenAPISpec, endpoints_file: TextIO) -> dict:
+        """
+        Write the endpoints of a spec with their prefix and host filled in, as they appear inside the `endpoints` list
+        of a flat krakend.json.
 
-            endpoints_file.seek(0)
+        Returns the amount of paths, endpoints, parameters, headers and query strings converted.
+        """
+        host = get_target_backend(spec, self.options.env, self.logger)[spec.name]
 
-            self.logger.debug("Reading file data")
-            file_data = endpoints_file.read()
+        if self.options.compact:
+            return self.__format_endpoints(spec, ListEmitter(endpoints_file, ","), f"/{spec.prefix}", host, None)
 
-            self.logger.debug("Converting file data to JSON")
-            file_data = file_data.replace("}}\n{{", "}},\n{{")
+        # Indented the same as json.dumps(config, indent=4) indents the items of the `endpoints` list
+        return self.__format_endpoints(spec, ListEmitter(endpoints_file), f"/{spec.prefix}", host, " " * 8)
 
-            endpoints_file.seek(0)
+    # Disable pylint too-many-locals due to a high amount of variables required for this method to work.
+    # pylint: disable=too-many-locals
+    # Disable pylint too-many-arguments due to the output format being configurable.
+    # pylint: disable=too-many-arguments
+    def __format_endpoints(self, spec: OpenAPISpec, endpoints: ListEmitter, prefix: str, host: str,
+                           indentation: str | None) -> dict:
+        """
+        Convert all the endpoints to the KrakenD format and write them to the emitter
 
-            self.logger.info("Writing file")
-            endpoints_file.write(file_data)
+        KrakenD creates a separate endpoint object per route and method, unlike OpenAPI where a path can have multiple
+        methods under the same parent object. Therefor there needs to be a nested for loop for all the methods inside
+        the paths. Every endpoint is written as soon as it has been converted.
 
-    def __get_target_backend(self, data, service_name, filename):
-        """
-        Get the target backend for the API based on the environment chosen
+        Returns the amount of paths, endpoints, parameters, headers and query strings converted.
         """
-        service = None
+        self.logger.debug("Formatting endpoints for %s", spec.filename)
 
-        # If an environment is specified, attempt to search for server
-        if self.env:
-            self.logger.debug(f"[{filename}] Custom environment provided")
-            for server in data["servers"]:
-                if "description" not in server:
-                    self.logger.debug(f"[{filename}] Description not found, trying next")
-                    continue
+        data = spec.data
 
-                if server["description"] == self.env:
-                    self.logger.debug(f"[{filename}] Description found")
-                    service = {service_name: server["url"]}
-                    break
+        openapi_security_schemes = None
+        global_security_schemes = None
 
-        # If no environment is specified or if no server is found, use first entry in server list
-        if service is None:
-            if self.env:
-                self.logger.error(
-                    f"[{filename}] Server environment `{self.env}` unknown. Using {data['servers'][0]['url']}")
+        if "security" in data:
+            self.logger.debug("Global security schemes found in OpenAPI")
+            global_security_schemes = data["security"]
 
-            self.logger.debug("Custom environment not provided, using first entry in server list")
-            service = {service_name: data["servers"][0]["url"]}
+        if "components" in data and "securitySchemes" in data["components"]:
+            self.logger.debug("Security schemes found on endpoint")
+            openapi_security_schemes = data["components"]["securitySchemes"]
 
-        return service
+        counts = {"paths": 0, "endpoints": 0, "parameters": 0, "headers": 0, "query_strings": 0}
 
-    def __write_service(self):
-        """
-        Write the service.json file which contains all the urls to the services.
-        """
-        service_array = {}
+        # The flattened response schemas are shared by every operation of the spec
+        flattener = SchemaFlattener(spec.resolver) if self.options.allow_lists else None
 
-        for filename in self.files:
-            with open(f"{self.input_folder_path}/{filename}", "r", encoding="utf-8") as file:
-                data = json.load(file)
+        # Loop over every path inside the OpenAPI spec
+        for path in data["paths"]:
+            path_item, base = spec.resolver.resolve(data["paths"][path])
+            path_parameters = path_item.get("parameters") or []
+            counts["paths"] += 1
 
-            service_name = self.__get_name_with_version(filename, data)
-            service = self.__get_target_backend(data, service_name, filename)
+            # Loop over every method inside the OpenAPI spec
+            for method in path_item:
+                if method not in HTTP_METHODS:
+                    continue
 
-            service_array.update(service)
+                operation = path_item[method]
+                parameters = self.__get_parameters(spec, path_parameters, operation.get("parameters") or [], base)
 
-        with open(f"{self.output_folder_path}/config/settings/service.json", "w+", encoding="utf-8") as file:
-            json.dump(service_array, file, indent=4)
+                headers = self.__get_headers(operation,
+                                             parameters,
+                                             global_security_schemes,
+                                             openapi_security_schemes,
+                                             spec)
 
-    def __write_krakend_json(self):
-        """
-        Write the KrakenD configuration file.
-        """
-        self.logger.info("Generating config")
-        krakend_config = {
-            "endpoints": '[{{template "Endpoints".service}}]'
-        }
+                query_strings = self.__get_query_strings(parameters)
 
-        self.logger.debug("Adding configuration")
-        if "krakend.json" in self.config_files:
-            self.logger.debug("Using custom krakend configuration")
-            with open(f"{self.input_folder_path}/config/krakend.json", "r", encoding="utf-8") as config_file:
-                config = json.load(config_file)
-        else:
-            self.logger.debug("Using default krakend configuration")
-            with open("app/config/krakend.json", "r", encoding="utf-8") as config_file:
-                config = json.load(config_file)
+                try:
+                    qos = get_endpoint_qos(spec, method, path, operation, base, http_cache=self.options.http_cache,
+                                           policy=self.options.qos_policy)
+                    krakend_endpoint = self.__new_endpoint(path, method.upper(), headers, query_strings,
+                                                           prefix=prefix, host=host, qos=qos)
 
-        for key in config:
-            self.logger.debug(f"Adding {key}")
-            krakend_config[key] = config[key]
-        self.logger.debug("Added configuration")
+                    if flattener is not None:
+                        self.__add_allow_list(spec, path, operation, base, krakend_endpoint, flattener=flattener)
+                except InvalidOpenAPIError as error:
+                    raise InvalidOpenAPIError(f"{method.upper()} {path}: {error}") from error
 
-        self.logger.debug("Loading config")
-        config_data = json.dumps(krakend_config, indent=4)
+                if self.options.auto_encoding:
+                    self.__select_encoding(spec, path, operation, base, krakend_endpoint)
 
-        self.logger.debug("Reformatting endpoints value")
+                counts["endpoints"] += 1
+                counts["parameters"] += len(parameters)
+                counts["headers"] += len(headers)
+                counts["query_strings"] += len(query_strings)
 
-        json_string = config_data.replace("\"[{{template \\\"Endpoints\\\".service}}]\"",
-                                          "[{{template \"Endpoints\".service}}]")
+                # The arguments are only formatted when debug logging is enabled
+                self.logger.debug("Converted %s %s (headers: %s, query strings: %s)",
+                                  method.upper(), path, headers, query_strings)
 
-        self.logger.debug("Reformatted endpoints value")
+                spec.routes.append([method.upper(), path])
 
-        self.logger.info("Config generated")
+                endpoints.write(self.__dump_endpoint(krakend_endpoint, indentation))
 
-        with open(f"{self.output_folder_path}/config/krakend.json", "w+", encoding="utf-8") as config_file:
-            self.logger.info("Writing file")
-            config_file.write(json_string)
-            self.logger.info("Finished writing file")
+        return counts
 
-    # Disable pylint too-many-locals due to a high amount of variables required for this method to work.
-    # pylint: disable=too-many-locals
-    def __format_endpoints(self, file_input, file_output):
+    # Disable pylint too-many-arguments due to the allow list depending on both the operation and the endpoint.
+    # pylint: disable=too-many-arguments
+    def __add_allow_list(self, spec: OpenAPISpec, path: str, operation: dict, base: str, endpoint: dict, *,
+                         flattener: SchemaFlattener):
         """
-        Convert all the endpoints to the KrakenD format
+        Add the allow list generated from the response schemas of an operation to the backend of its endpoint.
 
-        KrakenD creates a separate endpoint object per route and method, unlike OpenAPI where a path can have multiple
-        methods under the same parent object. Therefor there needs to be a nested for loop for all the methods inside
-        the paths.
+        The filtering of backend.json is kept as is. KrakenD only filters decoded responses, so the no-op encoding of
+        the endpoint and its backend is replaced by json.
         """
-        self.logger.info(f"Formatting endpoints for {file_input}")
+        backend = endpoint["backend"][0]
 
-        endpoints_list = []
+        if any(field in backend for field in FILTERING_FIELDS):
+            self.logger.debug("Keeping the filtering of backend.json for %s %s", endpoint["method"], path)
+            return
 
-        host = "{{$host := .}}\n"
-        end = "\n\n\n{{end}}"
-
-        output_path = f"{self.output_folder_path}/config/templates/{file_output}"
-
-        with open(f"{self.input_folder_path}/{file_input}", "r+", encoding="utf-8") as openapi_file:
-            self.logger.debug(f"Loaded {file_input}")
-            data = json.load(openapi_file)
+        fields = get_allow_list(spec, operation, base, flattener)
 
-            api_prefix, api_define = self.__get_api_define_prefix(file_output, data)
+        if fields is None:
+            self.logger.debug("Not filtering %s %s, its response fields are not restricted", endpoint["method"], path)
+            return
 
-            # https://docs.python.org/3/library/string.html#format-string-syntax
-            define = f'{{{{define "{api_define}"}}}}\n\n'
-            prefix = f'{{{{$prefix := "/{api_prefix}"}}}}\n\n'
+        backend["allow"] = fields
 
-            openapi_security_schemes = None
-            global_security_schemes = None
+        if backend.get("encoding") == "no-op":
+            backend["encoding"] = "json"
+        if endpoint.get("output_encoding") == "no-op":
+            endpoint["output_encoding"] = "json"
 
-            if "security" in data:
-                self.logger.debug("Global security schemes found in OpenAPI")
-                global_security_schemes = data["security"]
-
-            if "components" in data and "securitySchemes" in data["components"]:
-                self.logger.debug("Security schemes found on endpoint")
-                openapi_security_schemes = data["components"]["securitySchemes"]
+    def __select_encoding(self, spec: OpenAPISpec, path: str, operation: dict, base: str, endpoint: dict):
+        """
+        Set the encoding of an endpoint and its backend to the encoding selected from its content types.
 
-            # Loop over every path inside the OpenAPI spec
-            for path in data["paths"]:
-                self.logger.info(f"Starting conversion for {path}")
+        A warning is logged when the response manipulation of the endpoint is ignored, because its response is not JSON.
+        """
+        encoding, reason = select_encoding(spec, operation, base, endpoint)
 
-                # Loop over every method inside the OpenAPI spec
-                for method in data["paths"][path]:
-                    self.logger.info(f"Preparing conversion for {path}: {method}")
+        if encoding == "no-op" and reason != "no response body" and is_manipulated(endpoint):
+            self.logger.warning("Ignoring the response manipulation of %s %s (%s)", endpoint["method"], path, reason)
 
-                    headers = self.__get_headers(data["paths"][path][method],
-                                                 global_security_schemes,
-                                                 openapi_security_schemes)
+        endpoint["output_encoding"] = encoding
+        for backend in endpoint["backend"]:
+            backend["encoding"] = encoding
 
-                    query_strings = self.__get_query_strings(data["paths"][path][method])
+        spec.encodings.append([endpoint["method"], path, encoding, reason])
 
-                    self.logger.info(f"Converting {path}: {method}")
-                    krakend_endpoint = self.__new_endpoint(path, method.upper(), headers, query_strings)
-                    self.logger.info(f"Converted {path}: {method}")
+    @staticmethod
+    def __dump_endpoint(endpoint: dict, indentation: str | None) -> str:
+        """
+        Serialize an endpoint, indented by four spaces per level plus the indentation, or compact if it is None.
+        """
+        if indentation is None:
+            return json.dumps(endpoint, separators=(",", ":"))
 
-                    self.logger.debug("Adding endpoint to list")
-                    endpoints_list.append(krakend_endpoint)
-                    self.logger.debug("Added endpoint to list")
+        if indentation:
+            return indentation + json.dumps(endpoint, indent=4).replace("\n", "\n" + indentation)
 
-        endpoints = endpoints_list
+        return json.dumps(endpoint, indent=4)
 
-        with open(f"{output_path}.tmpl", "w+", encoding="utf-8") as file:
-            self.logger.debug("Write start template")
-            file.write(define + host + prefix)
+    def __get_parameters(self, spec: OpenAPISpec, path_parameters: list, operation_parameters: list, base: str):
+        """
+        Get the resolved parameters of an operation
 
-            for endpoint in endpoints:
-                self.logger.debug(f'Writing endpoint {endpoint["backend"][0]["url_pattern"]}')
-                file.write(json.dumps(endpoint, indent=4))
+        Parameters defined on the path apply to every operation, unless the operation overrides a parameter with the
+        same name and location.
+        """
+        parameters = {}
 
-            self.logger.debug("Writing end template")
-            file.write(end)
-            file.seek(0)
+        for parameter in path_parameters + operation_parameters:
+            parameter, _ = spec.resolver.resolve(parameter, base)
 
-            self.logger.debug("Reading file")
-            file_data = file.read()
+            if "name" not in parameter or "in" not in parameter:
+                raise InvalidOpenAPIError("parameter without name or location")
 
-            self.logger.info("Converting endpoints to valid JSON")
-            file_data = file_data.replace("}{", "},\n{")
-            file.seek(0)
+            parameters[(parameter["name"], parameter["in"])] = parameter
 
-            self.logger.info(f"Writing {output_path}.tmpl")
-            file.write(file_data)
+        return list(parameters.values())
 
-    def __get_headers(self, endpoint, global_security_schemes, security_schemes):
+    def __get_headers(self, endpoint, parameters, global_security_schemes, security_schemes, spec):
         """
         Get the headers for the endpoint from the parameters and authorization methods
         """
         headers = []
 
         if ("security" in endpoint and endpoint["security"] is not None) or global_security_schemes:
-            self.logger.debug("Adding security headers")
-            headers = self.__add_security_headers(endpoint, global_security_schemes, security_schemes)
-            self.logger.debug("Added security headers")
-        else:
-            self.logger.debug("No authorization header required")
-
-        if "parameters" in endpoint and endpoint["parameters"] is not None:
-            for parameter in endpoint["parameters"]:
-                if parameter["in"] == "header":
-                    self.logger.debug(f'Adding {parameter["name"]} to headers')
-                    headers.append(parameter["name"])
-                    self.logger.debug(f'Added {parameter["name"]} to headers')
-        else:
-            self.logger.debug("No parameters found")
+            headers = self.__add_security_headers(endpoint, global_security_schemes, security_schemes, spec)
+
+        for parameter in parameters:
+            if parameter["in"] == "header":
+                headers.append(parameter["name"])
 
         return headers
 
-    def __get_query_strings(self, endpoint):
+    def __get_query_strings(self, parameters):
         """
         Get the query strings for the endpoint from the parameters
         """
         query_strings = []
 
-        if "parameters" in endpoint and endpoint["parameters"] is not None:
-            for parameter in endpoint["parameters"]:
-                if parameter["in"] == "query":
-                    self.logger.debug(f'Adding {parameter["name"]} to query strings')
-                    query_strings.append(parameter["name"])
-                    self.logger.debug(f'Added {parameter["name"]} to query strings')
-        else:
-            self.logger.debug("No parameters found")
+        for parameter in parameters:
+            if parameter["in"] == "query":
+                query_strings.append(parameter["name"])
 
         return query_strings
 
-    def __add_security_headers(self, endpoint, global_security_schemes, security_schemes):
+    def __add_security_headers(self, endpoint, global_security_schemes, security_schemes, spec):
         """
         Add the security headers
         """
@@ -537,25 +925,13 @@ class OpenAPIToKrakenD:
             if scheme not in security_schemes:
                 raise InvalidOpenAPIError(f"{scheme} does not exist in OpenAPI specification")
 
-            self.logger.debug(f"Adding header for components.securitySchemes.{scheme}")
-            header = self.__get_security_headers(security_schemes[scheme])
+            security_scheme, _ = spec.resolver.resolve(security_schemes[scheme])
+            header = self.__get_security_headers(security_scheme)
             if header in headers:
-                self.logger.warning(f"Header '{header}' already exists")
+                self.logger.warning("Header '%s' already exists", header)
             if header is None:
                 raise InvalidOpenAPIError("Unsupported authorization method used")
 
             headers.append(header)
 
-            self.logger.debug(f"Added header for components.securitySchemes.{scheme}")
-
         return headers
-
-    def __create_folders(self):
-        """
-        Create the configuration folders
-        """
-        paths = ["config", "config/settings", "config/templates"]
-
-        for folder in paths:
-            if not os.path.exists(os.path.join(self.output_folder_path, folder)):
-                os.mkdir(os.path.join(self.output_folder_path, folder))
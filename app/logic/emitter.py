@@ -0,0 +1,409 @@
+from __future__ import annotations
+
+import io
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, TextIO
+
+
+# Disable pylint too-few-public-methods due to the emitter only writing values.
+# pylint: disable=too-few-public-methods
+class ListEmitter:
+    """
+    Write a list of values to a stream in a single forward pass
+
+    The separator is written between the values, instead of being patched into the output afterwards.
+    """
+
+    def __init__(self, stream: TextIO, separator: str = ",\n"):
+        """
+        Initialize emitter
+
+        Arguments:
+        stream -- The stream the values are written to
+        separator -- The separator written between two values
+        """
+        self.stream: TextIO = stream
+        self.separator: str = separator
+        self.count: int = 0
+
+    def write(self, value: str):
+        """
+        Write a value, preceded by the separator if it is not the first value.
+        """
+        if self.count > 0:
+            self.stream.write(self.separator)
+
+        self.stream.write(value)
+        self.count += 1
+
+
+# The folder inside the output folder the files of a conversion are staged in, until they are published
+STAGING_FOLDER = ".staging"
+
+
+class FileSink:
+    """
+    Write the generated files to the output folder
+
+    Every file is written to a temporary file, which is renamed into place once it has been written completely. Readers
+    therefore never see a half-written file. Files whose content did not change are not replaced, so they keep their
+    modification time.
+
+    After `begin`, files are staged inside the output folder and only renamed into place by `publish`, so a failed
+    conversion leaves the complete previous output intact. Any object with the same `begin`, `publish`, `discard`,
+    `open`, `copy`, `remove`, `exists`, `create_folder` and `list_folders` methods can be used as the sink of the
+    converter, with paths relative to the output (e.g. "config/krakend.json").
+    """
+
+    def __init__(self, output_folder_path: str):
+        """
+        Initialize sink
+
+        Arguments:
+        output_folder_path -- The path of the output folder where the configuration gets generated
+        """
+        self.output_folder_path: str = output_folder_path
+        self.staging_folder_path: str | None = None
+        self.removed: list = []
+
+    def begin(self):
+        """
+        Start staging the written files, discarding anything left behind by an interrupted conversion.
+        """
+        self.discard()
+
+        self.staging_folder_path = os.path.join(self.output_folder_path, STAGING_FOLDER)
+        os.mkdir(self.staging_folder_path)
+
+    def publish(self) -> list:
+        """
+        Move the staged files whose content changed into the output folder, and return their paths.
+
+        Files inside folders are published first, so krakend.json is only replaced after the templates and settings it
+        includes.
+        """
+        if self.staging_folder_path is None:
+            return []
+
+        staged = [os.path.relpath(os.path.join(folder, filename), self.staging_folder_path)
+                  for folder, _, filenames in os.walk(self.staging_folder_path) for filename in filenames]
+        changed = []
+
+        for path in sorted(staged, key=lambda staged_path: (-staged_path.count(os.sep), staged_path)):
+            destination = os.path.join(self.output_folder_path, path)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+
+            if self.__replace(os.path.join(self.staging_folder_path, path), destination):
+                changed.append(path.replace(os.sep, "/"))
+
+        for path in self.removed:
+            self.__remove(os.path.join(self.output_folder_path, path))
+
+        self.discard()
+
+        return changed
+
+    def discard(self):
+        """
+        Stop staging and remove the staged files.
+        """
+        shutil.rmtree(os.path.join(self.output_folder_path, STAGING_FOLDER), ignore_errors=True)
+
+        self.staging_folder_path = None
+        self.removed = []
+
+    @contextmanager
+    def open(self, path: str) -> Iterator[TextIO]:
+        """
+        Open a file inside the output folder for writing.
+        """
+        with self.__temporary_path(path) as temporary_path:
+            with open(temporary_path, "x", encoding="utf-8") as file:
+                yield file
+
+    def copy(self, source_path: str, path: str):
+        """
+        Copy a file to the output folder.
+        """
+        with self.__temporary_path(path) as temporary_path:
+            shutil.copy(source_path, temporary_path)
+
+    def remove(self, path: str):
+        """
+        Remove a file or folder from the output folder if it exists.
+        """
+        if self.staging_folder_path is None:
+            self.__remove(os.path.join(self.output_folder_path, path))
+        else:
+            self.__remove(os.path.join(self.staging_folder_path, path))
+            self.removed.append(path)
+
+    def exists(self, path: str) -> bool:
+        """
+        Check if a file exists inside the output folder, or has been staged.
+        """
+        if self.staging_folder_path is not None:
+            if os.path.exists(os.path.join(self.staging_folder_path, path)):
+                return True
+
+            if any(_is_inside(path, removed_path) for removed_path in self.removed):
+                return False
+
+        return os.path.exists(os.path.join(self.output_folder_path, path))
+
+    def create_folder(self, path: str):
+        """
+        Create a folder inside the output folder if it does not exist.
+        """
+        destination = os.path.join(self.output_folder_path, path)
+
+        if not os.path.exists(destination):
+            os.mkdir(destination)
+
+    def list_folders(self, path: str) -> list:
+        """
+        Get the names of the folders inside a folder of the output folder, including the staged folders.
+        """
+        folders = set()
+
+        for root in filter(None, [self.output_folder_path, self.staging_folder_path]):
+            folder = os.path.join(root, path)
+
+            if os.path.isdir(folder):
+                folders.update(name for name in os.listdir(folder) if os.path.isdir(os.path.join(folder, name)))
+
+        removed = [name for name in folders
+                   if any(_is_inside(f"{path}/{name}".lstrip("/"), removed_path) for removed_path in self.removed)]
+
+        return sorted(folders - {STAGING_FOLDER, *removed})
+
+    @contextmanager
+    def __temporary_path(self, path: str) -> Iterator[str]:
+        """
+        Get the path a file is written to.
+
+        When staging, this is the path inside the staging folder. Otherwise it is a temporary path next to the
+        destination, which replaces the destination if no error is raised.
+        """
+        if self.staging_folder_path is not None:
+            staged_path = os.path.join(self.staging_folder_path, path)
+            os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+
+            written = False
+
+            # A finally block also removes the staged file when the context is never exited (e.g. a closed generator)
+            try:
+                yield staged_path
+                written = True
+            finally:
+                if not written:
+                    self.__remove(staged_path)
+
+            return
+
+        destination = os.path.join(self.output_folder_path, path)
+        folder, filename = os.path.split(destination)
+        temporary_path = os.path.join(folder, f".{filename}.{uuid.uuid4().hex}.tmp")
+
+        try:
+            yield temporary_path
+            self.__replace(temporary_path, destination)
+        finally:
+            self.__remove(temporary_path)
+
+    @staticmethod
+    def __replace(source: str, destination: str) -> bool:
+        """
+        Rename a file to its destination, unless the destination has the same content. Returns True if it was renamed.
+        """
+        if os.path.exists(destination) and _is_same_content(source, destination):
+            os.remove(source)
+            return False
+
+        os.replace(source, destination)
+        return True
+
+    @staticmethod
+    def __remove(path: str):
+        """
+        Remove a file or folder if it exists.
+        """
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+
+def _is_inside(path: str, folder_path: str) -> bool:
+    """
+    Check if a path is a folder path itself, or inside it.
+    """
+    return path == folder_path or path.startswith(folder_path + "/")
+
+
+def _is_same_content(first_path: str, second_path: str) -> bool:
+    """
+    Check if two files have exactly the same content.
+    """
+    if os.path.getsize(first_path) != os.path.getsize(second_path):
+        return False
+
+    with open(first_path, "rb") as first_file, open(second_path, "rb") as second_file:
+        while True:
+            first = first_file.read(1024 * 1024)
+
+            if first != second_file.read(1024 * 1024):
+                return False
+
+            if not first:
+                return True
+
+
+class MemorySink:
+    """
+    Keep the generated files in memory instead of writing them to disk
+
+    The files are stored in `files` as a mapping of their path to their content. Folders only exist implicitly, as part
+    of the paths of the files.
+    """
+
+    def __init__(self):
+        """
+        Initialize sink
+        """
+        self.files: dict = {}
+
+    def begin(self):
+        """
+        Files are only kept in memory, so there is nothing to stage.
+        """
+
+    def publish(self) -> list:
+        """
+        Get the paths of the files.
+        """
+        return list(self.files)
+
+    def discard(self):
+        """
+        Files are only kept in memory, so there is nothing to discard.
+        """
+
+    @contextmanager
+    def open(self, path: str) -> Iterator[TextIO]:
+        """
+        Open a file for writing, which is stored once it has been written completely.
+        """
+        with io.StringIO() as file:
+            yield file
+            self.files[path] = file.getvalue()
+
+    def copy(self, source_path: str, path: str):
+        """
+        Copy a file from disk.
+        """
+        with open(source_path, "r", encoding="utf-8", newline="") as source_file:
+            self.files[path] = source_file.read()
+
+    def remove(self, path: str):
+        """
+        Remove a file, or every file inside a folder, if it exists.
+        """
+        for file_path in [file_path for file_path in self.files if _is_inside(file_path, path)]:
+            del self.files[file_path]
+
+    def exists(self, path: str) -> bool:
+        """
+        Check if a file exists.
+        """
+        return path in self.files
+
+    def create_folder(self, path: str):
+        """
+        Folders are not stored, so there is nothing to create.
+        """
+
+    def list_folders(self, path: str) -> list:
+        """
+        Get the names of the folders inside a folder, which are part of the paths of the files.
+        """
+        prefix = f"{path}/" if path else ""
+
+        return sorted({file_path[len(prefix):].split("/")[0] for file_path in self.files
+                       if file_path.startswith(prefix) and "/" in file_path[len(prefix):]})
+
+
+class PrefixedSink:
+    """
+    Write the generated files to a folder inside the output of another sink
+
+    Used to write every shard of a sharded conversion to a folder of its own (e.g. "shard-1/config/krakend.json"),
+    while the files are still staged and published together by the other sink.
+    """
+
+    def __init__(self, sink, prefix: str):
+        """
+        Initialize sink
+
+        Arguments:
+        sink -- The sink the files are written to
+        prefix -- The folder inside the output of the sink, relative to the output
+        """
+        self.sink = sink
+        self.prefix: str = prefix
+
+    def begin(self):
+        """
+        The files are staged by the other sink, so there is nothing to begin.
+        """
+
+    def publish(self) -> list:
+        """
+        The files are published by the other sink, so there is nothing to publish.
+        """
+        return []
+
+    def discard(self):
+        """
+        The files are discarded by the other sink, so there is nothing to discard.
+        """
+
+    def open(self, path: str):
+        """
+        Open a file inside the folder for writing.
+        """
+        return self.sink.open(f"{self.prefix}/{path}")
+
+    def copy(self, source_path: str, path: str):
+        """
+        Copy a file to the folder.
+        """
+        self.sink.copy(source_path, f"{self.prefix}/{path}")
+
+    def remove(self, path: str):
+        """
+        Remove a file or folder from the folder if it exists.
+        """
+        self.sink.remove(f"{self.prefix}/{path}")
+
+    def exists(self, path: str) -> bool:
+        """
+        Check if a file exists inside the folder.
+        """
+        return self.sink.exists(f"{self.prefix}/{path}")
+
+    def create_folder(self, path: str):
+        """
+        Create a folder inside the folder, creating the folder itself first if it does not exist.
+        """
+        self.sink.create_folder(self.prefix)
+        self.sink.create_folder(f"{self.prefix}/{path}")
+
+    def list_folders(self, path: str) -> list:
+        """
+        Get the names of the folders inside a folder of the folder.
+        """
+        return self.sink.list_folders(f"{self.prefix}/{path}".rstrip("/"))
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import re
+
+from app.logic.spec import OpenAPISpec
+
+# The fields of a backend that manipulate the response, which KrakenD can only do after decoding it
+MANIPULATION_FIELDS = ("allow", "deny", "mapping", "group", "target", "is_collection")
+
+# The namespaces of an endpoint or backend that manipulate the response (e.g. flatmap, static data or JMESPath)
+MANIPULATION_NAMESPACES = ("proxy", "modifier/jmespath")
+
+# JSON media types, including structured syntax suffixes (e.g. "application/problem+json")
+_JSON_MEDIA_TYPE = re.compile(r"^application/([\w.-]+\+)?json$")
+
+
+def is_json(media_type: str) -> bool:
+    """
+    Check if a media type (e.g. "application/json; charset=utf-8") is JSON.
+    """
+    return _JSON_MEDIA_TYPE.match(media_type.split(";")[0].strip().lower()) is not None
+
+
+def select_encoding(spec: OpenAPISpec, operation: dict, base: str, endpoint: dict) -> tuple:
+    """
+    Select the encoding of an endpoint, and return the encoding and the reason it was selected.
+
+    Responses are only decoded ("json") when the endpoint manipulates them and every successful response body is JSON.
+    Otherwise responses are proxied as is ("no-op"), which avoids decoding and encoding them again, and keeps binary and
+    streaming responses (e.g. images, downloads or text/event-stream) intact. The request body is always proxied as is,
+    so a non-JSON request body (e.g. an upload) does not prevent manipulating a JSON response.
+
+    Arguments:
+    spec -- The spec of the operation, used to resolve the $ref pointers of its request body and responses
+    operation -- The operation object
+    base -- The path of the document that contains the operation
+    endpoint -- The KrakenD endpoint, with endpoint.json and backend.json merged into it
+    """
+    response_media_types = []
+
+    for status, response in (operation.get("responses") or {}).items():
+        if str(status).startswith("2"):
+            response, _ = spec.resolver.resolve(response, base)
+            response_media_types.extend(response.get("content") or {})
+
+    for media_type in response_media_types:
+        if not is_json(media_type):
+            return "no-op", f"{media_type} response"
+
+    if not response_media_types:
+        return "no-op", "no response body"
+
+    if not is_manipulated(endpoint):
+        request_body, _ = spec.resolver.resolve(operation.get("requestBody") or {}, base)
+
+        for media_type in request_body.get("content") or {}:
+            if not is_json(media_type):
+                return "no-op", f"{media_type} request"
+
+        return "no-op", "no response manipulation"
+
+    return "json", "response manipulation"
+
+
+def is_manipulated(endpoint: dict) -> bool:
+    """
+    Check if the configuration of an endpoint or any of its backends manipulates the response.
+    """
+    return _is_manipulated(endpoint) or any(_is_manipulated(backend) for backend in endpoint["backend"])
+
+
+def _is_manipulated(config: dict) -> bool:
+    """
+    Check if the configuration of an endpoint or backend manipulates the response.
+    """
+    extra_config = config.get("extra_config") or {}
+
+    return any(field in config for field in MANIPULATION_FIELDS) \
+        or any(namespace in extra_config for namespace in MANIPULATION_NAMESPACES)
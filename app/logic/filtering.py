@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from app.logic.encoding import is_json
+from app.logic.refs import RefResolver
+from app.logic.spec import OpenAPISpec
+
+# The fields of a backend that already filter or reshape the response, which a generated allow list would conflict with
+FILTERING_FIELDS = ("allow", "deny", "mapping", "group", "is_collection")
+
+
+# Disable pylint too-few-public-methods due to the flattener only flattening schemas.
+# pylint: disable=too-few-public-methods
+class SchemaFlattener:
+    """
+    Flatten response schemas into the fields of a KrakenD allow list, using dot notation for the fields of nested
+    objects (e.g. ["id", "team.name"])
+
+    The fields of every referenced schema are memoized by reference, so the response models shared by many operations
+    are only flattened once per spec. Fields that can not be restricted further (arrays, free-form objects and
+    recursive models) are allowed as a whole.
+    """
+
+    def __init__(self, resolver: RefResolver):
+        """
+        Initialize flattener
+
+        Arguments:
+        resolver -- The $ref resolver of the spec
+        """
+        self.resolver: RefResolver = resolver
+
+        self.__cache: dict = {}
+        self.__flattening: set = set()
+
+    def flatten(self, schema, base: str = None) -> list | None:
+        """
+        Get the fields of a schema, or None if the schema does not restrict its fields (e.g. arrays, free-form objects
+        or objects with additionalProperties).
+
+        Arguments:
+        schema -- The schema object, which may contain a $ref
+        base -- The path of the document that contains the schema
+        """
+        if not isinstance(schema, dict) or "$ref" not in schema:
+            return self.__flatten(schema, base)
+
+        base = self.resolver.root if base is None else base
+        key = (base, schema["$ref"])
+
+        # A recursive model is allowed as a whole where it references itself
+        if key in self.__flattening:
+            return None
+
+        if key not in self.__cache:
+            self.__flattening.add(key)
+
+            try:
+                self.__cache[key] = self.__flatten(*self.resolver.resolve(schema, base))
+            finally:
+                self.__flattening.discard(key)
+
+        return self.__cache[key]
+
+    def __flatten(self, schema, base: str) -> list | None:
+        """
+        Get the fields of a schema without a $ref.
+        """
+        if not isinstance(schema, dict) or schema.get("type") == "array" or "items" in schema:
+            return None
+
+        if schema.get("additionalProperties") not in (None, False):
+            return None
+
+        members = [member for keyword in ("allOf", "oneOf", "anyOf") for member in schema.get(keyword) or []
+                   if not (isinstance(member, dict) and member.get("type") == "null")]
+
+        if "properties" not in schema and not members:
+            return None
+
+        fields = []
+
+        for name, property_schema in (schema.get("properties") or {}).items():
+            nested = self.flatten(property_schema, base)
+
+            if nested:
+                fields.append([f"{name}.{field}" for field in nested])
+            else:
+                fields.append([name])
+
+        for member in members:
+            member_fields = self.flatten(member, base)
+
+            if member_fields is None:
+                return None
+
+            fields.append(member_fields)
+
+        return merge_fields(fields)
+
+
+def merge_fields(fields: list) -> list:
+    """
+    Merge lists of fields in order, leaving out the nested fields of fields that are allowed as a whole.
+    """
+    merged = dict.fromkeys(field for group in fields for field in group)
+
+    return [field for field in merged
+            if not any(".".join(field.split(".")[:depth]) in merged for depth in range(1, field.count(".") + 1))]
+
+
+def get_allow_list(spec: OpenAPISpec, operation: dict, base: str, flattener: SchemaFlattener) -> list | None:
+    """
+    Get the allow list of an operation from the schemas of its successful responses.
+
+    Returns None when the fields of a response can not be restricted, e.g. because it is not JSON, has no schema or
+    returns an array, so the response is never filtered based on an incomplete schema.
+
+    Arguments:
+    spec -- The spec of the operation, used to resolve the $ref pointers of its responses
+    operation -- The operation object
+    base -- The path of the document that contains the operation
+    flattener -- The schema flattener of the spec
+    """
+    fields = []
+
+    for status, response in (operation.get("responses") or {}).items():
+        if not str(status).startswith("2"):
+            continue
+
+        response, response_base = spec.resolver.resolve(response, base)
+
+        for media_type, media in (response.get("content") or {}).items():
+            if not is_json(media_type):
+                return None
+
+            schema_fields = flattener.flatten((media or {}).get("schema"), response_base)
+
+            if schema_fields is None:
+                return None
+
+            fields.append(schema_fields)
+
+    return merge_fields(fields) if fields else None
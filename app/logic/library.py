@@ -0,0 +1,61 @@
+"""
+Convert OpenAPI specifications without touching the filesystem
+
+The functions in this module take already parsed specifications and configuration, and return the generated KrakenD
+configuration as a mapping of path to content, or write it to a sink (see app.logic.emitter). Nothing is read from or
+written to an input or output folder, so many gateways can be converted inside a single long running process.
+
+Example:
+files = convert_specs({"Users.json": users_spec}, config={"backend.json": {"encoding": "json"}}, env="prod")
+files["config/krakend.json"]
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import replace
+
+from app.logic.cache import ResultCache
+from app.logic.config import ConverterConfig
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.emitter import MemorySink
+from app.logic.options import ConverterOptions
+
+
+# Disable pylint too-many-arguments due to the conversion being configurable by both options and overrides.
+# pylint: disable=too-many-arguments
+def convert_specs_to_sink(specs: dict, sink, config: dict | None = None, options: ConverterOptions | None = None, *,
+                          logging_mode: int = logging.WARNING, cache: ResultCache | None = None, **overrides):
+    """
+    Convert parsed OpenAPI specifications and write the generated files to a sink.
+
+    Arguments:
+    specs -- The parsed OpenAPI specifications by filename (e.g. {"F1.V1.json": {...}}), converted in order
+    sink -- Where the generated files are written to, with paths relative to the output (e.g. "config/krakend.json")
+    config -- Custom configuration by filename (e.g. {"backend.json": {...}, "Dockerfile": "FROM ..."}), the default
+              configuration is used for the files that are not given
+    options -- The options of the conversion (see app.logic.options.ConverterOptions), e.g. the environment or a flat
+               configuration. Sharded specifications are written to shard-1/ to shard-N/ together with routing.json,
+               which maps the prefix of every specification to its shard
+    logging_mode -- The logging mode used. Use the logging mode from the python logging library
+    cache -- Reuse the results of specifications converted before with the same content, options and configuration,
+             share a single cache between calls (see app.logic.cache.ResultCache)
+    overrides -- Options given by name instead, overriding `options` (e.g. env="prod")
+    """
+    options = replace(options or ConverterOptions(), **overrides)
+    converter = OpenAPIToKrakenD(logging_mode, None, None, options=options, sink=sink, cache=cache,
+                                 config=ConverterConfig(files=config or {}, flat=options.flat,
+                                                        multiple_envs=options.multiple_envs))
+    converter.convert_documents(specs)
+
+
+def convert_specs(specs: dict, config: dict | None = None, options: ConverterOptions | None = None, *,
+                  logging_mode: int = logging.WARNING, cache: ResultCache | None = None, **overrides) -> dict:
+    """
+    Convert parsed OpenAPI specifications and return the generated files as a mapping of path to content.
+
+    See `convert_specs_to_sink` for the arguments.
+    """
+    sink = MemorySink()
+    convert_specs_to_sink(specs, sink, config, options, logging_mode=logging_mode, cache=cache, **overrides)
+
+    return sink.files
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import glob
+import json
+import os
+from typing import TextIO
+
+import yaml
+from yaml.events import (AliasEvent, MappingEndEvent, MappingStartEvent, ScalarEvent, SequenceEndEvent,
+                         SequenceStartEvent, StreamEndEvent)
+from yaml.nodes import ScalarNode
+
+# Use the libyaml bindings when PyYAML has been built with them, they parse around ten times faster
+try:
+    from yaml import CSafeLoader as YAMLLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as YAMLLoader
+
+from app.logic.streaming import load_selected
+from app.utils.errors import InvalidOpenAPIError
+
+# The file extensions of the OpenAPI specifications inside the input folder
+SPEC_EXTENSIONS = (".json", ".yaml", ".yml")
+
+_DEFAULT_TAGS = (None, "!", YAMLLoader.DEFAULT_MAPPING_TAG, YAMLLoader.DEFAULT_SEQUENCE_TAG)
+_MERGE_TAG = "tag:yaml.org,2002:merge"
+
+
+class _UnsupportedYAMLError(Exception):
+    """
+    Raised when a YAML document uses a feature only the regular YAML loader supports
+    """
+
+
+# Disable pylint too-few-public-methods due to the reader only reading a document once.
+# pylint: disable=too-few-public-methods
+class SelectiveYAMLReader:
+    """
+    Build selected parts of a YAML document directly from the events of the libyaml parser
+
+    PyYAML composes a node for every value and resolves the type of every scalar with a list of regular expressions
+    before constructing the document, which takes most of the time spent loading a large specification. This reader
+    builds the values straight from the parser events instead, and only resolves scalars that can be something other
+    than a string. Values that are not selected are skipped without being built.
+
+    Documents using explicit tags on collections, merge keys, complex keys or aliases to skipped values raise an
+    _UnsupportedYAMLError, in which case the regular loader has to be used.
+    """
+
+    def __init__(self, stream: TextIO):
+        """
+        Initialize reader
+
+        Arguments:
+        stream -- The stream containing the YAML document
+        """
+        self.loader = YAMLLoader(stream)
+        self.anchors: dict = {}
+
+    def read(self, selection: dict | bool):
+        """
+        Read the document, only keeping the selected values.
+        """
+        try:
+            self.loader.get_event()
+
+            if self.loader.check_event(StreamEndEvent):
+                return None
+
+            self.loader.get_event()
+            value = self.__select(selection)
+            self.loader.get_event()
+
+            if not self.loader.check_event(StreamEndEvent):
+                raise InvalidOpenAPIError("invalid YAML (expected a single document)")
+
+            return value
+        finally:
+            self.loader.dispose()
+
+    def __select(self, selection: dict | bool):
+        """
+        Build the next value, only keeping the selected values.
+        """
+        event = self.loader.get_event()
+
+        if isinstance(event, ScalarEvent):
+            value = self.__scalar(event)
+        elif isinstance(event, AliasEvent):
+            if event.anchor not in self.anchors:
+                raise _UnsupportedYAMLError(f"alias to skipped value {event.anchor}")
+            return self.anchors[event.anchor]
+        elif event.tag not in _DEFAULT_TAGS:
+            raise _UnsupportedYAMLError(f"explicit tag {event.tag}")
+        elif isinstance(event, SequenceStartEvent):
+            value = []
+            self.__anchor(event, value)
+
+            while not self.loader.check_event(SequenceEndEvent):
+                value.append(self.__select(True))
+        else:
+            value = {}
+            self.__anchor(event, value)
+
+            while not self.loader.check_event(MappingEndEvent):
+                key_event = self.loader.get_event()
+                if not isinstance(key_event, ScalarEvent):
+                    raise _UnsupportedYAMLError("complex mapping key")
+
+                key = self.__scalar(key_event)
+                sub_selection = True if selection is True else selection.get(key, selection.get("*"))
+
+                if sub_selection is None:
+                    self.__skip()
+                else:
+                    value[key] = self.__select(sub_selection)
+
+        if not isinstance(event, ScalarEvent):
+            self.loader.get_event()
+
+        return value
+
+    def __scalar(self, event: ScalarEvent):
+        """
+        Construct the value of a scalar, resolving its type the same way as the regular YAML loader.
+        """
+        tag = event.tag
+
+        if tag is None or tag == "!":
+            # Quoted scalars and scalars that do not start with the first character of a type are always strings
+            if not event.implicit[0] or (event.value and event.value[0] not in self.loader.yaml_implicit_resolvers):
+                return self.__anchor(event, event.value)
+
+            tag = self.loader.resolve(ScalarNode, event.value, event.implicit)
+
+        if tag == _MERGE_TAG:
+            raise _UnsupportedYAMLError("merge key")
+
+        node = ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+        constructor = self.loader.yaml_constructors.get(tag, self.loader.yaml_constructors[None])
+
+        return self.__anchor(event, constructor(self.loader, node))
+
+    def __skip(self):
+        """
+        Move past the next value without building it.
+        """
+        depth = 0
+
+        while True:
+            event = self.loader.get_event()
+
+            if isinstance(event, (MappingStartEvent, SequenceStartEvent)):
+                depth += 1
+            elif isinstance(event, (MappingEndEvent, SequenceEndEvent)):
+                depth -= 1
+
+            if depth == 0:
+                return
+
+    def __anchor(self, event, value):
+        """
+        Remember the value of an anchored event, so aliases to it can be resolved.
+        """
+        if event.anchor is not None:
+            self.anchors[event.anchor] = value
+
+        return value
+
+
+def is_yaml(path: str) -> bool:
+    """
+    Check if a file is a YAML document based on its extension.
+    """
+    return os.path.splitext(path)[1].lower() in (".yaml", ".yml")
+
+
+def is_spec(path: str) -> bool:
+    """
+    Check if a file is an OpenAPI specification based on its extension.
+    """
+    return os.path.splitext(path)[1].lower() in SPEC_EXTENSIONS
+
+
+def find_specs(folder_path: str) -> list:
+    """
+    Get the sorted paths of the OpenAPI specifications directly inside a folder.
+    """
+    return sorted(path for path in glob.glob(f"{folder_path}/*") if is_spec(path) and os.path.isfile(path))
+
+
+def load_yaml(stream: TextIO, selection: dict | bool = True):
+    """
+    Load the selected parts of a YAML document, falling back to the regular YAML loader for documents that use
+    features the selective reader does not support.
+    """
+    start = stream.tell()
+
+    try:
+        return SelectiveYAMLReader(stream).read(selection)
+    except _UnsupportedYAMLError:
+        stream.seek(start)
+        return _select(yaml.load(stream, Loader=YAMLLoader), selection)
+
+
+def _select(value, selection: dict | bool):
+    """
+    Only keep the selected parts of a loaded value.
+    """
+    if selection is True or not isinstance(value, dict):
+        return value
+
+    result = {}
+
+    for key, item in value.items():
+        sub_selection = selection.get(key, selection.get("*"))
+
+        if sub_selection is not None:
+            result[key] = _select(item, sub_selection)
+
+    return result
+
+
+def load_document(stream: TextIO, path: str, selection: dict | bool = True):
+    """
+    Parse a JSON or YAML document, based on the extension of its path.
+
+    A selection (see app.logic.streaming) only keeps the selected parts of the document. If the document is invalid, or
+    is not an object (e.g. an empty file, a list or a scalar), an InvalidOpenAPIError is raised.
+    """
+    document = _parse_document(stream, path, selection)
+
+    if document is None:
+        raise InvalidOpenAPIError("empty document")
+
+    if not isinstance(document, dict):
+        raise InvalidOpenAPIError(f"expected an object, got {type(document).__name__}")
+
+    return document
+
+
+def _parse_document(stream: TextIO, path: str, selection: dict | bool):
+    """
+    Parse a JSON or YAML document, based on the extension of its path.
+    """
+    if is_yaml(path):
+        try:
+            return load_yaml(stream, selection)
+        except yaml.YAMLError as error:
+            raise InvalidOpenAPIError(f"invalid YAML ({error})") from error
+
+    if selection is not True:
+        return load_selected(stream, selection)
+
+    try:
+        return json.load(stream)
+    except json.JSONDecodeError as error:
+        raise InvalidOpenAPIError(f"invalid JSON ({error})") from error
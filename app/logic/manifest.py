@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+
+from app.logic.spec import OpenAPISpec
+
+# The filename of the manifest inside the output folder
+MANIFEST_FILENAME = ".manifest.json"
+
+# Increase when the generated output changes, so manifests of older versions trigger a full build
+MANIFEST_VERSION = 4
+
+
+def hash_file(path: str) -> str:
+    """
+    Get the SHA-256 hash of the contents of a file.
+    """
+    file_hash = hashlib.sha256()
+
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+# Disable pylint too-few-public-methods due to the cache only returning hashes.
+# pylint: disable=too-few-public-methods
+class FileHashCache:
+    """
+    The content hashes of files, only recalculated when the size or modification time of a file changed
+    """
+
+    def __init__(self):
+        self.__hashes: dict = {}
+
+    def get(self, path: str) -> str:
+        """
+        Get the SHA-256 hash of the contents of a file.
+        """
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        if path not in self.__hashes or self.__hashes[path][0] != key:
+            self.__hashes[path] = (key, hash_file(path))
+
+        return self.__hashes[path][1]
+
+
+class BuildManifest:
+    """
+    The inputs of a build, used to only regenerate the files whose inputs changed since the previous build
+
+    The manifest stores the content hashes of every OpenAPI file and configuration file, the converter options and a
+    summary of every spec. The summaries allow writing the shared configuration files without parsing unchanged specs.
+    """
+
+    def __init__(self, options: dict, config: dict, specs: dict = None):
+        """
+        Initialize manifest
+
+        Arguments:
+        options -- The converter options that influence the output
+        config -- The content hashes of the configuration files, keyed by filename
+        specs -- The content hash and summary of every OpenAPI file, keyed by filename
+        """
+        self.options: dict = options
+        self.config: dict = config
+        self.specs: dict = specs if specs is not None else {}
+
+    @classmethod
+    def load(cls, output_folder_path: str) -> BuildManifest | None:
+        """
+        Load the manifest of the previous build.
+
+        Returns None if there is no (valid) manifest, meaning everything has to be generated.
+        """
+        try:
+            with open(os.path.join(output_folder_path, MANIFEST_FILENAME), "r", encoding="utf-8") as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return None
+
+        return cls(data["options"], data["config"], data["specs"])
+
+    def save(self, output_folder_path: str):
+        """
+        Write the manifest to the output folder.
+        """
+        data = {
+            "version": MANIFEST_VERSION,
+            "options": self.options,
+            "config": self.config,
+            "specs": self.specs
+        }
+
+        with open(os.path.join(output_folder_path, MANIFEST_FILENAME), "w", encoding="utf-8") as manifest_file:
+            # YAML specifications can contain dates, which are stored as strings
+            json.dump(data, manifest_file, indent=4, sort_keys=True, default=str)
+
+    def add_spec(self, spec: OpenAPISpec, spec_hash: str, hashes: FileHashCache):
+        """
+        Add an OpenAPI file to the manifest, together with the hashes of the files its $ref pointers refer to.
+        """
+        self.specs[spec.filename] = {"hash": spec_hash, "summary": spec.summary().data, "routes": spec.routes,
+                                     "encodings": spec.encodings,
+                                     "dependencies": {path: self.__get_hash(hashes, path)
+                                                      for path in spec.dependencies}}
+
+    def get_spec(self, filename: str, versioning: bool) -> OpenAPISpec:
+        """
+        Get the summary of an OpenAPI file from the manifest.
+        """
+        spec = OpenAPISpec(filename, self.specs[filename]["summary"], versioning)
+        spec.routes = self.specs[filename]["routes"]
+        spec.encodings = self.specs[filename]["encodings"]
+        spec.dependencies = list(self.specs[filename]["dependencies"])
+
+        return spec
+
+    def is_spec_changed(self, previous: BuildManifest | None, filename: str, spec_hash: str,
+                        hashes: FileHashCache) -> bool:
+        """
+        Check if the endpoint template of an OpenAPI file has to be regenerated, because the file itself, a file its
+        $ref pointers refer to or the configuration changed.
+        """
+        return (self.is_config_changed(previous, "endpoint.json", "backend.json")
+                or filename not in previous.specs
+                or previous.specs[filename]["hash"] != spec_hash
+                or any(self.__get_hash(hashes, path) != dependency_hash
+                       for path, dependency_hash in previous.specs[filename]["dependencies"].items()))
+
+    @staticmethod
+    def __get_hash(hashes: FileHashCache, path: str) -> str | None:
+        """
+        Get the hash of a referenced file, or None if it no longer exists.
+        """
+        try:
+            return hashes.get(path)
+        except OSError:
+            return None
+
+    def is_specs_changed(self, previous: BuildManifest | None) -> bool:
+        """
+        Check if any OpenAPI file has been added, removed or changed.
+        """
+        if previous is None or self.options != previous.options:
+            return True
+
+        return {filename: spec["hash"] for filename, spec in self.specs.items()} != \
+            {filename: spec["hash"] for filename, spec in previous.specs.items()}
+
+    def is_config_changed(self, previous: BuildManifest | None, *filenames: str) -> bool:
+        """
+        Check if the options or any of the configuration files have changed.
+        """
+        if previous is None or self.options != previous.options:
+            return True
+
+        return any(self.config.get(filename) != previous.config.get(filename) for filename in filenames)
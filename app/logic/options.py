@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+from app.logic.sharding import ROUTING_FILENAME, SHARD_STRATEGIES
+from app.utils.customlogger import LOG_FORMATS
+
+
+# Disable pylint too-many-instance-attributes due to every option of the converter being an attribute.
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class ConverterOptions:
+    """
+    The options of a conversion, as given on the command line or to the library functions
+
+    Arguments:
+    env -- Set the backend target URL to the description of the server object inside the OpenAPI specification
+           (picks the first entry if not specified). Given a list of environments, the settings of every environment
+           are written to config/settings/<env>/service.json in a single pass, and the list is moved to `envs`
+    envs -- The environments whose settings are written to a settings folder of their own
+    no_versioning -- Disable automatic versioning based on the OpenAPI specification
+    jobs -- The amount of processes used to convert the OpenAPI specifications (0 uses all CPU cores)
+    incremental -- Only regenerate the files whose inputs changed since the previous build
+    streaming -- Only parse the parts of the OpenAPI specifications used by the converter, to reduce memory usage
+    profile -- Record the wall time, CPU time and peak memory of every phase and spec
+    log_format -- The format of the log lines of the worker processes ("text" or "json"), the format of this process is
+                  set using app.utils.customlogger.configure_logging
+    flat -- Write a single krakend.json containing every endpoint, instead of templates rendered by KrakenD
+    compact -- Write the flat krakend.json without indentation
+    validate -- Validate the OpenAPI specifications against the OpenAPI 3.0/3.1 structure, and report every error of
+                every spec at once instead of stopping at the first invalid spec
+    all_envs -- Write the settings of every environment described by the servers of the OpenAPI specifications, like
+                giving every environment as `env`
+    shards -- Split the specs across this amount of KrakenD configurations, written to shard-1 to shard-N inside the
+              output folder together with a routing map of the prefix of every spec to its shard
+    shard_by -- How the specs are spread across the shards: "operations" balances the amount of endpoints, "prefix"
+                assigns every prefix by its hash
+    shard_groups -- Split the specs across named shards instead, by the filename patterns of the specs of every shard
+                    (see app.logic.sharding.load_shard_groups)
+    http_cache -- Cache the responses of GET endpoints whose successful responses declare a Cache-Control header inside
+                  KrakenD (qos/http-cache), unless disabled with `x-krakend-cache-ttl: false`
+    qos_policy -- The cache, timeout, concurrency, rate limit and circuit breaker settings of the operations by tag and
+                  path glob (see app.logic.qos.load_qos_policy)
+    auto_encoding -- Select the encoding of every endpoint from its content types, instead of the encoding inside
+                     endpoint.json and backend.json: "json" only when the response is manipulated, "no-op" otherwise
+    allow_lists -- Only pass the fields documented by the schemas of the successful responses of every operation to the
+                   clients, using an allow list on the backend (see app.logic.filtering)
+    """
+    env: str | list | None = None
+    envs: list | None = None
+    no_versioning: bool = False
+    jobs: int = 1
+    incremental: bool = False
+    streaming: bool = False
+    profile: bool = False
+    log_format: str = "text"
+    flat: bool = False
+    compact: bool = False
+    validate: bool = False
+    all_envs: bool = False
+    shards: int | None = None
+    shard_by: str = "operations"
+    shard_groups: dict | None = None
+    http_cache: bool = False
+    qos_policy: dict | None = None
+    auto_encoding: bool = False
+    allow_lists: bool = False
+
+    def __post_init__(self):
+        """
+        Move a list of environments to `envs`, and verify the options.
+
+        If the options can not be combined a ValueError is raised.
+        """
+        if isinstance(self.env, list):
+            self.env, self.envs = None, list(self.env)
+
+        if self.jobs <= 0:
+            self.jobs = os.cpu_count()
+
+        if self.log_format not in LOG_FORMATS:
+            raise ValueError(f"Unknown log format '{self.log_format}', use one of {', '.join(LOG_FORMATS)}")
+
+        self.__verify_envs()
+        self.__verify_shards()
+
+    @property
+    def versioning(self) -> bool:
+        """
+        Whether the specs are versioned based on the version inside the OpenAPI specification.
+        """
+        return not self.no_versioning
+
+    @property
+    def multiple_envs(self) -> bool:
+        """
+        Whether the settings of multiple environments are written.
+        """
+        return self.envs is not None or self.all_envs
+
+    @property
+    def sharded(self) -> bool:
+        """
+        Whether the specs are split across multiple KrakenD configurations.
+        """
+        return self.shards is not None or self.shard_groups is not None
+
+    def __verify_envs(self):
+        """
+        Verify that the environments can be written to a settings folder of their own.
+        """
+        if self.all_envs and self.env is not None or self.all_envs and self.envs is not None:
+            raise ValueError("Give either environments or all environments, not both")
+
+        if self.multiple_envs and self.flat:
+            raise ValueError("Multiple environments can not be written to a flat configuration, convert every "
+                             "environment separately")
+
+        if self.envs is not None:
+            if len(self.envs) == 0 or len(set(self.envs)) != len(self.envs):
+                raise ValueError("Give at least one environment, without duplicates")
+
+            for env in self.envs:
+                verify_env_name(env)
+
+    def __verify_shards(self):
+        """
+        Verify that the specs can be split across the shards.
+        """
+        if self.shards is not None and self.shard_groups is not None:
+            raise ValueError("Give either an amount of shards or shard groups, not both")
+
+        if self.shards is not None and self.shards < 1:
+            raise ValueError("Give at least one shard")
+
+        if self.shard_by not in SHARD_STRATEGIES:
+            raise ValueError(f"Unknown shard strategy '{self.shard_by}', use one of {', '.join(SHARD_STRATEGIES)}")
+
+        for name in self.shard_groups or {}:
+            if not name or name in (".", "..") or "/" in name or "\\" in name or name == ROUTING_FILENAME:
+                raise ValueError(f"Shard '{name}' can not be used as the name of an output folder")
+
+
+def verify_env_name(env: str):
+    """
+    Verify that an environment can be used as the name of a folder.
+    """
+    if not env or env in (".", "..") or "/" in env or "\\" in env:
+        raise ValueError(f"Environment '{env}' can not be used as the name of a settings folder")
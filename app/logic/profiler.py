@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Iterator
+
+# Increase when the structure of the report changes
+PROFILE_VERSION = 1
+
+
+class Profiler:
+    """
+    Record the wall time, CPU time and peak memory of every phase of a conversion and of every spec
+
+    Memory is measured using tracemalloc, which is only started while profiling as it slows down every allocation. The
+    peak memory of a phase includes the peaks of the phases nested inside it. When disabled, every method is a no-op.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Initialize profiler
+
+        Arguments:
+        enabled -- Record measurements, otherwise every method is a no-op
+        """
+        self.enabled: bool = enabled
+
+        self.phases: dict = {}
+        self.specs: dict = {}
+        self.total: dict = {}
+
+        self.__stack: list = []
+        self.__started_tracing: bool = False
+
+    def __getstate__(self):
+        """
+        Only send whether profiling is enabled to a worker process, not the measurements of the main process.
+        """
+        return {"enabled": self.enabled}
+
+    def __setstate__(self, state):
+        """
+        Recreate an empty profiler inside the worker process.
+        """
+        self.__init__(state["enabled"])
+
+    def start(self):
+        """
+        Start profiling a conversion, discarding the measurements of the previous conversion.
+        """
+        if not self.enabled:
+            return
+
+        self.phases = {}
+        self.specs = {}
+        self.total = {}
+        self.__stack = []
+
+        self.__trace()
+        self.__stack.append(self.__begin())
+
+    def stop(self):
+        """
+        Stop profiling the conversion and record the totals.
+        """
+        if not self.enabled or not self.__stack:
+            return
+
+        self.total = self.__end(self.__stack.pop())
+
+        if self.__started_tracing:
+            tracemalloc.stop()
+            self.__started_tracing = False
+
+    def phase(self, name: str, spec: str = None):
+        """
+        Measure a phase of the conversion, or a phase of a single spec if the filename of the spec is given.
+        """
+        if not self.enabled:
+            return nullcontext()
+
+        return self.__measure(name, spec)
+
+    def count(self, spec: str, name: str, amount: int = 1):
+        """
+        Increase an operation count (e.g. the amount of endpoints) of a spec.
+        """
+        if not self.enabled:
+            return
+
+        counts = self.__get_spec(spec)["counts"]
+        counts[name] = counts.get(name, 0) + amount
+
+    def pop_spec(self, spec: str) -> dict | None:
+        """
+        Remove and return the measurements of a spec, used to send them from a worker process to the main process.
+        """
+        return self.specs.pop(spec, None)
+
+    def add_spec(self, spec: str, measurements: dict | None):
+        """
+        Add the measurements of a spec that has been converted inside a worker process.
+        """
+        if self.enabled and measurements is not None:
+            self.specs[spec] = measurements
+
+    def slowest_specs(self, amount: int = 5) -> list:
+        """
+        Get the filenames and total wall time of the slowest specs, slowest first.
+        """
+        totals = {spec: sum(phase["wall"] for phase in measurements["phases"].values())
+                  for spec, measurements in self.specs.items()}
+
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:amount]
+
+    def report(self, **options) -> dict:
+        """
+        Get the measurements as a JSON serializable report.
+        """
+        return {
+            "version": PROFILE_VERSION,
+            "options": options,
+            "total": self.total,
+            "phases": self.phases,
+            "specs": self.specs
+        }
+
+    def save(self, path: str, **options):
+        """
+        Write the report to a JSON file.
+        """
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+        with open(path, "w", encoding="utf-8") as report_file:
+            json.dump(self.report(**options), report_file, indent=4)
+
+    @contextmanager
+    def __measure(self, name: str, spec: str | None) -> Iterator[None]:
+        """
+        Measure the code inside the context and add the measurements to the phase.
+        """
+        # Worker processes start tracing on their first measurement
+        self.__trace()
+
+        if self.__stack:
+            # Keep the peak of the enclosing phase before resetting it for this phase
+            self.__stack[-1]["peak"] = max(self.__stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+
+        start = self.__begin()
+        self.__stack.append(start)
+
+        try:
+            yield
+        finally:
+            measurements = self.__end(self.__stack.pop())
+
+            if self.__stack:
+                self.__stack[-1]["peak"] = max(self.__stack[-1]["peak"], measurements["peak_memory"])
+
+            phases = self.__get_spec(spec)["phases"] if spec is not None else self.phases
+            phase = phases.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0, "peak_memory": 0})
+            phase["calls"] += 1
+            phase["wall"] += measurements["wall"]
+            phase["cpu"] += measurements["cpu"]
+            phase["peak_memory"] = max(phase["peak_memory"], measurements["peak_memory"])
+
+    def __trace(self):
+        """
+        Start tracing memory allocations if they are not traced yet.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracing = True
+
+    @staticmethod
+    def __begin() -> dict:
+        """
+        Record the start of a measurement.
+        """
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+        return {"wall": time.perf_counter(), "cpu": time.process_time(), "peak": 0}
+
+    @staticmethod
+    def __end(start: dict) -> dict:
+        """
+        Get the measurements since the start of a measurement.
+        """
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+
+        return {
+            "wall": time.perf_counter() - start["wall"],
+            "cpu": time.process_time() - start["cpu"],
+            "peak_memory": max(peak, start["peak"])
+        }
+
+    def __get_spec(self, spec: str) -> dict:
+        """
+        Get the measurements of a spec.
+        """
+        return self.specs.setdefault(spec, {"phases": {}, "counts": {}})
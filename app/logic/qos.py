@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from decimal import Decimal
+
+from app.logic.loader import load_document
+from app.logic.spec import OpenAPISpec
+from app.utils.errors import InvalidOpenAPIError
+
+# The settings of an endpoint by name. Every setting can be given by the OpenAPI extension "x-krakend-<name>" on an
+# operation or on the root of the OpenAPI specification (for every operation of the spec), or inside a policy file
+SETTINGS = ("cache-ttl", "timeout", "concurrent-calls", "rate-limit", "proxy-rate-limit", "circuit-breaker")
+
+# The OpenAPI extensions of an operation that tune the cache, timeout and concurrency of its endpoint
+CACHE_TTL_EXTENSION = "x-krakend-cache-ttl"
+TIMEOUT_EXTENSION = "x-krakend-timeout"
+CONCURRENT_CALLS_EXTENSION = "x-krakend-concurrent-calls"
+
+# The KrakenD namespace of the backend cache, which caches responses as long as their Cache-Control header allows
+HTTP_CACHE_NAMESPACE = "qos/http-cache"
+
+# The KrakenD namespaces of the settings that protect the backends, with the section of the endpoint they belong to
+ROUTER_RATE_LIMIT_NAMESPACE = "qos/ratelimit/router"
+PROXY_RATE_LIMIT_NAMESPACE = "qos/ratelimit/proxy"
+CIRCUIT_BREAKER_NAMESPACE = "qos/circuit-breaker"
+
+_NAMESPACES = {
+    "rate-limit": ("endpoint", ROUTER_RATE_LIMIT_NAMESPACE),
+    "proxy-rate-limit": ("backend", PROXY_RATE_LIMIT_NAMESPACE),
+    "circuit-breaker": ("backend", CIRCUIT_BREAKER_NAMESPACE)
+}
+
+# A KrakenD duration (e.g. "300ms", "1.5s" or "5m")
+_DURATION = re.compile(r"^\d+(\.\d+)?(ns|us|µs|ms|s|m|h)$")
+
+
+def _is_number(value) -> bool:
+    """
+    Check if a value is a number >= 0.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+
+
+def _is_count(value) -> bool:
+    """
+    Check if a value is an integer >= 1.
+    """
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 1
+
+
+def _is_duration(value) -> bool:
+    """
+    Check if a value is a KrakenD duration.
+    """
+    return isinstance(value, str) and _DURATION.match(value) is not None
+
+
+# The fields of every namespace, with the check of their value, its description and whether the field is required
+_FIELDS = {
+    ROUTER_RATE_LIMIT_NAMESPACE: {
+        "max_rate": (_is_number, "a number >= 0", False),
+        "client_max_rate": (_is_number, "a number >= 0", False),
+        "capacity": (_is_number, "a number >= 0", False),
+        "client_capacity": (_is_number, "a number >= 0", False),
+        "every": (_is_duration, "a duration", False),
+        "strategy": (lambda value: value in ("ip", "header", "param"), "one of ip, header or param", False),
+        "key": (lambda value: isinstance(value, str) and value != "", "a non-empty string", False)
+    },
+    PROXY_RATE_LIMIT_NAMESPACE: {
+        "max_rate": (lambda value: _is_number(value) and value > 0, "a number > 0", True),
+        "capacity": (_is_count, "an integer >= 1", True),
+        "every": (_is_duration, "a duration", False)
+    },
+    CIRCUIT_BREAKER_NAMESPACE: {
+        "interval": (_is_count, "an integer >= 1 (seconds)", True),
+        "timeout": (_is_count, "an integer >= 1 (seconds)", True),
+        "max_errors": (_is_count, "an integer >= 1", True),
+        "name": (lambda value: isinstance(value, str), "a string", False),
+        "log_status_change": (lambda value: isinstance(value, bool), "a boolean", False)
+    }
+}
+
+
+def get_duration(value, extension: str) -> str:
+    """
+    Get a KrakenD duration from a duration (e.g. "300ms") or an amount of seconds.
+
+    If the value is not a duration an InvalidOpenAPIError is raised.
+    """
+    # Amounts of seconds are written without exponent notation (e.g. 10000000s instead of 1e+07s)
+    if _is_number(value):
+        if isinstance(value, int) or value.is_integer():
+            return f"{int(value)}s"
+
+        return f"{format(Decimal(repr(value)), 'f')}s"
+
+    if _is_duration(value):
+        return value
+
+    raise InvalidOpenAPIError(f"{extension} should be a duration (e.g. \"300ms\") or an amount of seconds, "
+                              f"got {value!r}")
+
+
+def load_qos_policy(path: str) -> dict:
+    """
+    Load a policy file, which gives the settings of the operations by tag and by path glob.
+
+    Example: {"tags": {"Bets": {"rate-limit": {"max_rate": 100}}},
+              "paths": {"/bets/v1/bet*": {"circuit-breaker": {"interval": 60, "timeout": 10, "max_errors": 5}}}}
+
+    The paths include the prefix of the spec. An operation gets the settings of every tag it has, then of every path
+    glob matching its path, in the order of the policy file, so later matches take precedence.
+    """
+    with open(path, "r", encoding="utf-8") as policy_file:
+        policy = load_document(policy_file, path)
+
+    filename = os.path.basename(path)
+
+    if not isinstance(policy, dict) or not set(policy) <= {"tags", "paths"}:
+        raise ValueError(f"{filename}: expected the settings by tag in 'tags' and by path glob in 'paths'")
+
+    for section, rules in policy.items():
+        if not isinstance(rules, dict):
+            raise ValueError(f"{filename}: expected the settings by {section[:-1]} in '{section}'")
+
+        for match, settings in rules.items():
+            try:
+                _verify_settings(settings)
+            except InvalidOpenAPIError as error:
+                raise ValueError(f"{filename}: {section}: {match}: {error}") from error
+
+    return policy
+
+
+# Disable pylint too-many-arguments due to the settings depending on both the operation and the options.
+# pylint: disable=too-many-arguments
+def get_endpoint_qos(spec: OpenAPISpec, method: str, path: str, operation: dict, base: str, *,
+                     http_cache: bool = False, policy: dict | None = None) -> tuple:
+    """
+    Get the settings of the endpoint and its backend for an operation, from the policy and the extensions of the spec
+    and of the operation.
+
+    Returns a tuple of the settings of the endpoint (e.g. {"timeout": "3s", "extra_config": {...}}) and the settings of
+    the backend (e.g. {"extra_config": {"qos/http-cache": {}}}), merged into endpoint.json and backend.json using
+    `merge_qos`.
+
+    Arguments:
+    spec -- The spec of the operation, used to resolve the $ref pointers of its responses
+    method -- The method of the operation (e.g. "get")
+    path -- The path of the operation, without prefix
+    operation -- The operation object
+    base -- The path of the document that contains the operation
+    http_cache -- Cache the responses of GET operations that declare a Cache-Control header, unless the operation
+                  disables caching with `x-krakend-cache-ttl: false`
+    policy -- The settings by tag and path glob (see `load_qos_policy`)
+    """
+    settings = _get_settings(spec, path, operation, policy or {})
+    cache = http_cache and method == "get" and _has_cache_control(spec, operation, base)
+    endpoint, backend = _get_cache(settings.get("cache-ttl"), cache)
+
+    if settings.get("timeout") is not None:
+        endpoint["timeout"] = get_duration(settings["timeout"], TIMEOUT_EXTENSION)
+
+    if settings.get("concurrent-calls") is not None:
+        endpoint["concurrent_calls"] = settings["concurrent-calls"]
+
+    for name, (section, namespace) in _NAMESPACES.items():
+        # An object setting is disabled with false, e.g. to leave out the circuit breaker of a policy
+        if settings.get(name) not in (None, False):
+            target = endpoint if section == "endpoint" else backend
+            target.setdefault("extra_config", {})[namespace] = settings[name]
+
+    return endpoint, backend
+
+
+def merge_qos(target: dict, settings: dict):
+    """
+    Merge the settings of an endpoint or backend into its configuration, which already contains endpoint.json or
+    backend.json.
+
+    The namespaces inside `extra_config` are merged field by field, so a policy or extension only has to give the fields
+    that differ from the configuration files. Every merged namespace is verified, and an InvalidOpenAPIError is raised
+    if it is incomplete or contains an invalid value.
+    """
+    for key, value in settings.items():
+        if key != "extra_config":
+            target[key] = value
+            continue
+
+        extra_config = target.setdefault("extra_config", {})
+
+        for namespace, config in value.items():
+            if isinstance(extra_config.get(namespace), dict):
+                config = {**extra_config[namespace], **config}
+
+            if namespace in _FIELDS:
+                _verify_fields(namespace, config, True)
+
+            extra_config[namespace] = config
+
+
+def _get_cache(cache_ttl, cache: bool) -> tuple:
+    """
+    Get the cache settings of the endpoint and its backend, where the cache TTL setting overrides whether the responses
+    declare a Cache-Control header.
+    """
+    endpoint = {}
+    backend = {}
+
+    if cache_ttl is False:
+        cache = False
+    elif cache_ttl is True:
+        cache = True
+    elif cache_ttl is not None:
+        endpoint["cache_ttl"] = get_duration(cache_ttl, CACHE_TTL_EXTENSION)
+        cache = True
+
+    if cache:
+        backend["extra_config"] = {HTTP_CACHE_NAMESPACE: {}}
+
+    return endpoint, backend
+
+
+def _get_settings(spec: OpenAPISpec, path: str, operation: dict, policy: dict) -> dict:
+    """
+    Get the settings of an operation, from the matching tags and paths of the policy, then the extensions of the spec
+    and then the extensions of the operation. The fields of object settings are merged, other settings are replaced.
+    """
+    tags = operation.get("tags") or []
+
+    layers = [settings for tag, settings in policy.get("tags", {}).items() if tag in tags]
+    layers += [settings for glob, settings in policy.get("paths", {}).items()
+               if fnmatch.fnmatchcase(f"/{spec.prefix}{path}", glob)]
+
+    for data in (spec.data, operation):
+        extensions = {name: data[f"x-krakend-{name}"] for name in SETTINGS if f"x-krakend-{name}" in data}
+        _verify_settings(extensions)
+        layers.append(extensions)
+
+    settings = {}
+
+    for layer in layers:
+        for name, value in layer.items():
+            if isinstance(value, dict) and isinstance(settings.get(name), dict):
+                settings[name] = {**settings[name], **value}
+            else:
+                settings[name] = value
+
+    return settings
+
+
+def _verify_settings(settings):
+    """
+    Verify the values of settings by name, without requiring the fields that can also be given by the configuration
+    files. If the verification fails an InvalidOpenAPIError is raised.
+    """
+    if not isinstance(settings, dict):
+        raise InvalidOpenAPIError("expected the settings by name")
+
+    for name, value in settings.items():
+        if name not in SETTINGS:
+            raise InvalidOpenAPIError(f"unknown setting '{name}', expected one of {', '.join(SETTINGS)}")
+
+        # The cache can be enabled or disabled without giving a duration
+        if name == "timeout" or name == "cache-ttl" and not isinstance(value, bool):
+            get_duration(value, f"x-krakend-{name}")
+
+        if name == "concurrent-calls" and not _is_count(value):
+            raise InvalidOpenAPIError(f"{CONCURRENT_CALLS_EXTENSION} should be an integer >= 1, got {value!r}")
+
+        if name in _NAMESPACES and value is not False:
+            if not isinstance(value, dict):
+                raise InvalidOpenAPIError(f"x-krakend-{name} should be an object or false, got {value!r}")
+
+            _verify_fields(_NAMESPACES[name][1], value, False)
+
+
+def _verify_fields(namespace: str, config: dict, complete: bool):
+    """
+    Verify the fields of a namespace, and if the configuration is complete, that the required fields are given.
+    """
+    fields = _FIELDS[namespace]
+
+    for field, value in config.items():
+        if field in fields and not fields[field][0](value):
+            raise InvalidOpenAPIError(f"{namespace}: '{field}' should be {fields[field][1]}, got {value!r}")
+
+    if not complete:
+        return
+
+    missing = [field for field, (_, _, required) in fields.items() if required and field not in config]
+
+    if missing:
+        raise InvalidOpenAPIError(f"{namespace}: missing {', '.join(missing)}")
+
+    if namespace == ROUTER_RATE_LIMIT_NAMESPACE:
+        if "max_rate" not in config and "client_max_rate" not in config:
+            raise InvalidOpenAPIError(f"{namespace}: give max_rate, client_max_rate or both")
+
+        if config.get("strategy") in ("header", "param") and "key" not in config:
+            raise InvalidOpenAPIError(f"{namespace}: the {config['strategy']} strategy requires a key")
+
+
+def _has_cache_control(spec: OpenAPISpec, operation: dict, base: str) -> bool:
+    """
+    Check if any successful response of an operation declares a Cache-Control header.
+    """
+    for status, response in (operation.get("responses") or {}).items():
+        if not str(status).startswith("2"):
+            continue
+
+        response, _ = spec.resolver.resolve(response, base)
+
+        if any(name.lower() == "cache-control" for name in (response.get("headers") or {})):
+            return True
+
+    return False
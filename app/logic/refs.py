@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+from urllib.parse import unquote
+
+from app.logic.loader import load_document
+from app.utils.errors import InvalidOpenAPIError
+
+
+# Disable pylint too-few-public-methods due to the resolver only resolving pointers.
+# pylint: disable=too-few-public-methods
+class RefResolver:
+    """
+    Resolve $ref pointers inside an OpenAPI specification
+
+    Both local references ("#/components/parameters/Page") and references to other files relative to the referring
+    document ("common.json#/components/parameters/Page") are supported. Every resolved reference is memoized per
+    document, so specifications where thousands of operations reference the same components stay linear in cost.
+    """
+
+    def __init__(self, document: dict, path: str = None):
+        """
+        Initialize resolver
+
+        Arguments:
+        document -- The parsed OpenAPI specification
+        path -- The path of the OpenAPI specification, used to resolve references to other files
+        """
+        self.root: str = os.path.abspath(path) if path else ""
+
+        self.__documents: dict = {self.root: document}
+        self.__cache: dict = {}
+
+    def resolve(self, value, base: str = None) -> tuple:
+        """
+        Follow the $ref of a value until a value without a $ref is found.
+
+        Returns the resolved value and the path of the document that contains it, which is the base for the references
+        inside the resolved value. Values without a $ref are returned as is.
+
+        Arguments:
+        value -- The value that may contain a $ref
+        base -- The path of the document that contains the value (defaults to the OpenAPI specification)
+        """
+        base = self.root if base is None else base
+        seen = []
+
+        while isinstance(value, dict) and "$ref" in value:
+            reference = value["$ref"]
+            key = (base, reference)
+
+            if key in seen:
+                chain = " -> ".join(ref for _, ref in seen + [key])
+                raise InvalidOpenAPIError(f"circular $ref ({chain})")
+            seen.append(key)
+
+            if key not in self.__cache:
+                self.__cache[key] = self.__lookup(reference, base)
+
+            value, base = self.__cache[key]
+
+        # Memoize the final result for every reference in the chain
+        for key in seen:
+            self.__cache[key] = (value, base)
+
+        return value, base
+
+    @property
+    def documents(self) -> list:
+        """
+        The paths of the other documents loaded to resolve references, in the order they were loaded
+        """
+        return [path for path in self.__documents if path != self.root]
+
+    def __lookup(self, reference: str, base: str) -> tuple:
+        """
+        Get the value a single reference points to, without following further references.
+        """
+        if not isinstance(reference, str):
+            raise InvalidOpenAPIError(f"invalid $ref ({reference})")
+
+        location, _, pointer = reference.partition("#")
+
+        if location:
+            if "://" in location:
+                raise InvalidOpenAPIError(f"remote $ref is not supported ({reference})")
+            if not base:
+                raise InvalidOpenAPIError(f"$ref to another file requires the path of the specification ({reference})")
+
+            base = os.path.normpath(os.path.join(os.path.dirname(base), unquote(location)))
+
+        try:
+            return get_pointer(self.__load(base, reference), pointer), base
+        except KeyError as error:
+            raise InvalidOpenAPIError(f"unresolvable $ref ({reference})") from error
+
+    def __load(self, path: str, reference: str):
+        """
+        Load a referenced document, or return it from the cache if it has been loaded before.
+        """
+        if path not in self.__documents:
+            try:
+                with open(path, "r", encoding="utf-8") as document_file:
+                    self.__documents[path] = load_document(document_file, path)
+            except (OSError, InvalidOpenAPIError) as error:
+                raise InvalidOpenAPIError(f"unresolvable $ref ({reference}): {error}") from error
+
+        return self.__documents[path]
+
+
+def get_pointer(document, pointer: str):
+    """
+    Get the value a JSON pointer (e.g. "/components/schemas/Driver") points to inside a document.
+
+    If the value does not exist a KeyError is raised.
+    """
+    value = document
+
+    for token in pointer.split("/")[1:] if pointer else []:
+        token = unquote(token).replace("~1", "/").replace("~0", "~")
+
+        if isinstance(value, dict) and token in value:
+            value = value[token]
+        elif isinstance(value, list) and token.isdigit() and int(token) < len(value):
+            value = value[int(token)]
+        else:
+            raise KeyError(pointer)
+
+    return value
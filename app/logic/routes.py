@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+
+# Disable pylint too-few-public-methods due to the node only holding the segments of the trie.
+# pylint: disable=too-few-public-methods
+class _RouteNode:
+    """
+    A segment of the routes inside the path trie of a method
+    """
+
+    __slots__ = ("literals", "parameter", "parameter_name", "route", "endpoint")
+
+    def __init__(self, route: tuple):
+        """
+        Initialize node
+
+        Arguments:
+        route -- The first route passing through this node, used to report conflicts
+        """
+        self.literals: dict = {}
+        self.parameter: _RouteNode | None = None
+        self.parameter_name: str | None = None
+        self.route: tuple = route
+        self.endpoint: tuple | None = None
+
+
+class RouteIndex:
+    """
+    An index of the endpoints of every spec, which detects routes KrakenD can not tell apart
+
+    Every method has its own path trie, like the router of KrakenD, where every segment of a path is either a literal
+    or a parameter (e.g. "{id}"). Adding a route walks the trie once, so checking an estate takes time linear in the
+    total amount of path segments. Three kinds of problems are detected:
+
+    - Duplicates: the same method and path, ignoring the names of the parameters. KrakenD refuses to start.
+    - Parameter conflicts: parameters with different names at the same position (e.g. "/items/{id}" and
+      "/items/{item_id}/details"). KrakenD refuses to start.
+    - Shadowed parameters: a literal and a parameter at the same position (e.g. "/items/{id}" and "/items/search").
+      KrakenD routes "/items/search" to the literal route, which may not be intended, so this is only a warning.
+    """
+
+    def __init__(self):
+        """
+        Initialize route index
+        """
+        self.trees: dict = {}
+        self.errors: list = []
+        self.count: int = 0
+
+    def add(self, method: str, path: str, source: str):
+        """
+        Add the route of an endpoint, and record an error if it conflicts with a route added before.
+
+        Arguments:
+        method -- The HTTP method of the endpoint (e.g. "GET")
+        path -- The full path of the endpoint, including the prefix (e.g. "/f1/v1/items/{id}")
+        source -- The filename of the OpenAPI specification that defines the endpoint
+        """
+        route = (method, path, source)
+        self.count += 1
+
+        if method not in self.trees:
+            self.trees[method] = _RouteNode(route)
+
+        node = self.trees[method]
+
+        for segment in path.split("/")[1:]:
+            if "{" in segment:
+                if node.parameter is None:
+                    node.parameter = _RouteNode(route)
+                    node.parameter_name = segment
+                elif node.parameter_name != segment:
+                    self.errors.append(f"{self.__describe(route)} conflicts with "
+                                       f"{self.__describe(node.parameter.route)} (parameters {segment} and "
+                                       f"{node.parameter_name} at the same position)")
+                    return
+
+                node = node.parameter
+            else:
+                if segment not in node.literals:
+                    node.literals[segment] = _RouteNode(route)
+
+                node = node.literals[segment]
+
+        if node.endpoint is not None:
+            self.errors.append(f"{self.__describe(route)} duplicates {self.__describe(node.endpoint)}")
+            return
+
+        node.endpoint = route
+
+    def shadowed(self) -> list:
+        """
+        Get a warning for every literal segment that shares its position with a parameter segment.
+        """
+        warnings = []
+
+        for tree in self.trees.values():
+            stack = [tree]
+
+            while stack:
+                node = stack.pop()
+
+                if node.parameter is not None:
+                    for literal in node.literals.values():
+                        warnings.append(f"{self.__describe(literal.route)} shadows "
+                                        f"{self.__describe(node.parameter.route)}")
+
+                    stack.append(node.parameter)
+
+                stack.extend(node.literals.values())
+
+        return warnings
+
+    @staticmethod
+    def __describe(route: tuple) -> str:
+        """
+        Describe a route for a message (e.g. "GET /f1/v1/items/{id} (F1.json)").
+        """
+        method, path, source = route
+
+        return f"{method} {path} ({source})"
@@ -0,0 +1,319 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import json
+import logging
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from app.logic.cache import ResultCache
+from app.logic.library import convert_specs
+from app.logic.loader import is_spec, load_document
+from app.utils.customlogger import CustomLogger
+from app.utils.errors import InvalidOpenAPIError, OpenAPIFileNotFoundError
+
+# The options of a conversion request, with their types
+REQUEST_OPTIONS = {"env": (str, list), "all_envs": bool, "no_versioning": bool, "flat": bool, "compact": bool,
+                   "validate": bool, "shards": int, "shard_by": str, "shard_groups": dict,
+                   "http_cache": bool, "qos_policy": dict,
+                   "auto_encoding": bool, "allow_lists": bool}
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 411: "Length Required",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """
+    An invalid request, answered with an HTTP error status
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status: int = status
+
+
+# Disable pylint too-many-instance-attributes due to required attributes for the server to work.
+# pylint: disable=too-many-instance-attributes
+class ConversionServer:
+    """
+    Convert OpenAPI specifications on request, inside a single long running process
+
+    `POST /convert` takes a JSON body with the specifications by filename (parsed, or as JSON or YAML text), optional
+    custom configuration files by filename and the options of the conversion:
+
+    {"specs": {"Users.json": {...}}, "config": {"backend.json": {...}}, "options": {"env": "prod", "flat": true}}
+
+    The generated files are returned as a JSON object of path to content, or as a zip archive when requesting
+    `?format=zip` or `Accept: application/zip`. `GET /health` returns the size and hit rate of the cache.
+
+    The default configuration files are parsed once per process, and the result of every converted specification is
+    cached by content hash, so unchanged specifications of a tenant are not converted again. Conversions run on a
+    thread pool, so the server keeps accepting connections while converting.
+    """
+
+    # Disable pylint too-many-arguments due to every setting of the server being configurable.
+    # pylint: disable=too-many-arguments
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, *, cache_size: int = 1024, workers: int = 4,
+                 max_body_size: int = 64 * 1024 * 1024, logging_mode: int = logging.WARNING,
+                 log_format: str = "text"):
+        """
+        Initialize server
+
+        Arguments:
+        host -- The address the server listens on
+        port -- The port the server listens on (0 picks a free port)
+        cache_size -- The maximum amount of converted specifications kept in memory
+        workers -- The maximum amount of conversions running at the same time
+        max_body_size -- The maximum size of a request body in bytes
+        logging_mode -- The logging mode used. Use the logging mode from the python logging library
+        log_format -- The format of the log lines of the worker processes of the conversions ("text" or "json"), the
+                      format of this process is set using app.utils.customlogger.configure_logging
+        """
+        self.host: str = host
+        self.port: int = port
+        self.max_body_size: int = max_body_size
+        self.logging_mode: int = logging_mode
+        self.log_format: str = log_format
+        self.logger = CustomLogger(logging_mode)
+
+        self.cache: ResultCache = ResultCache(cache_size)
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=workers)
+        self.server: asyncio.AbstractServer | None = None
+
+    async def start(self):
+        """
+        Start listening, and set `port` to the port the server listens on.
+        """
+        self.server = await asyncio.start_server(self.__handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+        self.logger.info("Listening on http://%s:%d", self.host, self.port)
+
+    async def serve_forever(self):
+        """
+        Start listening and handle requests until the server is closed.
+        """
+        await self.start()
+
+        async with self.server:
+            await self.server.serve_forever()
+
+    def run(self):
+        """
+        Handle requests until interrupted.
+        """
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            self.logger.info("Stopped")
+        finally:
+            self.executor.shutdown()
+
+    async def close(self):
+        """
+        Stop listening and wait for the running conversions.
+        """
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+        self.executor.shutdown()
+
+    def convert(self, body: dict, archive: bool) -> tuple:
+        """
+        Convert the specifications of a request, and return the content type and content of the response.
+        """
+        if not isinstance(body, dict) or not isinstance(body.get("specs"), dict):
+            raise RequestError(400, "expected a JSON object with the specifications by filename in 'specs'")
+
+        specs = {filename: self.__parse_spec(filename, spec) for filename, spec in body["specs"].items()}
+        config = body.get("config") or {}
+        options = body.get("options") or {}
+
+        if not isinstance(config, dict) or not isinstance(options, dict):
+            raise RequestError(400, "'config' and 'options' have to be JSON objects")
+
+        for name, value in options.items():
+            if name not in REQUEST_OPTIONS:
+                raise RequestError(400, f"unknown option '{name}'")
+            if value is not None and not isinstance(value, REQUEST_OPTIONS[name]):
+                raise RequestError(400, f"option '{name}' has the wrong type")
+
+        if options.get("compact") and not options.get("flat"):
+            raise RequestError(400, "option 'compact' requires 'flat'")
+
+        files = convert_specs(specs, config, logging_mode=self.logging_mode, cache=self.cache,
+                              log_format=self.log_format, **options)
+
+        if archive:
+            return "application/zip", self.__archive(files)
+
+        return "application/json", json.dumps({"files": files}).encode("utf-8")
+
+    @staticmethod
+    def __parse_spec(filename: str, spec):
+        """
+        Parse a specification given as JSON or YAML text, based on the extension of its filename.
+        """
+        if os.path.basename(filename) != filename or not is_spec(filename):
+            raise RequestError(400, f"invalid specification filename '{filename}'")
+
+        if isinstance(spec, str):
+            try:
+                return load_document(io.StringIO(spec), filename)
+            except InvalidOpenAPIError as error:
+                raise InvalidOpenAPIError(f"{filename}: {error}") from error
+
+        if not isinstance(spec, dict):
+            raise RequestError(400, f"{filename}: expected a JSON object or JSON or YAML text")
+
+        return spec
+
+    @staticmethod
+    def __archive(files: dict) -> bytes:
+        """
+        Create a zip archive of the generated files.
+        """
+        with io.BytesIO() as archive_file:
+            with zipfile.ZipFile(archive_file, "w", zipfile.ZIP_DEFLATED) as archive:
+                for path, content in sorted(files.items()):
+                    archive.writestr(path, content)
+
+            return archive_file.getvalue()
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Handle the requests of a connection, which is kept open between requests unless the client closes it.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                keep_alive = await self.__handle_request(request_line, reader, writer)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def __handle_request(self, request_line: bytes, reader: asyncio.StreamReader,
+                               writer: asyncio.StreamWriter) -> bool:
+        """
+        Read a single request, write its response, and return whether the connection can be reused.
+        """
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            self.__respond(writer, 400, {"error": "invalid request line"}, False)
+            return False
+
+        headers = await self.__read_headers(reader)
+        keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+        url = urlsplit(target)
+
+        try:
+            body = await self.__read_body(method, headers, reader)
+            content_type, content = await self.__route(method, url.path, parse_qs(url.query), headers, body)
+            status = 200
+        except RequestError as error:
+            status, content_type, content = error.status, "application/json", self.__error(str(error))
+            keep_alive = keep_alive and error.status not in (411, 413)
+        except (InvalidOpenAPIError, OpenAPIFileNotFoundError, ValueError) as error:
+            status, content_type, content = 400, "application/json", self.__error(str(error))
+        except Exception as error:  # pylint: disable=broad-except
+            self.logger.error("Conversion failed", exc_info=error)
+            status, content_type, content = 500, "application/json", self.__error("internal server error")
+
+        self.logger.info("%s %s %d", method, url.path, status)
+        self.__write_response(writer, status, content_type, content, keep_alive)
+
+        return keep_alive
+
+    @staticmethod
+    async def __read_headers(reader: asyncio.StreamReader) -> dict:
+        """
+        Read the headers of a request, by lowercase name.
+        """
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        return headers
+
+    async def __read_body(self, method: str, headers: dict, reader: asyncio.StreamReader) -> bytes:
+        """
+        Read the body of a request, which has to have a Content-Length.
+        """
+        if method != "POST":
+            return b""
+
+        if "content-length" not in headers or not headers["content-length"].isdigit():
+            raise RequestError(411, "a Content-Length header is required")
+
+        length = int(headers["content-length"])
+        if length > self.max_body_size:
+            raise RequestError(413, f"the request body is larger than {self.max_body_size} bytes")
+
+        return await reader.readexactly(length)
+
+    async def __route(self, method: str, path: str, query: dict, headers: dict, body: bytes) -> tuple:
+        """
+        Handle a request, and return the content type and content of the response.
+        """
+        if path == "/health":
+            if method != "GET":
+                raise RequestError(405, "use GET")
+
+            health = {"status": "ok", "cached_specs": len(self.cache), "hits": self.cache.hits,
+                      "misses": self.cache.misses}
+            return "application/json", json.dumps(health).encode("utf-8")
+
+        if path == "/convert":
+            if method != "POST":
+                raise RequestError(405, "use POST")
+
+            try:
+                request = json.loads(body)
+            except ValueError as error:
+                raise RequestError(400, f"invalid JSON ({error})") from error
+
+            archive = query.get("format") == ["zip"] or "application/zip" in headers.get("accept", "")
+
+            return await asyncio.get_running_loop().run_in_executor(self.executor, self.convert, request, archive)
+
+        raise RequestError(404, f"unknown path '{path}'")
+
+    def __respond(self, writer: asyncio.StreamWriter, status: int, content: dict, keep_alive: bool):
+        """
+        Write a JSON response.
+        """
+        self.__write_response(writer, status, "application/json", json.dumps(content).encode("utf-8"), keep_alive)
+
+    @staticmethod
+    def __error(message: str) -> bytes:
+        """
+        Get the content of an error response.
+        """
+        return json.dumps({"error": message}).encode("utf-8")
+
+    @staticmethod
+    def __write_response(writer: asyncio.StreamWriter, status: int, content_type: str, content: bytes,
+                         keep_alive: bool):
+        """
+        Write the status line, headers and content of a response.
+        """
+        head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(content)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+
+        writer.write(head.encode("latin-1") + content)
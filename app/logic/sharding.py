@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import os
+
+from app.logic.loader import load_document
+from app.logic.spec import OpenAPISpec
+
+# The strategies that spread the prefixes across a given amount of shards
+SHARD_STRATEGIES = ("operations", "prefix")
+
+# The filename of the routing map inside the output folder
+ROUTING_FILENAME = "routing.json"
+
+
+def load_shard_groups(path: str) -> dict:
+    """
+    Load an explicit group mapping, which maps the name of every shard to the filename patterns of its specs.
+
+    Example: {"public": ["Bets*.json", "Users.json"], "internal": ["Results.json"]}
+    """
+    with open(path, "r", encoding="utf-8") as groups_file:
+        groups = load_document(groups_file, path)
+
+    if not isinstance(groups, dict) or not groups:
+        raise ValueError(f"{os.path.basename(path)}: expected the filename patterns by shard name")
+
+    for name, patterns in groups.items():
+        if not isinstance(patterns, list) or not all(isinstance(pattern, str) for pattern in patterns):
+            raise ValueError(f"{os.path.basename(path)}: expected a list of filename patterns for shard '{name}'")
+
+    return groups
+
+
+class ShardPlan:
+    """
+    The assignment of the specs to shards, where every shard is a separate KrakenD deployment
+
+    Specs are assigned by their prefix (e.g. "/bets/v1"), so a load balancer can route a request to the one shard
+    owning its prefix. Specs that share a prefix always end up inside the same shard.
+    """
+
+    def __init__(self, specs: list, shards: int | None = None, strategy: str = "operations",
+                 groups: dict | None = None):
+        """
+        Assign the specs to shards
+
+        Arguments:
+        specs -- The converted specs
+        shards -- The amount of shards, named shard-1 to shard-N (not used with groups)
+        strategy -- "operations" balances the amount of endpoints across the shards, "prefix" assigns a prefix by its
+                    hash, so adding a spec never moves other prefixes (not used with groups)
+        groups -- The filename patterns of the specs of every shard by shard name, the first matching group is used
+        """
+        self.prefixes: dict = {}
+
+        for spec in specs:
+            self.prefixes.setdefault(f"/{spec.prefix}", []).append(spec)
+
+        if groups is not None:
+            self.shards: dict = self.__assign_groups(groups)
+        elif strategy == "operations":
+            self.shards = self.__assign_operations(shards)
+        elif strategy == "prefix":
+            self.shards = self.__assign_hashes(shards)
+        else:
+            raise ValueError(f"Unknown shard strategy '{strategy}', use one of {', '.join(SHARD_STRATEGIES)}")
+
+    def specs(self, shard: str) -> list:
+        """
+        Get the specs of a shard, in the order they were converted.
+        """
+        return [spec for prefix in self.shards[shard] for spec in self.prefixes[prefix]]
+
+    def routing_map(self) -> dict:
+        """
+        Get the routing map, which lists the prefixes of every shard and the shard owning every prefix.
+        """
+        return {
+            "shards": {name: {"prefixes": prefixes,
+                              "specs": [spec.filename for spec in self.specs(name)],
+                              "endpoints": sum(len(spec.routes) for spec in self.specs(name))}
+                       for name, prefixes in self.shards.items()},
+            "prefixes": dict(sorted((prefix, name) for name, prefixes in self.shards.items() for prefix in prefixes))
+        }
+
+    def __assign_operations(self, shards: int) -> dict:
+        """
+        Assign the prefixes with the most endpoints first, every time to the shard with the least endpoints.
+        """
+        assigned = {f"shard-{index}": [] for index in range(1, shards + 1)}
+        loads = dict.fromkeys(assigned, 0)
+
+        by_size = sorted(self.prefixes, key=lambda prefix: (-self.__endpoints(prefix), prefix))
+
+        for prefix in by_size:
+            shard = min(loads, key=lambda name: (loads[name], int(name[len("shard-"):])))
+            assigned[shard].append(prefix)
+            loads[shard] += self.__endpoints(prefix)
+
+        return {name: sorted(prefixes) for name, prefixes in assigned.items()}
+
+    def __assign_hashes(self, shards: int) -> dict:
+        """
+        Assign every prefix by its hash, which does not depend on the other prefixes.
+        """
+        assigned = {f"shard-{index}": [] for index in range(1, shards + 1)}
+
+        for prefix in sorted(self.prefixes):
+            index = int(hashlib.sha256(prefix.encode("utf-8")).hexdigest(), 16) % shards
+            assigned[f"shard-{index + 1}"].append(prefix)
+
+        return assigned
+
+    def __assign_groups(self, groups: dict) -> dict:
+        """
+        Assign every prefix to the group matching the filenames of its specs.
+        """
+        assigned = {name: [] for name in groups}
+        unmatched = []
+
+        for prefix, specs in sorted(self.prefixes.items()):
+            matches = {self.__match_group(groups, spec) for spec in specs}
+
+            if None in matches:
+                unmatched.extend(spec.filename for spec in specs if self.__match_group(groups, spec) is None)
+            elif len(matches) > 1:
+                raise ValueError(f"The specs with prefix {prefix} are assigned to different shards "
+                                 f"({', '.join(sorted(matches))})")
+            else:
+                assigned[matches.pop()].append(prefix)
+
+        if unmatched:
+            raise ValueError(f"No shard group matches {', '.join(unmatched)}")
+
+        return assigned
+
+    @staticmethod
+    def __match_group(groups: dict, spec: OpenAPISpec) -> str | None:
+        """
+        Get the first group with a pattern matching the filename of a spec.
+        """
+        for name, patterns in groups.items():
+            if any(fnmatch.fnmatchcase(spec.filename, pattern) for pattern in patterns):
+                return name
+
+        return None
+
+    def __endpoints(self, prefix: str) -> int:
+        """
+        Get the amount of endpoints of the specs with a prefix.
+        """
+        return sum(len(spec.routes) for spec in self.prefixes[prefix])
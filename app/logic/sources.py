@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app.logic.loader import is_spec, load_document
+from app.logic.manifest import hash_file
+from app.utils.customlogger import CustomLogger
+from app.utils.errors import SpecFetchError
+
+# The filename of the fetch cache inside the input folder, hidden so it is not converted
+SOURCES_CACHE_FILENAME = ".sources.json"
+
+
+def load_sources(path: str) -> dict:
+    """
+    Load a sources manifest, which maps the filename of every spec to the URL it is fetched from.
+
+    A source is either a URL, or an object with a "url" and the "headers" sent with the request (e.g. for
+    authorization): {"Users.json": "https://users.internal/openapi.json", "Bets.yaml": {"url": "...", "headers": {}}}
+    """
+    with open(path, "r", encoding="utf-8") as sources_file:
+        data = load_document(sources_file, path)
+
+    if not isinstance(data, dict):
+        raise ValueError(f"{os.path.basename(path)}: expected the sources by filename")
+
+    sources = {}
+
+    for filename, source in data.items():
+        source = {"url": source} if isinstance(source, str) else source
+
+        if os.path.basename(filename) != filename or not is_spec(filename):
+            raise ValueError(f"{os.path.basename(path)}: invalid filename '{filename}'")
+
+        if not isinstance(source, dict) or not isinstance(source.get("url"), str) \
+                or not isinstance(source.get("headers", {}), dict):
+            raise ValueError(f"{os.path.basename(path)}: invalid source of '{filename}'")
+
+        sources[filename] = {"url": source["url"], "headers": source.get("headers", {})}
+
+    return sources
+
+
+# Disable pylint too-few-public-methods due to the fetcher only fetching the sources once.
+# pylint: disable=too-few-public-methods
+class SourceFetcher:
+    """
+    Fetch OpenAPI specifications from their URLs into the input folder
+
+    The specs are fetched concurrently by a bounded pool of threads. The ETag and Last-Modified headers of every
+    response are kept inside the input folder, so the next fetch sends a conditional request and unchanged specs are
+    answered with 304 Not Modified. Files are only replaced when their content changed, so an incremental build does
+    not convert unchanged specs again.
+    """
+
+    def __init__(self, input_folder_path: str, sources: dict, max_workers: int = 8, timeout: float = 30,
+                 logger: CustomLogger | None = None):
+        """
+        Initialize fetcher
+
+        Arguments:
+        input_folder_path -- The folder the specs are written to
+        sources -- The sources by filename (see `load_sources`)
+        max_workers -- The maximum amount of specs fetched at the same time
+        timeout -- The amount of seconds to wait for a response
+        logger -- The logger used, a new logger by default
+        """
+        self.input_folder_path: str = input_folder_path
+        self.sources: dict = sources
+        self.max_workers: int = max_workers
+        self.timeout: float = timeout
+        self.logger = logger if logger is not None else CustomLogger()
+
+        self.cache_path: str = os.path.join(input_folder_path, SOURCES_CACHE_FILENAME)
+
+    def fetch(self) -> list:
+        """
+        Fetch every spec, and return the filenames of the specs that were written or removed.
+
+        Every failing source is reported in a single SpecFetchError. Specs fetched before that are no longer part of
+        the sources are removed from the input folder.
+        """
+        os.makedirs(self.input_folder_path, exist_ok=True)
+        cache = self.__load_cache()
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            results = list(executor.map(lambda item: self.__fetch_source(*item, cache.get(item[0], {})),
+                                        self.sources.items()))
+
+        changed = [filename for filename, written, _, _ in results if written]
+        errors = [error for _, _, _, error in results if error is not None]
+        # Failed sources keep their previous entry, so the file they were fetched into is still known
+        new_cache = {filename: entry if error is None else cache.get(filename)
+                     for filename, _, entry, error in results}
+
+        for filename in sorted(set(cache) - set(self.sources)):
+            path = os.path.join(self.input_folder_path, filename)
+
+            if os.path.exists(path):
+                self.logger.info("Removing %s, which is no longer a source", filename)
+                os.remove(path)
+                changed.append(filename)
+
+        self.__save_cache({filename: entry for filename, entry in new_cache.items() if entry is not None})
+
+        if errors:
+            for error in errors:
+                self.logger.error("%s", error)
+
+            raise SpecFetchError(f"Could not fetch {len(errors)} of {len(self.sources)} specs:\n" + "\n".join(errors))
+
+        self.logger.info("Fetched %d specs, %d changed", len(self.sources), len(changed))
+
+        return changed
+
+    def __fetch_source(self, filename: str, source: dict, entry: dict) -> tuple:
+        """
+        Fetch a single spec, and return its filename, whether it was written, its cache entry and the error message if
+        it failed.
+        """
+        path = os.path.join(self.input_folder_path, filename)
+        headers = dict(source["headers"])
+
+        # Only send a conditional request if the file has not been changed or removed since it was fetched
+        if entry.get("url") == source["url"] and os.path.exists(path) and hash_file(path) == entry.get("hash"):
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        request = urllib.request.Request(source["url"], headers=headers)
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                content = response.read()
+                response_headers = response.headers
+        except urllib.error.HTTPError as error:
+            if error.code == 304:
+                self.logger.debug("%s has not been modified", filename)
+                return filename, False, entry, None
+
+            return filename, False, None, f"{filename}: {source['url']} returned {error.code} {error.reason}"
+        except OSError as error:
+            return filename, False, None, f"{filename}: {source['url']} could not be fetched ({error})"
+
+        entry = {"url": source["url"], "etag": response_headers.get("ETag"),
+                 "last_modified": response_headers.get("Last-Modified"), "hash": hashlib.sha256(content).hexdigest()}
+
+        if os.path.exists(path) and hash_file(path) == entry["hash"]:
+            self.logger.debug("%s has not changed", filename)
+            return filename, False, entry, None
+
+        self.logger.debug("Writing %s", filename)
+        temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary_path, "wb") as spec_file:
+            spec_file.write(content)
+        os.replace(temporary_path, path)
+
+        return filename, True, entry, None
+
+    def __load_cache(self) -> dict:
+        """
+        Load the ETag, Last-Modified and content hash of every spec fetched before.
+        """
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        return cache if isinstance(cache, dict) else {}
+
+    def __save_cache(self, cache: dict):
+        """
+        Save the ETag, Last-Modified and content hash of every fetched spec.
+        """
+        with open(self.cache_path, "w", encoding="utf-8") as cache_file:
+            json.dump(cache, cache_file, indent=4, sort_keys=True)
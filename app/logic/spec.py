@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import os
+import re
+from functools import cached_property
+
+from app.logic.loader import load_document
+from app.logic.refs import RefResolver
+from app.logic.streaming import OPENAPI_SCHEMA_SELECTION, OPENAPI_SELECTION
+
+
+class OpenAPISpec:
+    """
+    A parsed OpenAPI specification together with the names derived from it
+
+    Every spec is read from disk exactly once. All the phases of the converter read from this object instead of
+    reopening the file.
+    """
+
+    # Disable pylint too-many-instance-attributes due to the summary of a converted spec being kept on the spec.
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, filename: str, data: dict, versioning: bool = True, path: str = None):
+        """
+        Initialize spec
+
+        Arguments:
+        filename -- The filename of the OpenAPI specification (e.g. "F1.V1.json" or "F1.V1.yaml")
+        data -- The parsed OpenAPI specification
+        versioning -- Use the 'version' field inside the OpenAPI specification for the API name and prefix
+        path -- The path of the OpenAPI specification, used to resolve $ref pointers to other files
+        """
+        self.filename: str = filename
+        self.data: dict = data
+        self.versioning: bool = versioning
+        self.path: str | None = path
+
+        # The KrakenD endpoints of the spec rendered as JSON, only kept when converting to a flat configuration
+        self.endpoints: str | None = None
+
+        # The endpoint template of the spec, only kept when caching the results of converted specs
+        self.template: str | None = None
+
+        # The method and path (without prefix) of every converted endpoint, used to detect conflicting routes
+        self.routes: list = []
+
+        # The method, path, encoding and reason of every endpoint, when the encoding is selected per endpoint
+        self.encodings: list = []
+
+        # The paths of the other documents its $ref pointers refer to, which are inputs of its template as well
+        self.dependencies: list = []
+
+        # The problems found when validating the spec, reported together with the problems of the other specs
+        self.errors: list = []
+
+    @classmethod
+    def load(cls, path: str, versioning: bool = True, streaming: bool = False, schemas: bool = False) -> OpenAPISpec:
+        """
+        Read and parse an OpenAPI specification from disk, either in JSON or YAML.
+
+        When streaming, only the parts of the specification used by the converter are parsed and kept in memory, plus
+        the response schemas if `schemas` is set.
+        """
+        selection = OPENAPI_SCHEMA_SELECTION if schemas else OPENAPI_SELECTION
+
+        with open(path, "r", encoding="utf-8") as openapi_file:
+            data = load_document(openapi_file, path, selection if streaming else True)
+
+        return cls(os.path.basename(path), data, versioning, path)
+
+    def summary(self) -> OpenAPISpec:
+        """
+        Get a copy of the spec that only contains the fields needed to write the shared configuration files.
+        """
+        data = {key: self.data[key] for key in ("info", "servers") if key in self.data}
+
+        summary = OpenAPISpec(self.filename, data, self.versioning)
+        summary.endpoints = self.endpoints
+        summary.template = self.template
+        summary.routes = self.routes
+        summary.errors = self.errors
+        summary.encodings = self.encodings
+        summary.dependencies = self.dependencies
+
+        return summary
+
+    @cached_property
+    def resolver(self) -> RefResolver:
+        """
+        The $ref resolver of the spec, which memoizes every resolved reference
+        """
+        return RefResolver(self.data, self.path)
+
+    @property
+    def template_name(self) -> str:
+        """
+        The name of the template file without extension (e.g. "F1.V1")
+        """
+        return os.path.splitext(self.filename)[0].upper()
+
+    @property
+    def version(self) -> str:
+        """
+        The major version from the 'version' field inside the OpenAPI specification (e.g. "V1")
+        """
+        # YAML parses unquoted versions like `2.0` as a number
+        return "V" + str(self.data["info"]["version"])[0:1]
+
+    @property
+    def servers(self) -> list:
+        """
+        The server objects of the OpenAPI specification
+        """
+        return self.data.get("servers", [])
+
+    @property
+    def name(self) -> str:
+        """
+        The API name based on the versioning system used
+
+        The name is used both as the template define and as the key inside settings/service.json.
+        """
+        return self.__define_prefix[1]
+
+    @property
+    def prefix(self) -> str:
+        """
+        The endpoint prefix based on the versioning system used (without leading slash)
+        """
+        return self.__define_prefix[0]
+
+    @cached_property
+    def __define_prefix(self) -> tuple:
+        """
+        Get the API prefix and define based on the versioning system used.
+        """
+        name = self.template_name
+
+        if ".V" in name and not self.versioning:
+            return name.replace(".V", "/V").lower(), name.replace(".V", "V")
+
+        if ".V" in name and self.versioning:
+            api_name = re.sub(r"\.V\d", "", name)
+
+            return (api_name + "/" + self.version).lower(), api_name + self.version
+
+        if self.versioning:
+            return (name + "/" + self.version).lower(), name + self.version
+
+        return name.lower(), name
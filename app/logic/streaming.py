@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+import copy
+import json
+import re
+from typing import TextIO
+
+from app.utils.errors import InvalidOpenAPIError
+
+# The parts of an OpenAPI specification used by the converter. `True` keeps the whole value, a dict only keeps the
+# listed keys of an object ("*" matches any key), and keys that are not listed are skipped without being decoded.
+OPENAPI_SELECTION = {
+    "openapi": True,
+    "info": True,
+    "servers": True,
+    "security": True,
+    "x-krakend-cache-ttl": True,
+    "x-krakend-timeout": True,
+    "x-krakend-concurrent-calls": True,
+    "x-krakend-rate-limit": True,
+    "x-krakend-proxy-rate-limit": True,
+    "x-krakend-circuit-breaker": True,
+    "components": {
+        "securitySchemes": True,
+        "parameters": True,
+        "pathItems": True,
+        "requestBodies": {
+            "*": {
+                "$ref": True,
+                "content": {"*": {}}
+            }
+        },
+        "responses": {
+            "*": {
+                "$ref": True,
+                "headers": True,
+                "content": {"*": {}}
+            }
+        }
+    },
+    "paths": {
+        "*": {
+            "$ref": True,
+            "parameters": True,
+            "*": {
+                "parameters": True,
+                "security": True,
+                "requestBody": {
+                    "$ref": True,
+                    "content": {"*": {}}
+                },
+                "responses": {
+                    "*": {
+                        "$ref": True,
+                        "headers": True,
+                        "content": {"*": {}}
+                    }
+                },
+                "tags": True,
+                "x-krakend-cache-ttl": True,
+                "x-krakend-timeout": True,
+                "x-krakend-concurrent-calls": True,
+                "x-krakend-rate-limit": True,
+                "x-krakend-proxy-rate-limit": True,
+                "x-krakend-circuit-breaker": True
+            }
+        }
+    }
+}
+
+# The parts of an OpenAPI specification used when generating allow lists, which also need the response schemas
+OPENAPI_SCHEMA_SELECTION = copy.deepcopy(OPENAPI_SELECTION)
+OPENAPI_SCHEMA_SELECTION["components"]["schemas"] = True
+OPENAPI_SCHEMA_SELECTION["components"]["responses"]["*"]["content"] = {"*": {"schema": True}}
+OPENAPI_SCHEMA_SELECTION["paths"]["*"]["*"]["responses"]["*"]["content"] = {"*": {"schema": True}}
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_CONTENT = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.S)
+# Everything up to the next bracket, including complete strings that may contain brackets themselves
+_CONTAINER_CONTENT = re.compile(r'[^"{}\[\]]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"{}\[\]]*)*', re.S)
+_SCALAR = re.compile(r"[^\s,\]}]*")
+
+
+# Disable pylint too-few-public-methods due to the reader only reading a document once.
+# pylint: disable=too-few-public-methods
+class SelectiveJSONReader:
+    """
+    Read selected parts of a JSON document from a stream
+
+    The document is read in chunks. Values that are not selected are skipped by scanning for the end of the value,
+    without decoding them, and are discarded from the buffer. The memory used is therefore bounded by the chunk size and
+    the size of the selected values, instead of the size of the document.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int = 64 * 1024):
+        """
+        Initialize reader
+
+        Arguments:
+        stream -- The stream containing the JSON document
+        chunk_size -- The amount of characters read from the stream at once
+        """
+        self.stream: TextIO = stream
+        self.chunk_size: int = chunk_size
+
+        self.buffer: str = ""
+        self.position: int = 0
+        self.mark: int | None = None
+
+    def read(self, selection: dict | bool):
+        """
+        Read the document, only keeping the selected values.
+        """
+        value = self.__select(selection)
+
+        if self.__peek() != "":
+            raise self.__error("Extra data")
+
+        return value
+
+    def __select(self, selection: dict | bool):
+        """
+        Read the next value, only keeping the selected values.
+        """
+        if selection is True or self.__peek() != "{":
+            return self.__read_value()
+
+        result = {}
+        self.position += 1
+
+        if self.__peek() == "}":
+            self.position += 1
+            return result
+
+        while True:
+            if self.__peek() != '"':
+                raise self.__error("Expecting property name enclosed in double quotes")
+
+            key = self.__read_value()
+
+            if self.__peek() != ":":
+                raise self.__error("Expecting ':' delimiter")
+            self.position += 1
+            self.__peek()
+
+            sub_selection = selection.get(key, selection.get("*"))
+            if sub_selection is None:
+                self.__skip_value()
+            else:
+                result[key] = self.__select(sub_selection)
+
+            delimiter = self.__peek()
+            self.position += 1
+
+            if delimiter == "}":
+                return result
+            if delimiter != ",":
+                raise self.__error("Expecting ',' delimiter")
+
+    def __read_value(self):
+        """
+        Read and decode the next value.
+        """
+        self.__peek()
+        self.mark = self.position
+
+        try:
+            self.__skip_value()
+            text = self.buffer[self.mark:self.position]
+        finally:
+            self.mark = None
+
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as error:
+            raise self.__error(error.msg) from error
+
+    def __skip_value(self):
+        """
+        Move past the next value without decoding it.
+        """
+        character = self.__peek()
+
+        if character == '"':
+            self.__skip_string()
+        elif character in ("{", "["):
+            self.__skip_container()
+        elif character == "":
+            raise self.__error("Expecting value")
+        else:
+            self.__skip_scalar()
+
+    def __skip_string(self):
+        """
+        Move past the string at the current position.
+        """
+        self.position += 1
+
+        while True:
+            end = _STRING_CONTENT.match(self.buffer, self.position).end()
+
+            if end < len(self.buffer) and self.buffer[end] == '"':
+                self.position = end + 1
+                return
+
+            # The end of the buffer has been reached, continue after the last complete character
+            self.position = end
+            self.__fill()
+
+    def __skip_container(self):
+        """
+        Move past the object or array at the current position, keeping track of nesting and strings.
+        """
+        depth = 0
+
+        while True:
+            self.position = _CONTAINER_CONTENT.match(self.buffer, self.position).end()
+
+            if self.position == len(self.buffer):
+                self.__fill()
+                continue
+
+            character = self.buffer[self.position]
+
+            if character == '"':
+                # The string continues after the end of the buffer
+                self.__skip_string()
+                continue
+
+            self.position += 1
+
+            if character in ("{", "["):
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def __skip_scalar(self):
+        """
+        Move past the number, boolean or null at the current position.
+        """
+        while True:
+            end = _SCALAR.match(self.buffer, self.position).end()
+
+            if end < len(self.buffer) or not self.__fill(required=False):
+                self.position = end
+                return
+
+    def __peek(self) -> str:
+        """
+        Skip whitespace and get the next character, or an empty string at the end of the document.
+        """
+        while True:
+            self.position = _WHITESPACE.match(self.buffer, self.position).end()
+
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+
+            if not self.__fill(required=False):
+                return ""
+
+    def __fill(self, required: bool = True) -> bool:
+        """
+        Read the next chunk and discard the part of the buffer that is no longer needed.
+
+        Returns False if the end of the stream has been reached.
+        """
+        chunk = self.stream.read(self.chunk_size)
+
+        if not chunk:
+            if required:
+                raise self.__error("Unexpected end of document")
+            return False
+
+        discard = self.position if self.mark is None else min(self.position, self.mark)
+
+        self.buffer = self.buffer[discard:] + chunk
+        self.position -= discard
+        if self.mark is not None:
+            self.mark -= discard
+
+        return True
+
+    def __error(self, message: str) -> InvalidOpenAPIError:
+        """
+        Create the error raised for an invalid JSON document.
+        """
+        return InvalidOpenAPIError(f"invalid JSON ({message})")
+
+
+def load_selected(stream: TextIO, selection: dict | bool = None):
+    """
+    Load the selected parts of a JSON document from a stream (by default the parts of an OpenAPI specification used by
+    the converter).
+    """
+    return SelectiveJSONReader(stream).read(OPENAPI_SELECTION if selection is None else selection)
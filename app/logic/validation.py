@@ -0,0 +1,624 @@
+from __future__ import annotations
+
+import copy
+import re
+from functools import lru_cache
+from typing import Callable
+
+from app.logic.refs import get_pointer
+
+# The keys of a path item that contain an operation
+_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# The names of the JSON types, used in error messages
+_TYPE_NAMES = {dict: "object", list: "array", str: "string", bool: "boolean", int: "integer", float: "number",
+               type(None): "null"}
+
+_TYPE_CHECKS = {
+    "object": lambda value: isinstance(value, dict),
+    "array": lambda value: isinstance(value, list),
+    "string": lambda value: isinstance(value, str),
+    "boolean": lambda value: isinstance(value, bool),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float)) and not isinstance(value, bool)
+}
+
+_PATH_TEMPLATE = re.compile(r"{([^}]+)}")
+
+
+def _map(schema: dict) -> dict:
+    """
+    A map of names to values matching the schema.
+    """
+    return {"type": "object", "additionalProperties": schema}
+
+
+def _ref_or(name: str) -> dict:
+    """
+    A Reference Object or a value matching a definition.
+    """
+    return {"refOr": {"$ref": name}}
+
+
+def _extensible(properties: dict, required: tuple = (), **keywords) -> dict:
+    """
+    An object that only allows the given properties and specification extensions ("x-...").
+    """
+    return {"type": "object", "required": list(required), "properties": properties,
+            "patternProperties": {"^x-": {}}, "additionalProperties": False, **keywords}
+
+
+_STRING = {"type": "string"}
+_BOOLEAN = {"type": "boolean"}
+_ANY: dict = {}
+
+# The structure of an OpenAPI 3.0 document, in a subset of JSON Schema. Schema Objects are only checked to be objects.
+# "refOr" accepts either a Reference Object or a value matching the schema, "requiredIf" requires properties based on
+# the value of another property.
+_SCHEMA_3_0 = {
+    "OpenAPI": _extensible({
+        "openapi": {"type": "string", "pattern": r"^3\.0\.\d+(-.+)?$"},
+        "info": {"$ref": "Info"},
+        "externalDocs": {"$ref": "ExternalDocumentation"},
+        "servers": {"type": "array", "items": {"$ref": "Server"}},
+        "security": {"type": "array", "items": {"$ref": "SecurityRequirement"}},
+        "tags": {"type": "array", "items": {"$ref": "Tag"}},
+        "paths": {"$ref": "Paths"},
+        "components": {"$ref": "Components"}
+    }, ("openapi", "info", "paths")),
+    "Info": _extensible({
+        "title": _STRING,
+        "description": _STRING,
+        "termsOfService": _STRING,
+        "contact": {"$ref": "Contact"},
+        "license": {"$ref": "License"},
+        "version": _STRING
+    }, ("title", "version")),
+    "Contact": _extensible({"name": _STRING, "url": _STRING, "email": _STRING}),
+    "License": _extensible({"name": _STRING, "url": _STRING}, ("name",)),
+    "Server": _extensible({
+        "url": _STRING,
+        "description": _STRING,
+        "variables": _map({"$ref": "ServerVariable"})
+    }, ("url",)),
+    "ServerVariable": _extensible({
+        "enum": {"type": "array", "items": _STRING, "minItems": 1},
+        "default": _STRING,
+        "description": _STRING
+    }, ("default",)),
+    "Components": _extensible({
+        "schemas": _map(_ref_or("Schema")),
+        "responses": _map(_ref_or("Response")),
+        "parameters": _map(_ref_or("Parameter")),
+        "examples": _map(_ref_or("Example")),
+        "requestBodies": _map(_ref_or("RequestBody")),
+        "headers": _map(_ref_or("Header")),
+        "securitySchemes": _map(_ref_or("SecurityScheme")),
+        "links": _map(_ref_or("Link")),
+        "callbacks": _map(_ref_or("Callback"))
+    }),
+    "Paths": {"type": "object", "patternProperties": {"^/": {"$ref": "PathItem"}, "^x-": _ANY},
+              "additionalProperties": False},
+    "PathItem": _extensible({
+        "$ref": _STRING,
+        "summary": _STRING,
+        "description": _STRING,
+        **{method: {"$ref": "Operation"} for method in _METHODS},
+        "servers": {"type": "array", "items": {"$ref": "Server"}},
+        "parameters": {"type": "array", "items": _ref_or("Parameter")}
+    }),
+    "Operation": _extensible({
+        "tags": {"type": "array", "items": _STRING},
+        "summary": _STRING,
+        "description": _STRING,
+        "externalDocs": {"$ref": "ExternalDocumentation"},
+        "operationId": _STRING,
+        "parameters": {"type": "array", "items": _ref_or("Parameter")},
+        "requestBody": _ref_or("RequestBody"),
+        "responses": {"$ref": "Responses"},
+        "callbacks": _map(_ref_or("Callback")),
+        "deprecated": _BOOLEAN,
+        "security": {"type": "array", "items": {"$ref": "SecurityRequirement"}},
+        "servers": {"type": "array", "items": {"$ref": "Server"}}
+    }, ("responses",)),
+    "ExternalDocumentation": _extensible({"description": _STRING, "url": _STRING}, ("url",)),
+    "Parameter": _extensible({
+        "name": _STRING,
+        "in": {"type": "string", "enum": ["query", "header", "path", "cookie"]},
+        "description": _STRING,
+        "required": _BOOLEAN,
+        "deprecated": _BOOLEAN,
+        "allowEmptyValue": _BOOLEAN,
+        "style": _STRING,
+        "explode": _BOOLEAN,
+        "allowReserved": _BOOLEAN,
+        "schema": _ref_or("Schema"),
+        "example": _ANY,
+        "examples": _map(_ref_or("Example")),
+        "content": _map({"$ref": "MediaType"})
+    }, ("name", "in")),
+    "RequestBody": _extensible({
+        "description": _STRING,
+        "content": _map({"$ref": "MediaType"}),
+        "required": _BOOLEAN
+    }, ("content",)),
+    "MediaType": _extensible({
+        "schema": _ref_or("Schema"),
+        "example": _ANY,
+        "examples": _map(_ref_or("Example")),
+        "encoding": _map({"$ref": "Encoding"})
+    }),
+    "Encoding": _extensible({
+        "contentType": _STRING,
+        "headers": _map(_ref_or("Header")),
+        "style": _STRING,
+        "explode": _BOOLEAN,
+        "allowReserved": _BOOLEAN
+    }),
+    "Responses": {"type": "object", "minProperties": 1,
+                  "properties": {"default": _ref_or("Response")},
+                  "patternProperties": {r"^[1-5](\d{2}|XX)$": _ref_or("Response"), "^x-": _ANY},
+                  "additionalProperties": False},
+    "Response": _extensible({
+        "description": _STRING,
+        "headers": _map(_ref_or("Header")),
+        "content": _map({"$ref": "MediaType"}),
+        "links": _map(_ref_or("Link"))
+    }, ("description",)),
+    "Callback": {"type": "object", "patternProperties": {"^x-": _ANY}, "additionalProperties": {"$ref": "PathItem"}},
+    "Example": _extensible({"summary": _STRING, "description": _STRING, "value": _ANY, "externalValue": _STRING}),
+    "Link": _extensible({
+        "operationRef": _STRING,
+        "operationId": _STRING,
+        "parameters": {"type": "object"},
+        "requestBody": _ANY,
+        "description": _STRING,
+        "server": {"$ref": "Server"}
+    }),
+    "Header": _extensible({
+        "description": _STRING,
+        "required": _BOOLEAN,
+        "deprecated": _BOOLEAN,
+        "allowEmptyValue": _BOOLEAN,
+        "style": _STRING,
+        "explode": _BOOLEAN,
+        "allowReserved": _BOOLEAN,
+        "schema": _ref_or("Schema"),
+        "example": _ANY,
+        "examples": _map(_ref_or("Example")),
+        "content": _map({"$ref": "MediaType"})
+    }),
+    "Tag": _extensible({"name": _STRING, "description": _STRING, "externalDocs": {"$ref": "ExternalDocumentation"}},
+                       ("name",)),
+    "Reference": {"type": "object", "required": ["$ref"], "properties": {"$ref": _STRING}},
+    "Schema": {"type": "object"},
+    "SecurityScheme": _extensible({
+        "type": {"type": "string", "enum": ["apiKey", "http", "oauth2", "openIdConnect"]},
+        "description": _STRING,
+        "name": _STRING,
+        "in": {"type": "string", "enum": ["query", "header", "cookie"]},
+        "scheme": _STRING,
+        "bearerFormat": _STRING,
+        "flows": {"$ref": "OAuthFlows"},
+        "openIdConnectUrl": _STRING
+    }, ("type",), requiredIf={"type": {"apiKey": ["name", "in"], "http": ["scheme"], "oauth2": ["flows"],
+                                       "openIdConnect": ["openIdConnectUrl"]}}),
+    "OAuthFlows": _extensible({
+        "implicit": {"$ref": "ImplicitOAuthFlow"},
+        "password": {"$ref": "PasswordOAuthFlow"},
+        "clientCredentials": {"$ref": "ClientCredentialsFlow"},
+        "authorizationCode": {"$ref": "AuthorizationCodeOAuthFlow"}
+    }),
+    "ImplicitOAuthFlow": _extensible({"authorizationUrl": _STRING, "refreshUrl": _STRING,
+                                      "scopes": _map(_STRING)}, ("authorizationUrl", "scopes")),
+    "PasswordOAuthFlow": _extensible({"tokenUrl": _STRING, "refreshUrl": _STRING, "scopes": _map(_STRING)},
+                                     ("tokenUrl", "scopes")),
+    "ClientCredentialsFlow": _extensible({"tokenUrl": _STRING, "refreshUrl": _STRING, "scopes": _map(_STRING)},
+                                         ("tokenUrl", "scopes")),
+    "AuthorizationCodeOAuthFlow": _extensible({"authorizationUrl": _STRING, "tokenUrl": _STRING,
+                                               "refreshUrl": _STRING, "scopes": _map(_STRING)},
+                                              ("authorizationUrl", "tokenUrl", "scopes")),
+    "SecurityRequirement": _map({"type": "array", "items": _STRING})
+}
+
+
+def _schema_3_1() -> dict:
+    """
+    The structure of an OpenAPI 3.1 document, based on the structure of OpenAPI 3.0.
+    """
+    schema = copy.deepcopy(_SCHEMA_3_0)
+
+    document = schema["OpenAPI"]
+    document["required"] = ["openapi", "info"]
+    document["properties"]["openapi"]["pattern"] = r"^3\.1\.\d+(-.+)?$"
+    document["properties"]["jsonSchemaDialect"] = _STRING
+    document["properties"]["webhooks"] = _map(_ref_or("PathItem"))
+
+    schema["Info"]["properties"]["summary"] = _STRING
+    schema["License"]["properties"]["identifier"] = _STRING
+    schema["Components"]["properties"]["pathItems"] = _map(_ref_or("PathItem"))
+    schema["Operation"]["required"] = []
+    del schema["Responses"]["minProperties"]
+    schema["Reference"]["properties"].update({"summary": _STRING, "description": _STRING})
+    schema["Schema"] = {"type": ["object", "boolean"]}
+    schema["SecurityScheme"]["properties"]["type"]["enum"].append("mutualTLS")
+
+    return schema
+
+
+def _escape(key: str) -> str:
+    """
+    Escape a key for a JSON pointer.
+    """
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _type_name(value) -> str:
+    """
+    Get the JSON type name of a value.
+    """
+    return _TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+# Disable pylint too-few-public-methods due to the validator only validating documents.
+# pylint: disable=too-few-public-methods
+class OpenAPIValidator:
+    """
+    Validate OpenAPI documents against the structure of an OpenAPI version, collecting every error
+
+    The schema is compiled into nested check functions once, so validating a document only walks the document. Use
+    `get_validator` to reuse the compiled validator of a version within a process.
+    """
+
+    def __init__(self, schema: dict):
+        """
+        Initialize and compile validator
+
+        Arguments:
+        schema -- The definitions of the OpenAPI objects, starting at "OpenAPI"
+        """
+        self.definitions: dict = schema
+        self.__compiled: dict = {}
+        self.check: Callable = self.__compile_definition("OpenAPI")
+
+    def validate(self, document) -> list:
+        """
+        Validate a document, and return an error message for every problem found (e.g. "/info: missing 'title'").
+        """
+        errors = []
+        self.check(document, "", errors)
+
+        if isinstance(document, dict):
+            _check_semantics(document, errors)
+
+        return errors
+
+    def __compile_definition(self, name: str) -> Callable:
+        """
+        Compile a definition once, and refer to the same check function everywhere it is used.
+        """
+        if name not in self.__compiled:
+            checks = []
+
+            def check_definition(value, pointer, errors):
+                for check in checks:
+                    check(value, pointer, errors)
+
+            # Definitions can refer to themselves, so the check function is registered before it is compiled
+            self.__compiled[name] = check_definition
+            checks.extend(self.__compile_keywords(self.definitions[name]))
+
+        return self.__compiled[name]
+
+    def __compile(self, schema: dict) -> Callable:
+        """
+        Compile a schema into a single check function.
+        """
+        if "$ref" in schema:
+            return self.__compile_definition(schema["$ref"])
+
+        checks = self.__compile_keywords(schema)
+
+        if len(checks) == 1:
+            return checks[0]
+
+        def check(value, pointer, errors):
+            for keyword_check in checks:
+                keyword_check(value, pointer, errors)
+
+        return check
+
+    # Disable pylint too-many-locals and too-many-statements, as every keyword is compiled inside this method.
+    # pylint: disable=too-many-locals,too-many-statements
+    def __compile_keywords(self, schema: dict) -> list:
+        """
+        Compile every keyword of a schema into a check function.
+
+        Checks on the contents of a value are skipped when the value has the wrong type, which has already been
+        reported by the type check.
+        """
+        checks = []
+
+        if "refOr" in schema:
+            reference = self.__compile_definition("Reference")
+            target = self.__compile(schema["refOr"])
+
+            def check_ref_or(value, pointer, errors):
+                if isinstance(value, dict) and "$ref" in value:
+                    reference(value, pointer, errors)
+                else:
+                    target(value, pointer, errors)
+
+            checks.append(check_ref_or)
+
+        types = schema.get("type")
+        if types is not None:
+            types = [types] if isinstance(types, str) else types
+            type_checks = [_TYPE_CHECKS[name] for name in types]
+
+            def check_type(value, pointer, errors):
+                if not any(type_check(value) for type_check in type_checks):
+                    errors.append(f"{pointer or '/'}: expected {' or '.join(types)}, got {_type_name(value)}")
+
+            checks.append(check_type)
+
+        if "enum" in schema:
+            allowed = schema["enum"]
+
+            def check_enum(value, pointer, errors):
+                if isinstance(value, str) and value not in allowed:
+                    errors.append(f"{pointer}: '{value}' is not one of {', '.join(allowed)}")
+
+            checks.append(check_enum)
+
+        if "pattern" in schema:
+            pattern = re.compile(schema["pattern"])
+
+            def check_pattern(value, pointer, errors):
+                if isinstance(value, str) and not pattern.search(value):
+                    errors.append(f"{pointer}: '{value}' does not match {pattern.pattern}")
+
+            checks.append(check_pattern)
+
+        if "minItems" in schema:
+            min_items = schema["minItems"]
+
+            def check_min_items(value, pointer, errors):
+                if isinstance(value, list) and len(value) < min_items:
+                    errors.append(f"{pointer}: expected at least {min_items} items")
+
+            checks.append(check_min_items)
+
+        if "items" in schema:
+            item_check = self.__compile(schema["items"])
+
+            def check_items(value, pointer, errors):
+                if isinstance(value, list):
+                    for index, item in enumerate(value):
+                        item_check(item, f"{pointer}/{index}", errors)
+
+            checks.append(check_items)
+
+        if schema.get("required"):
+            required = schema["required"]
+
+            def check_required(value, pointer, errors):
+                if isinstance(value, dict):
+                    for name in required:
+                        if name not in value:
+                            errors.append(f"{pointer or '/'}: missing required field '{name}'")
+
+            checks.append(check_required)
+
+        if "requiredIf" in schema:
+            (field, requirements), = schema["requiredIf"].items()
+
+            def check_required_if(value, pointer, errors):
+                if isinstance(value, dict):
+                    for name in requirements.get(value.get(field), []):
+                        if name not in value:
+                            errors.append(f"{pointer}: missing required field '{name}' for {field} "
+                                          f"'{value[field]}'")
+
+            checks.append(check_required_if)
+
+        if "minProperties" in schema:
+            min_properties = schema["minProperties"]
+
+            def check_min_properties(value, pointer, errors):
+                if isinstance(value, dict) and len(value) < min_properties:
+                    errors.append(f"{pointer}: expected at least {min_properties} fields")
+
+            checks.append(check_min_properties)
+
+        if "properties" in schema or "patternProperties" in schema or "additionalProperties" in schema:
+            checks.append(self.__compile_properties(schema))
+
+        return checks
+
+    def __compile_properties(self, schema: dict) -> Callable:
+        """
+        Compile the `properties`, `patternProperties` and `additionalProperties` keywords into a check function.
+        """
+        properties = {name: self.__compile(sub_schema) for name, sub_schema in schema.get("properties", {}).items()}
+        patterns = [(re.compile(pattern), self.__compile(sub_schema))
+                    for pattern, sub_schema in schema.get("patternProperties", {}).items()]
+        additional = schema.get("additionalProperties", True)
+        additional_check = self.__compile(additional) if isinstance(additional, dict) else None
+
+        def check_properties(value, pointer, errors):
+            if not isinstance(value, dict):
+                return
+
+            for key, item in value.items():
+                item_pointer = f"{pointer}/{_escape(key)}"
+
+                if key in properties:
+                    properties[key](item, item_pointer, errors)
+                    continue
+
+                matched = False
+                for pattern, pattern_check in patterns:
+                    if pattern.search(str(key)):
+                        pattern_check(item, item_pointer, errors)
+                        matched = True
+
+                if matched:
+                    continue
+
+                if additional_check is not None:
+                    additional_check(item, item_pointer, errors)
+                elif additional is False:
+                    errors.append(f"{pointer or '/'}: unexpected field '{key}'")
+
+        return check_properties
+
+
+def _check_semantics(document: dict, errors: list):
+    """
+    Check the rules of the OpenAPI specification that can not be expressed in the structure of the document.
+
+    Every local $ref has to point to an existing value, every operationId has to be unique, and the path parameters
+    of every operation have to match the template of its path.
+    """
+    _check_refs(document, document, "", errors)
+
+    operation_ids = {}
+
+    paths = document.get("paths")
+
+    for path, path_item in (paths.items() if isinstance(paths, dict) else []):
+        if not path.startswith("/") or not isinstance(path_item, dict):
+            continue
+
+        path_pointer = f"/paths/{_escape(path)}"
+        path_parameters = _list(path_item.get("parameters"))
+
+        for method in _METHODS:
+            operation = path_item.get(method)
+            if not isinstance(operation, dict):
+                continue
+
+            pointer = f"{path_pointer}/{method}"
+
+            operation_id = operation.get("operationId")
+            if operation_id is not None:
+                if operation_id in operation_ids:
+                    errors.append(f"{pointer}: operationId '{operation_id}' is also used by "
+                                  f"{operation_ids[operation_id]}")
+                else:
+                    operation_ids[operation_id] = pointer
+
+            _check_path_parameters(document, path, path_parameters + _list(operation.get("parameters")), pointer,
+                                   errors)
+
+
+def _list(value) -> list:
+    """
+    Get a value if it is a list, otherwise an empty list, as the structure has already been checked.
+    """
+    return value if isinstance(value, list) else []
+
+
+def _check_path_parameters(document: dict, path: str, parameters: list, pointer: str, errors: list):
+    """
+    Check that every parameter inside the path template is defined as a required path parameter, and the other way
+    around.
+    """
+    template = set(_PATH_TEMPLATE.findall(path))
+    defined = set()
+    external = False
+
+    for parameter in parameters:
+        parameter = _resolve_local(document, parameter)
+
+        if isinstance(parameter, dict) and "$ref" in parameter:
+            # A parameter inside another file may define any of the path parameters
+            external = True
+            continue
+
+        if not isinstance(parameter, dict) or parameter.get("in") != "path":
+            continue
+
+        defined.add(parameter.get("name"))
+
+        if parameter.get("name") not in template:
+            errors.append(f"{pointer}: path parameter '{parameter.get('name')}' is not part of the path")
+        elif parameter.get("required") is not True:
+            errors.append(f"{pointer}: path parameter '{parameter.get('name')}' must be required")
+
+    if not external:
+        for name in sorted(template - defined):
+            errors.append(f"{pointer}: path parameter '{name}' is not defined")
+
+
+def _resolve_local(document: dict, value):
+    """
+    Follow a local $ref pointer, returning None if it can not be resolved.
+    """
+    seen = set()
+
+    while isinstance(value, dict) and isinstance(value.get("$ref"), str) and value["$ref"].startswith("#"):
+        if value["$ref"] in seen:
+            return None
+
+        seen.add(value["$ref"])
+        value = _get_pointer(document, value["$ref"][1:])
+
+    return value
+
+
+def _get_pointer(document: dict, pointer: str):
+    """
+    Get the value a JSON pointer points to, or None if it does not exist.
+    """
+    try:
+        return get_pointer(document, pointer)
+    except KeyError:
+        return None
+
+
+def _check_refs(document: dict, value, pointer: str, errors: list):
+    """
+    Check that every local $ref inside a value points to an existing value.
+    """
+    if isinstance(value, dict):
+        reference = value.get("$ref")
+
+        if isinstance(reference, str) and reference.startswith("#") and \
+                _get_pointer(document, reference[1:]) is None and reference != "#":
+            errors.append(f"{pointer}: $ref '{reference}' can not be resolved")
+
+        for key, item in value.items():
+            if isinstance(item, (dict, list)):
+                _check_refs(document, item, f"{pointer}/{_escape(key)}", errors)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            if isinstance(item, (dict, list)):
+                _check_refs(document, item, f"{pointer}/{index}", errors)
+
+
+@lru_cache(maxsize=None)
+def get_validator(version: str) -> OpenAPIValidator:
+    """
+    Get the compiled validator of an OpenAPI version ("3.0" or "3.1"), which is only compiled once per process.
+    """
+    if version == "3.0":
+        return OpenAPIValidator(_SCHEMA_3_0)
+
+    if version == "3.1":
+        return OpenAPIValidator(_schema_3_1())
+
+    raise ValueError(f"Unsupported OpenAPI version '{version}'")
+
+
+def validate_openapi(document) -> list:
+    """
+    Validate an OpenAPI 3.0 or 3.1 document, and return an error message for every problem found.
+    """
+    version = document.get("openapi") if isinstance(document, dict) else None
+
+    if not isinstance(version, str) or not re.match(r"^3\.[01]\.", version):
+        return [f"/openapi: unsupported OpenAPI version '{version}', expected 3.0.x or 3.1.x"]
+
+    return get_validator(version[:3]).validate(document)
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.loader import is_spec
+from app.utils.errors import InvalidOpenAPIError, OpenAPIFileNotFoundError
+
+
+class PollingWatcher:
+    """
+    Detect changed files by comparing the modification time and size of every file inside the folders
+    """
+
+    def __init__(self, folders: list, interval: float = 0.5):
+        """
+        Initialize watcher
+
+        Arguments:
+        folders -- The folders to watch (not recursive)
+        interval -- The amount of seconds between every scan of the folders
+        """
+        self.folders: list = [os.path.normpath(folder) for folder in folders]
+        self.interval: float = interval
+        self.__snapshot: dict = self.__scan()
+
+    def poll(self, timeout: float) -> set:
+        """
+        Wait for changes for at most `timeout` seconds and return the paths that were created, changed or removed.
+        """
+        deadline = time.monotonic() + timeout
+
+        while True:
+            snapshot = self.__scan()
+            changed = {path for path in snapshot.keys() | self.__snapshot.keys()
+                       if snapshot.get(path) != self.__snapshot.get(path)}
+            self.__snapshot = snapshot
+
+            remaining = deadline - time.monotonic()
+            if changed or remaining <= 0:
+                return changed
+
+            time.sleep(min(self.interval, remaining))
+
+    def close(self):
+        """
+        Stop watching.
+        """
+
+    def __scan(self) -> dict:
+        """
+        Get the modification time and size of every file inside the folders.
+        """
+        snapshot = {}
+
+        for folder in self.folders:
+            if not os.path.isdir(folder):
+                continue
+
+            for entry in os.scandir(folder):
+                if entry.is_file():
+                    stat = entry.stat()
+                    snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+
+class InotifyWatcher:
+    """
+    Detect changed files using inotify (Linux only)
+    """
+
+    # https://man7.org/linux/man-pages/man7/inotify.7.html
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_ISDIR = 0x40000000
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT = struct.Struct("iIII")
+
+    def __init__(self, folders: list):
+        """
+        Initialize watcher
+
+        Raises OSError if inotify is not available.
+
+        Arguments:
+        folders -- The folders to watch (not recursive). Folders that do not exist yet are watched once created.
+        """
+        self.folders: list = [os.path.normpath(folder) for folder in folders]
+        self.__watches: dict = {}
+
+        self.__libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(self.__libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self.__fd = self.__libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.__fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        for folder in self.folders:
+            self.__add_watch(folder)
+
+    def poll(self, timeout: float) -> set:
+        """
+        Wait for changes for at most `timeout` seconds and return the paths that were created, changed or removed.
+        """
+        ready, _, _ = select.select([self.__fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        changed = set()
+        buffer = os.read(self.__fd, 64 * 1024)
+        offset = 0
+
+        while offset < len(buffer):
+            watch, mask, _, length = self.EVENT.unpack_from(buffer, offset)
+            offset += self.EVENT.size
+            name = os.fsdecode(buffer[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            if watch not in self.__watches or not name:
+                continue
+
+            path = os.path.join(self.__watches[watch], name)
+
+            if mask & self.IN_ISDIR:
+                # Start watching folders (e.g. `config`) that are created while watching
+                if path in self.folders:
+                    self.__add_watch(path)
+                continue
+
+            changed.add(path)
+
+        return changed
+
+    def close(self):
+        """
+        Stop watching.
+        """
+        os.close(self.__fd)
+
+    def __add_watch(self, folder: str):
+        """
+        Watch a folder if it exists.
+        """
+        if not os.path.isdir(folder):
+            return
+
+        watch = self.__libc.inotify_add_watch(self.__fd, os.fsencode(folder), self.MASK)
+        if watch < 0:
+            raise OSError(ctypes.get_errno(), f"Unable to watch {folder}")
+
+        self.__watches[watch] = folder
+
+
+def create_watcher(folders: list) -> InotifyWatcher | PollingWatcher:
+    """
+    Create an inotify watcher, or fall back to polling if inotify is not available.
+    """
+    try:
+        return InotifyWatcher(folders)
+    except (OSError, TypeError):
+        return PollingWatcher(folders)
+
+
+class ConverterWatcher:
+    """
+    Keep converting the OpenAPI files while they change
+
+    The converter is kept in memory between conversions, so only the OpenAPI files that changed are parsed and only
+    their templates and the affected shared configuration files are written. Flat and sharded builds are always built
+    completely, so they parse every OpenAPI file again on every change.
+    """
+
+    def __init__(self, converter: OpenAPIToKrakenD, debounce: float = 0.2, profile_path: str = None):
+        """
+        Initialize watcher
+
+        Arguments:
+        converter -- The incremental converter used to convert the OpenAPI files
+        debounce -- The amount of seconds without changes before converting, to group bursts of saves together
+        profile_path -- Write the profiler report of every conversion to this path (requires a profiling converter)
+        """
+        self.converter: OpenAPIToKrakenD = converter
+        self.converter.options.incremental = True
+
+        self.debounce: float = debounce
+        self.profile_path: str | None = profile_path
+        self.input_folder_path: str = os.path.normpath(converter.input_folder_path)
+        self.config_folder_path: str = os.path.join(self.input_folder_path, "config")
+        self.stop_event: threading.Event = threading.Event()
+
+    def run(self):
+        """
+        Convert the OpenAPI files and convert them again every time they change, until stopped.
+        """
+        folders = self.get_folders()
+        watcher = create_watcher(folders)
+        self.converter.logger.info("Watching %s using %s", self.input_folder_path, type(watcher).__name__)
+
+        try:
+            self.rebuild(set())
+
+            while not self.stop_event.is_set():
+                # Start watching the folders of files that are referenced since the last conversion
+                if self.get_folders() != folders:
+                    watcher.close()
+                    folders = self.get_folders()
+                    watcher = create_watcher(folders)
+
+                changed = watcher.poll(0.5)
+                if not changed:
+                    continue
+
+                # Wait until the changes stop to group bursts of saves together
+                while more := watcher.poll(self.debounce):
+                    changed |= more
+
+                self.rebuild(changed)
+        finally:
+            watcher.close()
+
+    def get_folders(self) -> list:
+        """
+        Get the folders to watch: the input folder, its config folder and the folders of the files referenced by the
+        $ref pointers of the OpenAPI files.
+        """
+        folders = [self.input_folder_path, self.config_folder_path]
+
+        for path in self.get_dependencies():
+            if os.path.dirname(path) not in folders:
+                folders.append(os.path.dirname(path))
+
+        return folders
+
+    def get_dependencies(self) -> set:
+        """
+        Get the paths of the files referenced by the $ref pointers of the converted OpenAPI files.
+        """
+        return {os.path.normpath(path) for spec in self.converter.specs for path in spec.dependencies}
+
+    def stop(self):
+        """
+        Stop watching after the current conversion.
+        """
+        self.stop_event.set()
+
+    def rebuild(self, changed: set) -> bool:
+        """
+        Convert the OpenAPI files again after the given paths changed.
+
+        Errors are logged instead of raised so the watcher keeps running. Returns True if the conversion succeeded.
+        """
+        folders = {os.path.dirname(os.path.normpath(path)) for path in changed}
+        config_changed = self.config_folder_path in folders
+        dependencies = self.get_dependencies()
+        specs_changed = any(os.path.dirname(os.path.normpath(path)) == self.input_folder_path and is_spec(path)
+                            or os.path.abspath(path) in dependencies for path in changed)
+
+        if changed and not config_changed and not specs_changed:
+            return True
+
+        self.converter.reload(reload_config=config_changed)
+
+        start = time.perf_counter()
+        try:
+            self.converter.convert()
+        except (InvalidOpenAPIError, OpenAPIFileNotFoundError) as error:
+            self.converter.logger.error(error)
+            return False
+
+        self.converter.logger.info("Converted in %.3fs", time.perf_counter() - start)
+
+        if self.profile_path:
+            self.converter.write_profile(self.profile_path)
+
+        return True
@@ -0,0 +1,363 @@
+from __future__ import annotations
+
+import json
+import os
+
+from app.logic.config import ConverterConfig
+from app.logic.emitter import ListEmitter, PrefixedSink
+from app.logic.manifest import BuildManifest
+from app.logic.options import ConverterOptions, verify_env_name
+from app.logic.profiler import Profiler
+from app.logic.sharding import ROUTING_FILENAME, ShardPlan
+from app.logic.spec import OpenAPISpec
+from app.utils.customlogger import CustomLogger
+
+# The placeholder for the endpoints inside krakend.json
+ENDPOINTS_PLACEHOLDER = '[{{template "Endpoints".service}}]'
+
+
+class ConfigWriter:
+    """
+    Write the configuration files shared by the converted specs: the endpoints template, the service.json of every
+    environment, krakend.json and the Dockerfile, or a flat krakend.json, optionally split across shards
+
+    The endpoint templates and flat endpoints of the specs themselves are written by the converter.
+    """
+
+    def __init__(self, config: ConverterConfig, options: ConverterOptions, logger: CustomLogger, profiler: Profiler):
+        """
+        Initialize writer
+
+        Arguments:
+        config -- The KrakenD configuration fragments
+        options -- The options of the conversion
+        logger -- The logger of the conversion
+        profiler -- The profiler the phases of the conversion are recorded in
+        """
+        self.config: ConverterConfig = config
+        self.options: ConverterOptions = options
+        self.logger: CustomLogger = logger
+        self.profiler: Profiler = profiler
+
+    def create_folders(self, sink):
+        """
+        Create the configuration folders
+        """
+        paths = ["config"] if self.options.flat else ["config", "config/settings", "config/templates"]
+
+        for folder in paths:
+            sink.create_folder(folder)
+
+    def write(self, specs: list, sink, manifest: BuildManifest, previous_manifest: BuildManifest | None):
+        """
+        Write the configuration files of the specs that changed since the previous build.
+        """
+        if self.options.sharded:
+            self.__write_shards(specs, sink)
+            return
+
+        if self.options.flat:
+            self.logger.info("Writing flat krakend.json")
+            with self.profiler.phase("krakend"):
+                self.__write_flat_krakend_json(specs, sink)
+            self.logger.info("Finished writing flat krakend.json")
+        else:
+            self.__write_templates(specs, sink, manifest, previous_manifest)
+
+        if manifest.is_config_changed(previous_manifest, "Dockerfile") or not sink.exists("Dockerfile"):
+            self.logger.info("Writing Dockerfile")
+            with self.profiler.phase("dockerfile"):
+                self.__write_dockerfile(sink)
+            self.logger.info("Finished writing Dockerfile")
+
+    def __write_templates(self, specs: list, sink, manifest: BuildManifest, previous_manifest: BuildManifest | None):
+        """
+        Write the configuration files rendered by KrakenD that changed since the previous build.
+        """
+        if manifest.is_specs_changed(previous_manifest) or not sink.exists("config/templates/Endpoints.tmpl"):
+            self.logger.info("Writing templates/Endpoints.tmpl")
+            with self.profiler.phase("endpoints_template"):
+                self.__write_endpoints_template(specs, sink)
+            self.logger.info("Finished writing templates/Endpoints.tmpl")
+
+        service_paths = self.__get_service_paths(specs)
+
+        # Every environment shares the templates, only the hosts inside service.json differ
+        for env, path in service_paths.items():
+            if manifest.is_specs_changed(previous_manifest) or not sink.exists(path):
+                self.logger.info("Writing %s", path[len("config/"):])
+                with self.profiler.phase("service"):
+                    self.__write_service(specs, sink, env, path)
+                self.logger.info("Finished writing %s", path[len("config/"):])
+
+        self.__remove_stale_settings(sink, service_paths)
+
+        if manifest.is_config_changed(previous_manifest, "krakend.json") or not sink.exists("config/krakend.json"):
+            self.logger.info("Writing krakend.json")
+            with self.profiler.phase("krakend"):
+                self.__write_krakend_json(sink)
+            self.logger.info("Finished writing krakend.json")
+
+    def __write_shards(self, specs: list, sink):
+        """
+        Write the configuration of every shard to a folder of its own, and the routing map of the shards.
+        """
+        plan = ShardPlan(specs, self.options.shards, self.options.shard_by, self.options.shard_groups)
+
+        for name in plan.shards:
+            self.logger.info("Writing %s", name)
+            self.__write_shard(plan.specs(name), PrefixedSink(sink, name))
+            self.logger.info("Finished writing %s: %d specs", name, len(plan.specs(name)))
+
+        self.logger.info("Writing %s", ROUTING_FILENAME)
+        with self.profiler.phase("routing"), sink.open(ROUTING_FILENAME) as routing_file:
+            json.dump(plan.routing_map(), routing_file, indent=4)
+
+        # Shards of a previous conversion that are not part of this plan, e.g. after lowering the amount of shards
+        for folder in sink.list_folders(""):
+            if folder not in plan.shards and sink.exists(f"{folder}/config/krakend.json"):
+                self.logger.info("Removing %s", folder)
+                sink.remove(folder)
+
+    def __write_shard(self, specs: list, sink):
+        """
+        Write every configuration file of the specs of a shard, like a conversion of only those specs.
+        """
+        self.create_folders(sink)
+
+        for spec in specs:
+            if spec.template is not None:
+                with sink.open(get_template_path(spec.filename)) as template_file:
+                    template_file.write(spec.template)
+
+        if self.options.flat:
+            with self.profiler.phase("krakend"):
+                self.__write_flat_krakend_json(specs, sink)
+        else:
+            with self.profiler.phase("endpoints_template"):
+                self.__write_endpoints_template(specs, sink)
+
+            service_paths = self.__get_service_paths(specs)
+
+            for env, path in service_paths.items():
+                with self.profiler.phase("service"):
+                    self.__write_service(specs, sink, env, path)
+
+            self.__remove_stale_settings(sink, service_paths)
+
+            with self.profiler.phase("krakend"):
+                self.__write_krakend_json(sink)
+
+        with self.profiler.phase("dockerfile"):
+            self.__write_dockerfile(sink)
+
+    def __write_dockerfile(self, sink):
+        """
+        Copy the dockerfile to the output folder.
+        """
+        if self.config.is_custom("Dockerfile"):
+            self.logger.debug("Using custom Dockerfile")
+        else:
+            self.logger.debug("Using default Dockerfile")
+
+        if self.config.dockerfile_path is None:
+            with sink.open("Dockerfile") as dockerfile:
+                dockerfile.write(self.config.dockerfile)
+        else:
+            sink.copy(self.config.dockerfile_path, "Dockerfile")
+
+    def __write_endpoints_template(self, specs: list, sink):
+        """
+        Write the endpoints file which links the API definitions and services together.
+        """
+        service = "{{$service := .}}\n\n"
+        define = "{{define \"Endpoints\"}}\n\n"
+        end = "\n\n{{end}}"
+
+        with sink.open("config/templates/Endpoints.tmpl") as endpoints_file:
+            self.logger.info("Writing file")
+
+            self.logger.debug("Writing template")
+            endpoints_file.write(define + service)
+
+            templates = ListEmitter(endpoints_file)
+
+            for spec in specs:
+                name = spec.name
+
+                self.logger.debug("Writing service %s", spec.template_name)
+                # https://docs.python.org/3/library/string.html#format-string-syntax
+                templates.write(f'{{{{template "{name}" $service.{name}}}}}')
+
+            self.logger.debug("Writing end template")
+            endpoints_file.write("\n" + end)
+
+    def __write_service(self, specs: list, sink, env: str | None, path: str):
+        """
+        Write the service.json file which contains all the urls to the services.
+        """
+        service_array = {}
+
+        for spec in specs:
+            service = get_target_backend(spec, env, self.logger)
+
+            service_array.update(service)
+
+        with sink.open(path) as file:
+            json.dump(service_array, file, indent=4)
+
+    def __get_service_paths(self, specs: list) -> dict:
+        """
+        Get the path of the service.json file of every environment written.
+        """
+        if not self.options.multiple_envs:
+            return {self.options.env: "config/settings/service.json"}
+
+        envs = self.options.envs if self.options.envs is not None else self.__get_all_envs(specs)
+
+        return {env: f"config/settings/{env}/service.json" for env in envs}
+
+    def __get_all_envs(self, specs: list) -> list:
+        """
+        Get the descriptions of the servers of every spec, in order of appearance.
+
+        Descriptions that can not be used as the name of a settings folder (e.g. "Production (EU/US)") are skipped.
+        """
+        envs = {}
+
+        for spec in specs:
+            for server in spec.servers:
+                if isinstance(server.get("description"), str):
+                    envs[server["description"]] = None
+
+        for env in list(envs):
+            try:
+                verify_env_name(env)
+            except ValueError as error:
+                self.logger.warning("Skipping the servers described as '%s': %s", env, error)
+                del envs[env]
+
+        return list(envs)
+
+    @staticmethod
+    def __remove_stale_settings(sink, service_paths: dict):
+        """
+        Remove the settings of the environments that are not written anymore, e.g. the settings/<env> folders of a
+        previous conversion of multiple environments, or the settings/service.json of a single environment.
+        """
+        if "config/settings/service.json" not in service_paths.values():
+            sink.remove("config/settings/service.json")
+
+        for folder in sink.list_folders("config/settings"):
+            path = f"config/settings/{folder}/service.json"
+
+            if path not in service_paths.values() and sink.exists(path):
+                sink.remove(f"config/settings/{folder}")
+
+    def __write_krakend_json(self, sink):
+        """
+        Write the KrakenD configuration file.
+        """
+        self.logger.info("Generating config")
+        krakend_config = {
+            "endpoints": ENDPOINTS_PLACEHOLDER
+        }
+
+        self.logger.debug("Adding configuration")
+        if self.config.is_custom("krakend.json"):
+            self.logger.debug("Using custom krakend configuration")
+        else:
+            self.logger.debug("Using default krakend configuration")
+
+        self.config.merge(krakend_config, self.config.krakend)
+        self.logger.debug("Added configuration")
+
+        self.logger.debug("Loading config")
+        config_data = json.dumps(krakend_config, indent=4)
+
+        self.logger.debug("Reformatting endpoints value")
+
+        json_string = config_data.replace("\"[{{template \\\"Endpoints\\\".service}}]\"",
+                                          "[{{template \"Endpoints\".service}}]")
+
+        self.logger.debug("Reformatted endpoints value")
+
+        self.logger.info("Config generated")
+
+        with sink.open("config/krakend.json") as config_file:
+            self.logger.info("Writing file")
+            config_file.write(json_string)
+            self.logger.info("Finished writing file")
+
+    def __write_flat_krakend_json(self, specs: list, sink):
+        """
+        Write a KrakenD configuration file containing the endpoints of every spec, which KrakenD can load without
+        rendering any templates.
+        """
+        krakend_config = self.config.merge({"endpoints": ENDPOINTS_PLACEHOLDER}, self.config.krakend)
+
+        if self.options.compact:
+            config_data = json.dumps(krakend_config, separators=(",", ":"))
+            start, separator, end = "[", ",", "]"
+        else:
+            config_data = json.dumps(krakend_config, indent=4)
+            start, separator, end = "[\n", ",\n", "\n    ]"
+
+        before, placeholder, after = config_data.partition(json.dumps(ENDPOINTS_PLACEHOLDER))
+        fragments = [spec.endpoints for spec in specs if spec.endpoints]
+
+        with sink.open("config/krakend.json") as config_file:
+            config_file.write(before)
+
+            # The endpoints are only left out when krakend.json defines its own endpoints
+            if placeholder:
+                if fragments:
+                    config_file.write(start)
+                    endpoints = ListEmitter(config_file, separator)
+                    for fragment in fragments:
+                        endpoints.write(fragment)
+                    config_file.write(end)
+                else:
+                    config_file.write("[]")
+
+            config_file.write(after)
+
+
+def get_template_path(filename: str) -> str:
+    """
+    Get the path of the endpoint template of an OpenAPI file, relative to the output folder.
+    """
+    return f"config/templates/{OpenAPISpec(os.path.basename(filename), {}).template_name}.tmpl"
+
+
+def get_target_backend(spec: OpenAPISpec, env: str | None, logger: CustomLogger) -> dict:
+    """
+    Get the target backend for the API based on the environment chosen
+    """
+    service = None
+    service_name = spec.name
+    filename = spec.filename
+    servers = spec.servers
+
+    # If an environment is specified, attempt to search for server
+    if env:
+        logger.debug("[%s] Custom environment provided", filename)
+        for server in servers:
+            if "description" not in server:
+                logger.debug("[%s] Description not found, trying next", filename)
+                continue
+
+            if server["description"] == env:
+                logger.debug("[%s] Description found", filename)
+                service = {service_name: server["url"]}
+                break
+
+    # If no environment is specified or if no server is found, use first entry in server list
+    if service is None:
+        if env:
+            logger.error("[%s] Server environment `%s` unknown. Using %s", filename, env, servers[0]["url"])
+
+        logger.debug("Custom environment not provided, using first entry in server list")
+        service = {service_name: servers[0]["url"]}
+
+    return service
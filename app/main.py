@@ -1,40 +1,248 @@
+import cProfile
 import logging
-from typing import Optional
+from typing import Callable, Optional
 
 import typer
+from typer.core import TyperGroup
 
 from app.logic.converter import OpenAPIToKrakenD
-from app.utils.customlogger import CustomLogger
-from app.utils.errors import OpenAPIFileNotFoundError, InvalidOpenAPIError
+from app.logic.options import ConverterOptions
+from app.logic.qos import load_qos_policy
+from app.logic.server import ConversionServer
+from app.logic.sharding import SHARD_STRATEGIES, load_shard_groups
+from app.logic.sources import SourceFetcher, load_sources
+from app.logic.watcher import ConverterWatcher
+from app.utils.customlogger import LOG_FORMATS, CustomLogger, configure_logging
+from app.utils.errors import OpenAPIFileNotFoundError, InvalidOpenAPIError, SpecFetchError
 
-app = typer.Typer(pretty_exceptions_short=True, pretty_exceptions_show_locals=False, add_completion=False)
 
+class DefaultCommandGroup(TyperGroup):
+    """
+    Run the convert command when no command is given, so "python -m app.main INPUT OUTPUT" keeps working
+    """
+
+    def parse_args(self, ctx, args):
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args = ["convert", *args]
+
+        return super().parse_args(ctx, args)
+
+
+app = typer.Typer(cls=DefaultCommandGroup, pretty_exceptions_short=True, pretty_exceptions_show_locals=False,
+                  add_completion=False)
 
-@app.command()
+
+# Disable pylint too-many-arguments and too-many-locals due to typer requiring a parameter for every option.
+# pylint: disable=too-many-arguments,too-many-positional-arguments,too-many-locals
+@app.command("convert")
 def main(input_folder: str = typer.Argument(..., help="Input folder that contains all the OpenAPI specifications",
                                             show_default=False),
          output_folder: str = typer.Argument(..., help="Output folder", show_default=False),
          debug: Optional[bool] = typer.Option(False, "--debug", help="Enable debug mode"),
-         environment: Optional[str] = typer.Option(None, "--env", help="Choose the environment (prod, dev, etc..)",
+         environment: Optional[str] = typer.Option(None, "--env", help="Choose the environment (prod, dev, etc..), "
+                                                                        "or multiple comma separated environments",
                                                    show_default=False),
+         all_envs: Optional[bool] = typer.Option(False, "--all-envs",
+                                                 help="Write the settings of every environment described by the "
+                                                      "servers of the OpenAPI specifications"),
          disable_automatic_versioning: Optional[bool] = typer.Option(False,
                                                                      "--disable-automatic-versioning",
                                                                      help="Disable versioning based on 'version' "
                                                                           "field in OpenAPI specification and use "
-                                                                          "filename based-versioning instead.")):
+                                                                          "filename based-versioning instead."),
+         jobs: Optional[int] = typer.Option(1, "--jobs", "-j",
+                                            help="The amount of processes used to convert the OpenAPI "
+                                                 "specifications (0 uses all CPU cores)"),
+         incremental: Optional[bool] = typer.Option(False, "--incremental",
+                                                    help="Only regenerate the files whose inputs changed since the "
+                                                         "previous build"),
+         watch: Optional[bool] = typer.Option(False, "--watch",
+                                              help="Keep running and convert the OpenAPI specifications again "
+                                                   "when they change"),
+         streaming: Optional[bool] = typer.Option(False, "--streaming",
+                                                  help="Only parse the parts of the OpenAPI specifications used by "
+                                                       "the converter, to reduce memory usage on large "
+                                                       "specifications"),
+         profile: Optional[str] = typer.Option(None, "--profile",
+                                               help="Write the wall time, CPU time and peak memory of every phase "
+                                                    "and specification to this JSON file",
+                                               show_default=False),
+         cprofile: Optional[str] = typer.Option(None, "--cprofile",
+                                                help="Write cProfile statistics of the conversion to this file",
+                                                show_default=False),
+         log_format: Optional[str] = typer.Option("text", "--log-format",
+                                                  help="The format of the log lines (text or json)"),
+         flat: Optional[bool] = typer.Option(False, "--flat",
+                                             help="Write a single krakend.json containing every endpoint, which "
+                                                  "KrakenD loads without rendering templates"),
+         compact: Optional[bool] = typer.Option(False, "--compact",
+                                                help="Write the flat krakend.json without indentation (requires "
+                                                     "--flat)"),
+         validate: Optional[bool] = typer.Option(False, "--validate",
+                                                 help="Validate the OpenAPI specifications against the OpenAPI "
+                                                      "3.0/3.1 structure and report every error at once"),
+         sources: Optional[str] = typer.Option(None, "--sources",
+                                               help="Fetch the OpenAPI specifications into the input folder from the "
+                                                    "URLs inside this JSON or YAML file first",
+                                               show_default=False),
+         fetch_jobs: Optional[int] = typer.Option(8, "--fetch-jobs",
+                                                  help="The maximum amount of OpenAPI specifications fetched at the "
+                                                       "same time"),
+         shards: Optional[int] = typer.Option(None, "--shards",
+                                              help="Split the OpenAPI specifications across this amount of KrakenD "
+                                                   "configurations, with a routing map of the prefixes of every shard",
+                                              show_default=False),
+         shard_by: Optional[str] = typer.Option("operations", "--shard-by",
+                                                help="How the OpenAPI specifications are spread across the shards "
+                                                     "(operations or prefix)"),
+         shard_groups: Optional[str] = typer.Option(None, "--shard-groups",
+                                                    help="Split the OpenAPI specifications across the shards named "
+                                                         "inside this JSON or YAML file, by filename pattern",
+                                                    show_default=False),
+         http_cache: Optional[bool] = typer.Option(False, "--http-cache",
+                                                   help="Cache the responses of GET endpoints whose successful "
+                                                        "responses declare a Cache-Control header inside KrakenD"),
+         qos_policy: Optional[str] = typer.Option(None, "--qos-policy",
+                                                  help="Apply the cache, timeout, rate limit and circuit breaker "
+                                                       "settings by tag and path glob inside this JSON or YAML file",
+                                                  show_default=False),
+         auto_encoding: Optional[bool] = typer.Option(False, "--auto-encoding",
+                                                      help="Select the encoding of every endpoint from its content "
+                                                           "types, only decoding JSON responses that are "
+                                                           "manipulated"),
+         allow_lists: Optional[bool] = typer.Option(False, "--allow-lists",
+                                                    help="Only pass the fields documented by the successful response "
+                                                         "schemas of every operation to the clients")):
     """
     The converter CLI command
     """
-    converter = OpenAPIToKrakenD(logging_mode=logging.DEBUG if debug else logging.INFO,
-                                 input_folder_path=input_folder,
-                                 output_folder_path=output_folder,
-                                 env=environment,
-                                 no_versioning=disable_automatic_versioning)
-    converter.convert()
+    if compact and not flat:
+        raise typer.BadParameter("--compact requires --flat", param_hint="--compact")
 
+    if environment and "," in environment:
+        environment = [env.strip() for env in environment.split(",") if env.strip()]
+
+    if (all_envs or isinstance(environment, list)) and flat:
+        raise typer.BadParameter("multiple environments can not be combined with --flat", param_hint="--env")
+
+    if all_envs and environment:
+        raise typer.BadParameter("--all-envs can not be combined with --env", param_hint="--all-envs")
+
+    if shards is not None and shard_groups:
+        raise typer.BadParameter("--shards can not be combined with --shard-groups", param_hint="--shards")
+
+    if shards is not None and shards < 1:
+        raise typer.BadParameter("use at least one shard", param_hint="--shards")
+
+    if shard_by not in SHARD_STRATEGIES:
+        raise typer.BadParameter(f"use one of {', '.join(SHARD_STRATEGIES)}", param_hint="--shard-by")
+
+    set_log_format(log_format)
+
+    logging_mode = logging.DEBUG if debug else logging.INFO
+    logger = CustomLogger(logging_mode)
+
+    try:
+        if sources:
+            SourceFetcher(input_folder, load_option_file(load_sources, sources, "--sources"), fetch_jobs,
+                          logger=logger).fetch()
+
+        groups = load_option_file(load_shard_groups, shard_groups, "--shard-groups")
+        policy = load_option_file(load_qos_policy, qos_policy, "--qos-policy")
+
+        # Combinations of options that are only verified together are reported like any other invalid option
+        try:
+            options = ConverterOptions(env=environment,
+                                       no_versioning=disable_automatic_versioning,
+                                       jobs=jobs,
+                                       incremental=incremental,
+                                       streaming=streaming,
+                                       profile=profile is not None,
+                                       log_format=log_format,
+                                       flat=flat,
+                                       compact=compact,
+                                       validate=validate,
+                                       all_envs=all_envs,
+                                       shards=shards,
+                                       shard_by=shard_by,
+                                       shard_groups=groups,
+                                       http_cache=http_cache,
+                                       qos_policy=policy,
+                                       auto_encoding=auto_encoding,
+                                       allow_lists=allow_lists)
+        except ValueError as error:
+            raise typer.BadParameter(str(error)) from error
+
+        converter = OpenAPIToKrakenD(logging_mode, input_folder, output_folder, options=options)
+
+        run_converter(converter, watch, profile, cprofile)
+    except (OpenAPIFileNotFoundError, InvalidOpenAPIError, SpecFetchError) as error:
+        # Logged using the level and format of the run, so fatal errors are JSON when using --log-format json
+        logger.error(error)
+        raise typer.Exit(1) from error
+
+
+def set_log_format(log_format: str):
+    """
+    Set the format of the log lines of the run, and report an unknown format like any other invalid option.
+    """
+    if log_format not in LOG_FORMATS:
+        raise typer.BadParameter(f"use one of {', '.join(LOG_FORMATS)}", param_hint="--log-format")
+
+    configure_logging(log_format)
+
+
+def load_option_file(load: Callable[[str], dict], path: Optional[str], param_hint: str) -> Optional[dict]:
+    """
+    Load the file given to an option, and report an invalid or missing file like any other invalid option.
+    """
+    if not path:
+        return None
 
-if __name__ == "__main__":  # pragma: no coverage
     try:
-        app()
-    except (OpenAPIFileNotFoundError, InvalidOpenAPIError) as e:
-        CustomLogger().error(e)
+        return load(path)
+    except (OSError, ValueError) as error:
+        raise typer.BadParameter(str(error), param_hint=param_hint) from error
+
+
+def run_converter(converter: OpenAPIToKrakenD, watch: bool, profile: Optional[str], cprofile: Optional[str]):
+    """
+    Convert once, optionally profiled, or keep converting while watching.
+    """
+    if watch:
+        ConverterWatcher(converter, profile_path=profile).run()
+        return
+
+    if cprofile:
+        with cProfile.Profile() as profiler:
+            converter.convert()
+        profiler.dump_stats(cprofile)
+    else:
+        converter.convert()
+
+    if profile:
+        converter.write_profile(profile)
+
+
+@app.command("serve")
+def serve(host: Optional[str] = typer.Option("127.0.0.1", "--host", help="The address the server listens on"),
+          port: Optional[int] = typer.Option(8080, "--port", help="The port the server listens on"),
+          cache_size: Optional[int] = typer.Option(1024, "--cache-size",
+                                                   help="The maximum amount of converted specifications kept in "
+                                                        "memory"),
+          workers: Optional[int] = typer.Option(4, "--workers",
+                                                help="The maximum amount of conversions running at the same time"),
+          debug: Optional[bool] = typer.Option(False, "--debug", help="Enable debug mode"),
+          log_format: Optional[str] = typer.Option("text", "--log-format",
+                                                   help="The format of the log lines (text or json)")):
+    """
+    Convert OpenAPI specifications on request using a local HTTP server
+    """
+    set_log_format(log_format)
+
+    ConversionServer(host=host, port=port, cache_size=cache_size, workers=workers,
+                     logging_mode=logging.DEBUG if debug else logging.INFO, log_format=log_format).run()
+
+
+if __name__ == "__main__":  # pragma: no coverage
+    app()
@@ -1,23 +1,90 @@
+from __future__ import annotations
+
+import functools
+import json
 import logging
 import sys
+from datetime import datetime, timezone
+
+# The attributes every log record has, anything else has been passed using `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Format log records as a single line JSON object, for log pipelines
+
+    Fields passed to the logger using `extra` are added to the object.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(entry, default=str)
+
+
+# The available log formats
+LOG_FORMATS = {
+    "text": lambda: logging.Formatter("[%(asctime)s] [%(levelname)s]: %(message)s", "%H:%M:%S"),
+    "json": JSONFormatter
+}
+
+
+@functools.cache
+def get_stream_handler() -> logging.Handler:
+    """
+    Get the handler shared by every CustomLogger inside this process, which writes to stdout.
+
+    The handler writes text until another format is set using `configure_logging`.
+    """
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(LOG_FORMATS["text"]())
+
+    logging.getLogger(__name__).addHandler(stream_handler)
+
+    return stream_handler
+
+
+def configure_logging(log_format: str = "text"):
+    """
+    Set the format of the log lines of every CustomLogger inside this process.
+
+    Called once per run, by the commands and by every worker process. If the format is unknown a ValueError is raised.
+    """
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format '{log_format}', use one of {', '.join(LOG_FORMATS)}")
+
+    get_stream_handler().setFormatter(LOG_FORMATS[log_format]())
 
 
 class CustomLogger(logging.Logger):  # NOSONAR
     """
     The logger for the converter
 
-    Shadows builtin logging.Logger
+    Shadows builtin logging.Logger. Every instance writes to the same handler, so creating multiple instances does not
+    duplicate log lines, and the format of the handler is only set by `configure_logging`. Every logging level gets a
+    child logger of its own, so instances with different levels do not change each other. Messages are formatted
+    lazily using `%` arguments, so disabled levels cost almost nothing.
     """
 
     def __init__(self, logging_level=logging.WARNING):
         super().__init__(__name__)
-        self.stream_handler = logging.StreamHandler(sys.stdout)
-        self.stream_handler.setFormatter(logging.Formatter("[%(asctime)s] [%(levelname)s]: %(message)s",
-                                                           "%H:%M:%S"))
 
-        self.logger = logging.getLogger(__name__)
+        self.stream_handler = get_stream_handler()
+
+        self.logger = logging.getLogger(f"{__name__}.{logging.getLevelName(logging_level)}")
         self.logger.setLevel(logging_level)
-        self.logger.addHandler(self.stream_handler)
 
     def get_logger(self) -> logging.Logger:
         """
@@ -25,6 +92,9 @@ class CustomLogger(logging.Logger):  # NOSONAR
         """
         return self.logger
 
+    def isEnabledFor(self, level):
+        return self.logger.isEnabledFor(level)
+
     def critical(self, msg, *args, **kwargs):
         self.logger.critical(msg, *args, **kwargs)
 
@@ -32,7 +102,7 @@ class CustomLogger(logging.Logger):  # NOSONAR
         self.logger.error(msg, *args, **kwargs)
 
     def warning(self, msg, *args, **kwargs):
-        self.logger.error(msg, *args, **kwargs)
+        self.logger.warning(msg, *args, **kwargs)
 
     def info(self, msg, *args, **kwargs):
         self.logger.info(msg, *args, **kwargs)
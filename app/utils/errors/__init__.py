@@ -1,4 +1,5 @@
 from .invalid_openapi import InvalidOpenAPIError
 from .openapi_file_not_found import OpenAPIFileNotFoundError
+from .spec_fetch import SpecFetchError
 
-__all__ = ["InvalidOpenAPIError", "OpenAPIFileNotFoundError"]
+__all__ = ["InvalidOpenAPIError", "OpenAPIFileNotFoundError", "SpecFetchError"]
@@ -0,0 +1,6 @@
+class SpecFetchError(ConnectionError):
+    """
+    Raised when OpenAPI specifications could not be fetched from their sources
+    """
+    def __init__(self, msg="Could not fetch OpenAPI specs"):
+        super().__init__(msg)
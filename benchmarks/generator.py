@@ -0,0 +1,164 @@
+"""
+Generate synthetic OpenAPI estates to benchmark the converter with
+
+Usage: python -m benchmarks.generator OUTPUT_FOLDER [--files 10] [--paths 50] [--methods 2] [--parameters 3]
+                                                    [--security-schemes 1] [--schema-bloat 10] [--format json]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+from dataclasses import asdict, dataclass
+
+import yaml
+
+# The methods used for the operations of every path, in order
+METHODS = ["get", "post", "put", "delete", "patch", "options", "head", "trace"]
+
+
+# Disable pylint too-many-instance-attributes due to every dimension of the estate being configurable.
+# pylint: disable=too-many-instance-attributes
+@dataclass
+class EstateConfig:
+    """
+    The shape of a generated estate of OpenAPI specifications
+    """
+    files: int = 10
+    paths: int = 50
+    methods: int = 2
+    parameters: int = 3
+    security_schemes: int = 1
+    schema_bloat: int = 10
+    file_format: str = "json"
+    seed: int = 0
+
+    @property
+    def operations(self) -> int:
+        """
+        The total amount of operations (and therefore KrakenD endpoints) inside the estate
+        """
+        return self.files * self.paths * self.methods
+
+    def to_dict(self) -> dict:
+        """
+        Get the configuration as a JSON serializable dict.
+        """
+        return asdict(self)
+
+
+def generate_spec(config: EstateConfig, index: int = 0) -> dict:
+    """
+    Generate a single OpenAPI specification.
+
+    Every path gets `config.methods` operations with `config.parameters` parameters each, spread across query, header
+    and path parameters. Every operation references its own response schema with `config.schema_bloat` properties, which
+    the converter does not use but has to parse.
+    """
+    generator = random.Random(config.seed * 100003 + index)
+
+    spec = {
+        "openapi": "3.0.2",
+        "info": {"title": f"Service {index}", "version": f"{generator.randint(1, 3)}.0.0"},
+        "servers": [
+            {"url": f"https://service{index}.example.com", "description": "prod"},
+            {"url": f"https://service{index}.staging.example.com", "description": "staging"}
+        ],
+        "paths": {},
+        "components": {"schemas": {}, "securitySchemes": {}}
+    }
+
+    schemes = [f"Scheme{scheme}" for scheme in range(config.security_schemes)]
+    for position, scheme in enumerate(schemes):
+        spec["components"]["securitySchemes"][scheme] = [
+            {"type": "http", "scheme": "bearer"},
+            {"type": "apiKey", "in": "header", "name": f"X-API-Key-{position}"},
+            {"type": "oauth2", "flows": {"implicit": {"authorizationUrl": "https://example.com/auth", "scopes": {}}}}
+        ][position % 3]
+
+    for path_index in range(config.paths):
+        path = f"/resource{path_index}/{{id}}"
+        spec["paths"][path] = {}
+
+        for method in METHODS[:config.methods]:
+            schema_name = f"Model{path_index}{method.capitalize()}"
+            spec["components"]["schemas"][schema_name] = {
+                "type": "object",
+                "properties": {f"field{field}": {"type": "string", "description": f"Field {field} " * 4}
+                               for field in range(config.schema_bloat)}
+            }
+
+            parameters = [{"name": "id", "in": "path", "required": True, "schema": {"type": "string"}}]
+            for parameter in range(1, config.parameters):
+                location = "header" if parameter % 3 == 0 else "query"
+                parameters.append({"name": f"param{parameter}", "in": location, "schema": {"type": "string"}})
+
+            operation = {
+                "operationId": f"{method}_resource{path_index}",
+                "parameters": parameters[:config.parameters],
+                "responses": {
+                    "200": {
+                        "description": "Successful Response",
+                        "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/{schema_name}"}}}
+                    }
+                }
+            }
+
+            if schemes and generator.random() < 0.5:
+                operation["security"] = [{generator.choice(schemes): []}]
+
+            spec["paths"][path][method] = operation
+
+    return spec
+
+
+def write_estate(config: EstateConfig, folder_path: str) -> list:
+    """
+    Write a generated estate to a folder and return the paths of the written specifications.
+    """
+    os.makedirs(folder_path, exist_ok=True)
+    paths = []
+
+    for index in range(config.files):
+        spec = generate_spec(config, index)
+        path = os.path.join(folder_path, f"Service{index}.{config.file_format}")
+
+        with open(path, "w", encoding="utf-8") as spec_file:
+            if config.file_format == "json":
+                json.dump(spec, spec_file, indent=2)
+            else:
+                yaml.dump(spec, spec_file, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), sort_keys=False)
+
+        paths.append(path)
+
+    return paths
+
+
+def main():
+    """
+    Write a generated estate to the output folder.
+    """
+    parser = argparse.ArgumentParser(description="Generate a synthetic estate of OpenAPI specifications")
+    parser.add_argument("output_folder", help="The folder the specifications are written to")
+    parser.add_argument("--files", type=int, default=EstateConfig.files)
+    parser.add_argument("--paths", type=int, default=EstateConfig.paths, help="The amount of paths per file")
+    parser.add_argument("--methods", type=int, default=EstateConfig.methods, choices=range(1, len(METHODS) + 1),
+                        help="The amount of operations per path")
+    parser.add_argument("--parameters", type=int, default=EstateConfig.parameters,
+                        help="The amount of parameters per operation")
+    parser.add_argument("--security-schemes", type=int, default=EstateConfig.security_schemes)
+    parser.add_argument("--schema-bloat", type=int, default=EstateConfig.schema_bloat,
+                        help="The amount of unused schema properties per operation")
+    parser.add_argument("--format", dest="file_format", default=EstateConfig.file_format, choices=["json", "yaml"])
+    parser.add_argument("--seed", type=int, default=EstateConfig.seed)
+    arguments = parser.parse_args()
+
+    config = EstateConfig(**{key: value for key, value in vars(arguments).items() if key != "output_folder"})
+    paths = write_estate(config, arguments.output_folder)
+
+    print(f"Wrote {len(paths)} specifications with {config.operations} operations to {arguments.output_folder}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Benchmark the converter on generated estates of OpenAPI specifications
+
+Every scenario is converted several times, and the fastest time of every phase is kept. The results are written as JSON
+and can be compared with the results of a previous run, failing when the throughput of a scenario regressed by more
+than the threshold.
+
+Usage: python -m benchmarks.run [--scenario wide] [--repeat 3] [--output results.json]
+                                [--baseline baseline.json] [--threshold 0.2]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.spec import OpenAPISpec
+from benchmarks.generator import EstateConfig, write_estate
+
+# Increase when the measurements change, so results of older versions are not compared
+RESULTS_VERSION = 1
+
+SCENARIOS = {
+    "small": EstateConfig(files=10, paths=20),
+    "many_files": EstateConfig(files=200, paths=5),
+    "wide": EstateConfig(files=1, paths=2000, methods=3),
+    "parameters": EstateConfig(files=5, paths=100, parameters=20, security_schemes=3),
+    "bloated": EstateConfig(files=5, paths=100, schema_bloat=200),
+    "yaml": EstateConfig(files=5, paths=100, file_format="yaml")
+}
+
+
+def measure(function) -> float:
+    """
+    Get the amount of seconds a function takes to run.
+    """
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def measure_peak_memory(function) -> int:
+    """
+    Get the peak amount of bytes allocated by Python while a function runs.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure_convert_phases(input_folder_path: str, output_folder_path: str) -> dict:
+    """
+    Measure the wall time of the phases inside the converter once using its profiler, converting into an empty output
+    folder.
+    """
+    shutil.rmtree(output_folder_path)
+    os.mkdir(output_folder_path)
+    profiler = OpenAPIToKrakenD(logging.CRITICAL, input_folder_path, output_folder_path, profile=True) \
+        .convert().profiler
+
+    return {name: phase["wall"] for name, phase in profiler.phases.items()}
+
+
+def run_scenario(config: EstateConfig, repeat: int) -> dict:
+    """
+    Benchmark a single scenario.
+
+    The phases are:
+    parse -- Load every specification
+    convert -- Convert the estate into an empty output folder
+    convert_streaming -- Convert the estate into an empty output folder using the streaming parser
+    incremental -- Convert the estate incrementally when nothing changed
+
+    The time spent in the phases inside the converter is measured once using its profiler, as profiling slows down the
+    conversion.
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        input_folder_path = os.path.join(folder, "input")
+        output_folder_path = os.path.join(folder, "output")
+        paths = write_estate(config, input_folder_path)
+
+        def convert(**options):
+            shutil.rmtree(output_folder_path, ignore_errors=True)
+            os.mkdir(output_folder_path)
+            OpenAPIToKrakenD(logging.CRITICAL, input_folder_path, output_folder_path, **options).convert()
+
+        incremental_converter = OpenAPIToKrakenD(logging.CRITICAL, input_folder_path, output_folder_path,
+                                                 incremental=True)
+
+        def convert_incremental():
+            incremental_converter.reload()
+            incremental_converter.convert()
+
+        phases = {
+            "parse": lambda: [OpenAPISpec.load(path) for path in paths],
+            "convert": convert,
+            "convert_streaming": lambda: convert(streaming=True),
+            "incremental": convert_incremental
+        }
+
+        timings = {name: [] for name in phases}
+        for _ in range(repeat):
+            for name, phase in phases.items():
+                if name == "incremental":
+                    # The first incremental conversion into the output folder builds everything
+                    convert(incremental=True)
+
+                timings[name].append(measure(phase))
+
+        peak_memory = {
+            "convert": measure_peak_memory(convert),
+            "convert_streaming": measure_peak_memory(lambda: convert(streaming=True))
+        }
+
+        convert_phases = measure_convert_phases(input_folder_path, output_folder_path)
+
+        return {
+            "config": config.to_dict(),
+            "operations": config.operations,
+            "input_bytes": sum(os.path.getsize(path) for path in paths),
+            "wall": min(timings["convert"]),
+            "throughput": config.operations / min(timings["convert"]),
+            "phases": {name: min(values) for name, values in timings.items()},
+            "convert_phases": convert_phases,
+            "peak_memory": peak_memory
+        }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Compare results with the results of a previous run, and return a message for every scenario whose throughput
+    regressed by more than the threshold (e.g. 0.2 for 20%).
+    """
+    if baseline.get("version") != RESULTS_VERSION:
+        return [f"Baseline has version {baseline.get('version')}, expected {RESULTS_VERSION}"]
+
+    regressions = []
+
+    for name, result in results["scenarios"].items():
+        if name not in baseline["scenarios"]:
+            continue
+
+        previous = baseline["scenarios"][name]["throughput"]
+        change = result["throughput"] / previous - 1
+
+        if change < -threshold:
+            regressions.append(f"{name}: throughput {result['throughput']:.0f} ops/s is {-change:.1%} below the "
+                               f"baseline of {previous:.0f} ops/s")
+
+    return regressions
+
+
+def main() -> int:
+    """
+    Run the benchmarks, write the results and compare them with the baseline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the converter on generated OpenAPI estates")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="The scenario to run, can be repeated (runs every scenario by default)")
+    parser.add_argument("--repeat", type=int, default=3, help="The amount of times every phase is measured")
+    parser.add_argument("--output", help="The path of the JSON file the results are written to")
+    parser.add_argument("--baseline", help="The path of the results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="The maximum allowed relative throughput regression compared to the baseline")
+    arguments = parser.parse_args()
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": {}
+    }
+
+    for name in arguments.scenario or SCENARIOS:
+        result = run_scenario(SCENARIOS[name], arguments.repeat)
+        results["scenarios"][name] = result
+
+        phases = "  ".join(f"{phase} {seconds:.3f}s" for phase, seconds in result["phases"].items())
+        print(f"{name:<12} {result['operations']:>6} ops  {result['throughput']:>8.0f} ops/s  "
+              f"peak {result['peak_memory']['convert'] / 1024 / 1024:7.1f} MB  {phases}")
+
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as results_file:
+            json.dump(results, results_file, indent=4)
+
+    if arguments.baseline:
+        with open(arguments.baseline, "r", encoding="utf-8") as baseline_file:
+            regressions = compare(results, json.load(baseline_file), arguments.threshold)
+
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
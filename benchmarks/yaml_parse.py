@@ -0,0 +1,80 @@
+"""
+Compare the cost of parsing a large OpenAPI specification in YAML with the cost of converting it
+
+Usage: python -m benchmarks.yaml_parse [--paths 2000]
+"""
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+
+import yaml
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.loader import YAMLLoader
+from app.logic.spec import OpenAPISpec
+from benchmarks.generator import EstateConfig, generate_spec
+
+
+def measure(function) -> float:
+    """
+    Get the amount of seconds a function takes to run.
+    """
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    """
+    Write a generated specification as JSON and YAML, and time parsing and converting both.
+    """
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paths", type=int, default=2000, help="The amount of paths inside the specification")
+    arguments = parser.parse_args()
+
+    spec = generate_spec(EstateConfig(files=1, paths=arguments.paths, schema_bloat=20))
+
+    with tempfile.TemporaryDirectory() as folder:
+        for extension in ["json", "yaml"]:
+            input_folder_path = os.path.join(folder, extension)
+            output_folder_path = os.path.join(folder, f"{extension}_output")
+            os.mkdir(input_folder_path)
+            os.mkdir(output_folder_path)
+
+            path = os.path.join(input_folder_path, f"Benchmark.{extension}")
+            with open(path, "w", encoding="utf-8") as spec_file:
+                if extension == "json":
+                    json.dump(spec, spec_file, indent=2)
+                else:
+                    yaml.dump(spec, spec_file, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper), sort_keys=False)
+
+            print(f"{os.path.basename(path)}: {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+
+            def parse_regular(spec_path=path, yaml_spec=extension == "yaml"):
+                with open(spec_path, "r", encoding="utf-8") as spec_file:
+                    if yaml_spec:
+                        yaml.load(spec_file, Loader=YAMLLoader)
+                    else:
+                        json.load(spec_file)
+
+            timings = {
+                "parse (json.load / yaml.load)": measure(parse_regular),
+                "parse (converter)": measure(lambda spec_path=path: OpenAPISpec.load(spec_path)),
+                "parse (converter, --streaming)": measure(
+                    lambda spec_path=path: OpenAPISpec.load(spec_path, streaming=True)),
+                "convert": measure(OpenAPIToKrakenD(logging.CRITICAL, input_folder_path, output_folder_path).convert),
+                "convert (--streaming)": measure(
+                    OpenAPIToKrakenD(logging.CRITICAL, input_folder_path, output_folder_path, streaming=True).convert)
+            }
+
+            for name, seconds in timings.items():
+                print(f"    {name:<32} {seconds:7.3f}s")
+
+    print(f"YAML loader: {YAMLLoader.__name__}")
+
+
+if __name__ == "__main__":
+    main()
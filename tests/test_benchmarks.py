@@ -0,0 +1,85 @@
+import glob
+import json
+import logging
+import unittest
+
+from app.logic.converter import OpenAPIToKrakenD
+from benchmarks.generator import EstateConfig, generate_spec, write_estate
+from benchmarks.run import RESULTS_VERSION, compare, run_scenario
+from tests.logic.test_setup_logic import delete_output_folder, create_output_folder
+
+
+# pylint:disable=duplicate-code
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Test the benchmark generator and harness
+    """
+
+    @classmethod
+    def setUp(cls):
+        """
+        Create the output folder if it doesn't exist
+        """
+        create_output_folder()
+
+    @classmethod
+    def tearDown(cls):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def test_generated_estate(self):
+        """
+        Test if a generated estate converts to one endpoint per operation
+        """
+        for file_format in ["json", "yaml"]:
+            config = EstateConfig(files=3, paths=4, methods=3, parameters=4, security_schemes=3,
+                                  file_format=file_format)
+            write_estate(config, f"tests/output/input_{file_format}")
+
+            converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                         input_folder_path=f"tests/output/input_{file_format}",
+                                         output_folder_path="tests/output")
+            converter.convert()
+
+            endpoints = 0
+            for path in glob.glob("tests/output/config/templates/SERVICE*.tmpl"):
+                with open(path, "r", encoding="utf-8") as template_file:
+                    endpoints += template_file.read().count('"endpoint":')
+
+            self.assertEqual(endpoints, config.operations)
+
+    def test_deterministic(self):
+        """
+        Test if the same configuration always generates the same specification
+        """
+        config = EstateConfig(paths=3, security_schemes=2)
+
+        self.assertEqual(json.dumps(generate_spec(config, 1)), json.dumps(generate_spec(config, 1)))
+
+    def test_run_scenario(self):
+        """
+        Test if every phase is measured
+        """
+        result = run_scenario(EstateConfig(files=2, paths=2), repeat=1)
+
+        self.assertEqual(set(result["phases"]), {"parse", "convert", "convert_streaming", "incremental"})
+        self.assertIn("specs", result["convert_phases"])
+        self.assertEqual(result["operations"], 8)
+        self.assertGreater(result["peak_memory"]["convert"], 0)
+
+    def test_compare(self):
+        """
+        Test if only throughput regressions beyond the threshold are reported
+        """
+        baseline = {"version": RESULTS_VERSION,
+                    "scenarios": {"small": {"throughput": 1000}, "wide": {"throughput": 100}}}
+        results = {"scenarios": {"small": {"throughput": 850}, "wide": {"throughput": 50}, "new": {"throughput": 1}}}
+
+        regressions = compare(results, baseline, 0.2)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("wide:"))
+        self.assertEqual(len(compare(results, {"version": 0}, 0.2)), 1)
@@ -0,0 +1,52 @@
+import unittest
+
+from app.logic.cache import ResultCache, hash_document
+
+
+# pylint:disable=duplicate-code
+
+class TestCache(unittest.TestCase):
+    """
+    Test the cache of converted specs
+    """
+
+    def test_hash_document(self):
+        """
+        Test if the hash does not depend on the order of the keys, but does on the values
+        """
+        self.assertEqual(hash_document({"a": 1, "b": 2}), hash_document({"b": 2, "a": 1}))
+        self.assertNotEqual(hash_document({"a": 1}), hash_document({"a": 2}))
+        self.assertNotEqual(hash_document("a", "b"), hash_document("ab"))
+
+    def test_get_put(self):
+        """
+        Test if cached results are returned and the hits and misses are counted
+        """
+        cache = ResultCache()
+
+        self.assertIsNone(cache.get("key"))
+
+        cache.put("key", "value")
+
+        self.assertEqual(cache.get("key"), "value")
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 1))
+
+        cache.clear()
+
+        self.assertIsNone(cache.get("key"))
+
+    def test_least_recently_used(self):
+        """
+        Test if the least recently used result is dropped when the cache is full
+        """
+        cache = ResultCache(2)
+
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
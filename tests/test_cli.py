@@ -1,4 +1,5 @@
 import json
+import os
 import unittest
 
 from typer.testing import CliRunner
@@ -50,3 +51,183 @@ class TestCLI(unittest.TestCase):
         config_json = json.loads(config_data)
 
         self.assertEqual(config_json["name"], "Test gateway")
+
+    def test_flat_compact(self):
+        """
+        Test if --flat --compact writes a compact krakend.json
+        Test if --compact without --flat fails
+        """
+        result = self.runner.invoke(app, ["tests/mock_data/full", "tests/output", "--flat", "--compact"])
+
+        self.assertEqual(result.exit_code, 0)
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            config = config_file.read()
+
+        self.assertNotIn("\n", config)
+        self.assertEqual(json.loads(config)["name"], "Test gateway")
+
+        result = self.runner.invoke(app, ["tests/mock_data/full", "tests/output", "--compact"])
+
+        self.assertNotEqual(result.exit_code, 0)
+
+    def test_validate(self):
+        """
+        Test if --validate fails on invalid specs and converts valid specs
+        """
+        result = self.runner.invoke(app, ["tests/mock_data/validation", "tests/output", "--validate"])
+
+        self.assertNotEqual(result.exit_code, 0)
+
+        result = self.runner.invoke(app, ["tests/mock_data/full", "tests/output", "--validate"])
+
+        self.assertEqual(result.exit_code, 0)
+
+    def test_convert_command(self):
+        """
+        Test if the convert command can be given explicitly, and the serve command is listed
+        """
+        result = self.runner.invoke(app, ["convert", "tests/mock_data/full", "tests/output"])
+
+        self.assertEqual(result.exit_code, 0)
+
+        result = self.runner.invoke(app, ["--help"])
+
+        self.assertIn("serve", result.output)
+
+    def test_sources(self):
+        """
+        Test if --sources fails when a specification can not be fetched
+        """
+        with open("tests/output/sources.json", "w", encoding="utf-8") as sources_file:
+            json.dump({"Users.json": "http://127.0.0.1:1/openapi.json"}, sources_file)
+
+        result = self.runner.invoke(app, ["tests/output/input", "tests/output",
+                                          "--sources", "tests/output/sources.json"])
+
+        self.assertNotEqual(result.exit_code, 0)
+        self.assertFalse(os.path.exists("tests/output/input/Users.json"))
+
+    def test_invalid_option_files(self):
+        """
+        Test if a malformed sources manifest, shard group mapping or policy is reported as an invalid option
+        """
+        with open("tests/output/invalid.json", "w", encoding="utf-8") as invalid_file:
+            json.dump(["Users.json"], invalid_file)
+
+        for option in ["--sources", "--shard-groups", "--qos-policy"]:
+            result = self.runner.invoke(app, ["tests/mock_data/multiple", "tests/output", option,
+                                              "tests/output/invalid.json"])
+
+            self.assertEqual(result.exit_code, 2, option)
+            self.assertNotIsInstance(result.exception, ValueError, option)
+            self.assertIn(option, result.output, option)
+
+    def test_multiple_envs(self):
+        """
+        Test if comma separated environments write a service.json per environment
+        Test if multiple environments can't be combined with --flat
+        Test if duplicate environments are reported as an invalid option
+        """
+        result = self.runner.invoke(app, ["tests/mock_data/environment", "tests/output", "--env", "prod,dev"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertTrue(os.path.exists("tests/output/config/settings/prod/service.json"))
+        self.assertTrue(os.path.exists("tests/output/config/settings/dev/service.json"))
+
+        result = self.runner.invoke(app, ["tests/mock_data/environment", "tests/output", "--all-envs", "--flat"])
+
+        self.assertNotEqual(result.exit_code, 0)
+
+        result = self.runner.invoke(app, ["tests/mock_data/environment", "tests/output", "--env", "prod,prod"])
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertNotIsInstance(result.exception, ValueError)
+        self.assertIn("without duplicates", result.output)
+
+    def test_shards(self):
+        """
+        Test if --shards writes every shard and the routing map
+        Test if --shards can't be combined with --shard-groups
+        """
+        result = self.runner.invoke(app, ["tests/mock_data/multiple", "tests/output", "--shards", "2",
+                                          "--shard-by", "prefix"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertTrue(os.path.exists("tests/output/routing.json"))
+        self.assertTrue(os.path.exists("tests/output/shard-2/config/krakend.json"))
+
+        with open("tests/output/groups.json", "w", encoding="utf-8") as groups_file:
+            json.dump({"public": ["*"]}, groups_file)
+
+        result = self.runner.invoke(app, ["tests/mock_data/multiple", "tests/output", "--shards", "2",
+                                          "--shard-groups", "tests/output/groups.json"])
+
+        self.assertNotEqual(result.exit_code, 0)
+
+    def test_http_cache(self):
+        """
+        Test if --http-cache caches the GET endpoints declaring a Cache-Control header
+        """
+        result = self.runner.invoke(app, ["tests/mock_data/qos", "tests/output", "--flat", "--http-cache"])
+
+        self.assertEqual(result.exit_code, 0)
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            self.assertIn("qos/http-cache", config_file.read())
+
+    def test_qos_policy(self):
+        """
+        Test if --qos-policy applies the settings of the policy, and an invalid policy fails
+        """
+        with open("tests/output/policy.json", "w", encoding="utf-8") as policy_file:
+            json.dump({"tags": {"Users": {"rate-limit": {"max_rate": 10}}}}, policy_file)
+
+        result = self.runner.invoke(app, ["tests/mock_data/rate_limit", "tests/output", "--flat",
+                                          "--qos-policy", "tests/output/policy.json"])
+
+        self.assertEqual(result.exit_code, 0)
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            self.assertIn("qos/ratelimit/router", config_file.read())
+
+        with open("tests/output/policy.json", "w", encoding="utf-8") as policy_file:
+            json.dump({"tags": {"Users": {"rate-limit": {"max_rate": -1}}}}, policy_file)
+
+        result = self.runner.invoke(app, ["tests/mock_data/rate_limit", "tests/output",
+                                          "--qos-policy", "tests/output/policy.json"])
+
+        self.assertNotEqual(result.exit_code, 0)
+
+    def test_auto_encoding(self):
+        """
+        Test if --auto-encoding proxies the binary responses as is
+        """
+        result = self.runner.invoke(app, ["tests/mock_data/encoding", "tests/output", "--flat", "--auto-encoding"])
+
+        self.assertEqual(result.exit_code, 0)
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            self.assertIn("no-op", config_file.read())
+
+    def test_allow_lists(self):
+        """
+        Test if --allow-lists only allows the documented response fields
+        """
+        result = self.runner.invoke(app, ["tests/mock_data/allow_lists", "tests/output", "--flat", "--allow-lists"])
+
+        self.assertEqual(result.exit_code, 0)
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            self.assertIn("team.name", config_file.read())
+
+    def test_invalid_log_format(self):
+        """
+        Test if an unknown log format is reported as an invalid option by both commands
+        """
+        for arguments in [["tests/mock_data/multiple", "tests/output"], ["serve"]]:
+            result = self.runner.invoke(app, [*arguments, "--log-format", "xml"])
+
+            self.assertEqual(result.exit_code, 2, arguments)
+            self.assertNotIsInstance(result.exception, ValueError, arguments)
+            self.assertIn("--log-format", result.output, arguments)
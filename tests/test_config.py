@@ -0,0 +1,55 @@
+import unittest
+from unittest import mock
+
+from app.logic.config import ConverterConfig
+
+
+# pylint:disable=duplicate-code
+
+class TestConfig(unittest.TestCase):
+    """
+    Test the configuration loader
+    """
+
+    def test_default_configuration(self):
+        """
+        Test if the default configuration is used when no custom configuration exists
+        """
+        config = ConverterConfig("tests/mock_data/headers/")
+
+        self.assertFalse(config.is_custom("krakend.json"))
+        self.assertEqual(config.krakend["name"], "KrakenD API Gateway")
+        self.assertTrue(config.dockerfile_path.endswith("app/config/Dockerfile"))
+
+    def test_custom_configuration(self):
+        """
+        Test if the custom configuration takes precedence over the default configuration
+        """
+        config = ConverterConfig("tests/mock_data/full/")
+
+        self.assertTrue(config.is_custom("krakend.json"))
+        self.assertEqual(config.krakend["name"], "Test gateway")
+
+    def test_cached(self):
+        """
+        Test if a configuration file is only read once
+        """
+        config = ConverterConfig("tests/mock_data/full/")
+        backend = config.backend
+
+        with mock.patch("builtins.open") as mocked_open:
+            for _ in range(10):
+                self.assertEqual(config.backend, backend)
+
+        mocked_open.assert_not_called()
+
+    def test_merge_copies_values(self):
+        """
+        Test if modifying a merged endpoint does not modify the cached configuration
+        """
+        fragment = {"extra_config": {"qos/http-cache": {}}}
+
+        endpoint = ConverterConfig.merge({}, fragment)
+        endpoint["extra_config"]["modified"] = True
+
+        self.assertNotIn("modified", fragment["extra_config"])
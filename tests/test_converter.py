@@ -2,7 +2,9 @@ import json
 import logging
 import os
 import re
+import shutil
 import unittest
+from unittest import mock
 
 from app.logic.converter import OpenAPIToKrakenD
 from app.utils.errors import InvalidOpenAPIError, OpenAPIFileNotFoundError
@@ -637,3 +639,318 @@ class TestConverter(unittest.TestCase):
                                      output_folder_path="tests/output")
 
         self.assertEqual(converter.logger.get_logger().level, logging.DEBUG)
+
+    def test_jobs(self):
+        """
+        Test if converting with multiple processes creates the same output as converting with a single process
+        """
+        outputs = []
+
+        for jobs in [1, 3]:
+            converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                         input_folder_path="tests/mock_data/multiple/",
+                                         output_folder_path="tests/output",
+                                         jobs=jobs)
+            converter.convert()
+
+            output = {}
+            for folder, _, files in os.walk("tests/output"):
+                for file in files:
+                    with open(os.path.join(folder, file), "r", encoding="utf-8") as output_file:
+                        output[os.path.join(folder, file)] = output_file.read()
+
+            outputs.append(output)
+
+        self.assertEqual(len(outputs[0]), 7)
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_jobs_error(self):
+        """
+        Test if the failing file is named when converting with multiple processes
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/multiple_invalid/",
+                                     output_folder_path="tests/output",
+                                     jobs=2)
+
+        with self.assertRaisesRegex(InvalidOpenAPIError, "Users.json: no servers defined"):
+            converter.convert()
+
+    def test_incremental_unchanged(self):
+        """
+        Test if no OpenAPI file is converted again when nothing changed since the previous build
+        """
+        for _ in range(2):
+            converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                         input_folder_path="tests/mock_data/multiple/",
+                                         output_folder_path="tests/output",
+                                         incremental=True)
+
+            with mock.patch.object(OpenAPIToKrakenD, "convert_spec", wraps=converter.convert_spec) as convert_spec:
+                converter.convert()
+
+        # Test if the specs have been restored from the manifest
+        convert_spec.assert_not_called()
+        self.assertEqual([spec.name for spec in converter.specs], ["BETSV1", "RESULTSV2", "USERSV1"])
+
+        with open("tests/output/config/settings/service.json", "r", encoding="utf-8") as service_file:
+            service_json = json.load(service_file)
+
+        self.assertEqual(service_json["RESULTSV2"], "https://results.f1-betting.app")
+
+    def test_incremental_changed(self):
+        """
+        Test if only the changed OpenAPI file is converted again
+        Test if the template of a removed OpenAPI file is removed
+        """
+        shutil.copytree("tests/mock_data/multiple", "tests/output/input")
+
+        OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                         input_folder_path="tests/output/input",
+                         output_folder_path="tests/output",
+                         incremental=True).convert()
+
+        with open("tests/output/input/Users.json", "r", encoding="utf-8") as spec_file:
+            spec = json.load(spec_file)
+
+        spec["servers"][0]["url"] = "https://users.f1-betting.dev"
+
+        with open("tests/output/input/Users.json", "w", encoding="utf-8") as spec_file:
+            json.dump(spec, spec_file)
+
+        os.remove("tests/output/input/Bets.json")
+
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/output/input",
+                                     output_folder_path="tests/output",
+                                     incremental=True)
+
+        with mock.patch.object(OpenAPIToKrakenD, "convert_spec", wraps=converter.convert_spec) as convert_spec:
+            converter.convert()
+
+        # Test if only the changed OpenAPI file is converted again
+        convert_spec.assert_called_once_with("tests/output/input/Users.json")
+
+        with open("tests/output/config/settings/service.json", "r", encoding="utf-8") as service_file:
+            service_json = json.load(service_file)
+
+        self.assertEqual(service_json, {"RESULTSV2": "https://results.f1-betting.app",
+                                        "USERSV1": "https://users.f1-betting.dev"})
+
+        # Test if the template of a removed OpenAPI file is removed
+        self.assertFalse(os.path.exists("tests/output/config/templates/BETS.tmpl"))
+        self.assertTrue(os.path.exists("tests/output/config/templates/RESULTS.tmpl"))
+
+    def test_incremental_refs(self):
+        """
+        Test if an OpenAPI file is converted again when a file its $ref pointers refer to changed
+        """
+        shutil.copytree("tests/mock_data/refs", "tests/output/input")
+
+        OpenAPIToKrakenD(logging.ERROR, "tests/output/input", "tests/output", incremental=True).convert()
+
+        with open("tests/output/input/shared/common.json", "r", encoding="utf-8") as common_file:
+            common = json.load(common_file)
+
+        common["components"]["parameters"]["Page"]["name"] = "page_changed"
+
+        with open("tests/output/input/shared/common.json", "w", encoding="utf-8") as common_file:
+            json.dump(common, common_file)
+
+        OpenAPIToKrakenD(logging.ERROR, "tests/output/input", "tests/output", incremental=True).convert()
+
+        with open("tests/output/config/templates/OPENAPI.tmpl", "r", encoding="utf-8") as template_file:
+            self.assertIn("page_changed", template_file.read())
+
+    def test_incremental_envs_dockerfile(self):
+        """
+        Test if changing the default multi-env Dockerfile writes the Dockerfile again
+        """
+        shutil.copytree("app/config", "tests/output/default")
+        os.mkdir("tests/output/build")
+
+        with mock.patch("app.logic.config.DEFAULT_CONFIG_FOLDER_PATH", "tests/output/default"):
+            OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output/build", incremental=True,
+                             all_envs=True).convert()
+
+            with open("tests/output/default/Dockerfile.envs", "a", encoding="utf-8") as dockerfile:
+                dockerfile.write("# changed\n")
+
+            OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output/build", incremental=True,
+                             all_envs=True).convert()
+
+        with open("tests/output/build/Dockerfile", "r", encoding="utf-8") as dockerfile:
+            self.assertIn("# changed", dockerfile.read())
+
+    def test_template_value(self):
+        """
+        Test if a custom endpoint configuration containing "}}{{" is written unchanged
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/template_value/",
+                                     output_folder_path="tests/output")
+        converter.convert()
+
+        with open("tests/output/config/templates/OPENAPI.tmpl", "r", encoding="utf-8") as template_file:
+            template = template_file.read()
+
+        # Remove templating
+        config_data = re.sub(r"^({{(.*?)}})", "", template, flags=re.M).strip()
+
+        # Split objects
+        endpoints_data = re.split(r"(?<=}),\n^(?!\s)", config_data, flags=re.M)
+
+        endpoints = []
+
+        # Load JSON to array
+        for endpoint in endpoints_data:
+            endpoints.append(json.loads(endpoint))
+
+        self.assertEqual(len(endpoints), 10)
+        self.assertEqual(endpoints[0]["extra_config"]["proxy"]["static"]["data"]["template"],
+                         "{{ .Host }}{{ .Path }}")
+
+    def test_streaming(self):
+        """
+        Test if converting with the streaming parser creates the same templates as converting with the full parser
+        """
+        templates = []
+
+        for streaming in [False, True]:
+            converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                         input_folder_path="tests/mock_data/global_security_scheme/",
+                                         output_folder_path="tests/output",
+                                         streaming=streaming)
+            converter.convert()
+
+            with open("tests/output/config/templates/OPENAPI.tmpl", "r", encoding="utf-8") as template_file:
+                templates.append(template_file.read())
+
+        self.assertEqual(templates[0], templates[1])
+        self.assertEqual(converter.specs[0].data["paths"]["/users"]["get"]["responses"],
+                         {"200": {"content": {"application/json": {}}}, "404": {"content": {"application/json": {}}}})
+
+    def test_refs(self):
+        """
+        Test if referenced path items, parameters and security schemes are resolved, including references to other
+        files, and if path parameters are overridden by operation parameters
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/refs/",
+                                     output_folder_path="tests/output")
+        converter.convert()
+
+        with open("tests/output/config/templates/OPENAPI.tmpl", "r", encoding="utf-8") as template_file:
+            template = template_file.read()
+
+        # Remove templating
+        config_data = re.sub(r"^({{(.*?)}})", "", template, flags=re.M).strip()
+
+        # Split objects
+        endpoints_data = re.split(r"(?<=}),\n^(?!\s)", config_data, flags=re.M)
+
+        endpoints = []
+
+        # Load JSON to array
+        for endpoint in endpoints_data:
+            endpoints.append(json.loads(endpoint))
+
+        self.assertEqual([endpoint["method"] for endpoint in endpoints], ["GET", "DELETE", "GET", "GET"])
+        self.assertEqual(endpoints[0]["input_headers"], ["X-API-Key", "user_id", "Content-Type"])
+        self.assertEqual(endpoints[0]["input_query_strings"], ["page", "fields"])
+        self.assertEqual(endpoints[1]["input_query_strings"], ["page"])
+        self.assertEqual(endpoints[2]["input_query_strings"], ["season"])
+        self.assertEqual(endpoints[3]["input_query_strings"], ["round"])
+
+    def test_refs_streaming(self):
+        """
+        Test if references are resolved the same way when using the streaming parser
+        """
+        templates = []
+
+        for streaming in [False, True]:
+            converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                         input_folder_path="tests/mock_data/refs/",
+                                         output_folder_path="tests/output",
+                                         streaming=streaming)
+            converter.convert()
+
+            with open("tests/output/config/templates/OPENAPI.tmpl", "r", encoding="utf-8") as template_file:
+                templates.append(template_file.read())
+
+        self.assertEqual(templates[0], templates[1])
+
+    def test_refs_circular(self):
+        """
+        Test if a circular reference raises an InvalidOpenAPIError
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/refs_circular/",
+                                     output_folder_path="tests/output")
+
+        with self.assertRaises(InvalidOpenAPIError) as context_manager:
+            converter.convert()
+
+        self.assertIn("circular $ref", str(context_manager.exception))
+
+    def test_yaml(self):
+        """
+        Test if a YAML specification creates the same template as the same specification in JSON
+        """
+        templates = []
+
+        for input_folder_path in ["tests/mock_data/full/", "tests/mock_data/yaml/"]:
+            converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                         input_folder_path=input_folder_path,
+                                         output_folder_path="tests/output")
+            converter.convert()
+
+            with open("tests/output/config/templates/OPENAPI.tmpl", "r", encoding="utf-8") as template_file:
+                templates.append(template_file.read())
+
+        self.assertEqual(converter.files, ["OpenAPI.yaml"])
+        self.assertEqual(templates[0], templates[1])
+
+    def test_yaml_duplicate(self):
+        """
+        Test if a JSON and YAML specification with the same name raise an InvalidOpenAPIError
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/yaml_duplicate/",
+                                     output_folder_path="tests/output")
+
+        with self.assertRaises(InvalidOpenAPIError) as context_manager:
+            converter.convert()
+
+        self.assertEqual(str(context_manager.exception), "OpenAPI.json and OpenAPI.yml both create OPENAPI.tmpl")
+
+    def test_invalid_yaml(self):
+        """
+        Test if an invalid YAML specification raises an InvalidOpenAPIError
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/invalid_yaml/",
+                                     output_folder_path="tests/output")
+
+        with self.assertRaises(InvalidOpenAPIError) as context_manager:
+            converter.convert()
+
+        self.assertIn("OpenAPI.yaml: invalid YAML", str(context_manager.exception))
+
+    def test_route_conflict(self):
+        """
+        Test if two specs creating the same routes raise an InvalidOpenAPIError and every conflict is logged
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/route_conflict/",
+                                     output_folder_path="tests/output")
+
+        with self.assertLogs(converter.logger.get_logger(), logging.ERROR) as context_manager:
+            with self.assertRaises(InvalidOpenAPIError) as error_manager:
+                converter.convert()
+
+        self.assertEqual(len(context_manager.records), 10)
+        self.assertIn("10 conflicting routes", str(error_manager.exception))
+        self.assertIn("GET /bets/v1/users (Bets.json) duplicates GET /bets/v1/users (Bets.V1.json)",
+                      str(error_manager.exception))
+        self.assertEqual([filenames for _, _, filenames in os.walk("tests/output") if filenames], [])
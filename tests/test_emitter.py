@@ -0,0 +1,272 @@
+import io
+import json
+import logging
+import os
+import unittest
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.emitter import FileSink, ListEmitter, MemorySink, PrefixedSink, STAGING_FOLDER
+from app.utils.errors import InvalidOpenAPIError
+from tests.logic.test_setup_logic import create_output_folder, delete_output_folder
+
+
+# pylint:disable=duplicate-code
+
+class TestEmitter(unittest.TestCase):
+    """
+    Test the template emitter and the output sink
+    """
+
+    @classmethod
+    def setUp(cls):
+        """
+        Create the output folder if it doesn't exist
+        """
+        create_output_folder()
+
+    @classmethod
+    def tearDown(cls):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def test_list_emitter(self):
+        """
+        Test if the separator is only written between values
+        """
+        stream = io.StringIO()
+        emitter = ListEmitter(stream)
+
+        for value in ["{}", "{\"a\": \"}{\"}", "{}"]:
+            emitter.write(value)
+
+        self.assertEqual(stream.getvalue(), "{},\n{\"a\": \"}{\"},\n{}")
+
+    def test_file_sink(self):
+        """
+        Test if the file is written to the output folder without leaving temporary files
+        """
+        with FileSink("tests/output").open("krakend.json") as file:
+            file.write("{}")
+
+        self.assertEqual(os.listdir("tests/output"), ["krakend.json"])
+
+    def test_file_sink_error(self):
+        """
+        Test if a failed write keeps the previous file intact and does not leave temporary files
+        """
+        sink = FileSink("tests/output")
+
+        with sink.open("krakend.json") as file:
+            file.write("{}")
+
+        with self.assertRaises(RuntimeError):
+            with sink.open("krakend.json") as file:
+                file.write("{\"half\": ")
+                raise RuntimeError()
+
+        with open("tests/output/krakend.json", "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), "{}")
+
+        self.assertEqual(os.listdir("tests/output"), ["krakend.json"])
+
+    def test_file_sink_closed(self):
+        """
+        Test if a write that is never finished does not leave temporary files, with and without staging
+        """
+        sink = FileSink("tests/output")
+
+        for staging in [False, True]:
+            if staging:
+                sink.begin()
+
+            writer = sink.open("krakend.json")
+            # Leave the context without exiting it, like a generator that is closed while writing
+            writer.__enter__().write("{\"half\": ")
+            writer.gen.close()  # pylint: disable=no-member
+
+            self.assertFalse(sink.exists("krakend.json"))
+
+        sink.discard()
+
+        self.assertEqual(os.listdir("tests/output"), [])
+
+    def test_file_sink_unchanged(self):
+        """
+        Test if a file with unchanged content is not replaced and keeps its modification time
+        """
+        sink = FileSink("tests/output")
+
+        with sink.open("krakend.json") as file:
+            file.write("{}")
+
+        os.utime("tests/output/krakend.json", ns=(0, 0))
+
+        with sink.open("krakend.json") as file:
+            file.write("{}")
+
+        self.assertEqual(os.stat("tests/output/krakend.json").st_mtime_ns, 0)
+
+        with sink.open("krakend.json") as file:
+            file.write("[]")
+
+        self.assertNotEqual(os.stat("tests/output/krakend.json").st_mtime_ns, 0)
+        self.assertEqual(os.listdir("tests/output"), ["krakend.json"])
+
+    def test_file_sink_staging(self):
+        """
+        Test if staged files are only written to the output folder when published
+        Test if only the changed files are published, and unchanged files keep their modification time
+        Test if removed files are removed when published
+        """
+        sink = FileSink("tests/output")
+
+        for path in ["Dockerfile", "old.tmpl"]:
+            with sink.open(path) as file:
+                file.write("FROM krakend")
+            os.utime(f"tests/output/{path}", ns=(0, 0))
+
+        sink.begin()
+        sink.create_folder("config")
+
+        with sink.open("config/krakend.json") as file:
+            file.write("{}")
+
+        sink.copy("tests/output/Dockerfile", "Dockerfile")
+        sink.remove("old.tmpl")
+
+        self.assertFalse(os.path.exists("tests/output/config/krakend.json"))
+        self.assertTrue(sink.exists("config/krakend.json"))
+        self.assertFalse(sink.exists("old.tmpl"))
+        self.assertTrue(os.path.exists("tests/output/old.tmpl"))
+
+        self.assertEqual(sink.publish(), ["config/krakend.json"])
+
+        self.assertEqual(sorted(os.listdir("tests/output")), ["Dockerfile", "config"])
+        self.assertEqual(os.stat("tests/output/Dockerfile").st_mtime_ns, 0)
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as file:
+            self.assertEqual(json.load(file), {})
+
+    def test_file_sink_discard(self):
+        """
+        Test if discarding the staged files keeps the previous output intact
+        """
+        sink = FileSink("tests/output")
+
+        with sink.open("krakend.json") as file:
+            file.write("{}")
+
+        sink.begin()
+
+        with sink.open("krakend.json") as file:
+            file.write("[]")
+
+        with self.assertRaises(RuntimeError):
+            with sink.open("Dockerfile") as file:
+                file.write("FROM")
+                raise RuntimeError()
+
+        sink.discard()
+
+        with open("tests/output/krakend.json", "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), "{}")
+
+        self.assertEqual(os.listdir("tests/output"), ["krakend.json"])
+        self.assertNotIn(STAGING_FOLDER, os.listdir("tests/output"))
+
+    def test_prefixed_sink(self):
+        """
+        Test if the files are staged inside the folder of the prefixed sink and published by the other sink
+        """
+        sink = FileSink("tests/output")
+        sink.begin()
+
+        shard = PrefixedSink(sink, "shard-1")
+        shard.create_folder("config")
+
+        with shard.open("config/krakend.json") as file:
+            file.write("{}")
+
+        self.assertTrue(shard.exists("config/krakend.json"))
+        self.assertFalse(os.path.exists("tests/output/shard-1/config/krakend.json"))
+
+        self.assertEqual(sink.publish(), ["shard-1/config/krakend.json"])
+
+        with open("tests/output/shard-1/config/krakend.json", "r", encoding="utf-8") as file:
+            self.assertEqual(file.read(), "{}")
+
+    def test_sink_folders(self):
+        """
+        Test if the folders inside a folder are listed, and removed folders are removed with their files
+        """
+        sink = FileSink("tests/output")
+
+        for path in ["config/settings/prod/service.json", "config/settings/dev/service.json"]:
+            os.makedirs(os.path.dirname(f"tests/output/{path}"), exist_ok=True)
+
+            with sink.open(path) as file:
+                file.write("{}")
+
+        sink.begin()
+        sink.remove("config/settings/dev")
+
+        self.assertEqual(sink.list_folders("config/settings"), ["prod"])
+        self.assertFalse(sink.exists("config/settings/dev/service.json"))
+        self.assertTrue(os.path.exists("tests/output/config/settings/dev/service.json"))
+
+        sink.publish()
+
+        self.assertEqual(os.listdir("tests/output/config/settings"), ["prod"])
+        self.assertEqual(sink.list_folders(""), ["config"])
+
+        memory = MemorySink()
+        memory.files = {"shard-1/config/krakend.json": "{}", "shard-2/Dockerfile": "FROM", "routing.json": "{}"}
+        memory.remove("shard-2")
+
+        self.assertEqual(memory.list_folders(""), ["shard-1"])
+        self.assertEqual(PrefixedSink(memory, "shard-1").list_folders(""), ["config"])
+        self.assertEqual(list(memory.files), ["shard-1/config/krakend.json", "routing.json"])
+
+    def test_unchanged_files(self):
+        """
+        Test if converting again without changes does not replace any file, so they keep their modification time
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/multiple/",
+                                     output_folder_path="tests/output")
+        converter.convert()
+
+        paths = [os.path.join(folder, filename)
+                 for folder, _, filenames in os.walk("tests/output") for filename in filenames]
+        for path in paths:
+            os.utime(path, ns=(0, 0))
+
+        converter.convert()
+
+        self.assertEqual([os.stat(path).st_mtime_ns for path in paths], [0] * len(paths))
+        self.assertEqual(len(paths), 7)
+
+    def test_failed_conversion(self):
+        """
+        Test if a failed conversion keeps the complete previous output intact and does not leave staged files
+        """
+        OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                         input_folder_path="tests/mock_data/multiple/",
+                         output_folder_path="tests/output").convert()
+
+        with open("tests/output/config/templates/BETS.tmpl", "r", encoding="utf-8") as template_file:
+            template = template_file.read()
+
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/multiple_invalid/",
+                                     output_folder_path="tests/output")
+
+        with self.assertRaises(InvalidOpenAPIError):
+            converter.convert()
+
+        with open("tests/output/config/templates/BETS.tmpl", "r", encoding="utf-8") as template_file:
+            self.assertEqual(template_file.read(), template)
+
+        self.assertEqual(sorted(os.listdir("tests/output")), ["Dockerfile", "config"])
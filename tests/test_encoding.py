@@ -0,0 +1,126 @@
+import json
+import logging
+import unittest
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.encoding import is_json, select_encoding
+from app.logic.spec import OpenAPISpec
+from tests.logic.test_setup_logic import create_output_folder, delete_output_folder
+
+
+# pylint:disable=duplicate-code
+
+class TestEncoding(unittest.TestCase):
+    """
+    Test selecting the encoding of the endpoints
+    """
+
+    @classmethod
+    def setUp(cls):
+        """
+        Create the output folder if it doesn't exist
+        """
+        create_output_folder()
+
+    @classmethod
+    def tearDown(cls):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def test_is_json(self):
+        """
+        Test if JSON media types are recognized, including parameters and structured syntax suffixes
+        """
+        for media_type in ["application/json", "Application/JSON; charset=utf-8", "application/problem+json",
+                           "application/vnd.api+json"]:
+            self.assertTrue(is_json(media_type), media_type)
+
+        for media_type in ["application/octet-stream", "text/event-stream", "image/png", "application/jsonl",
+                           "application/x-ndjson", "text/json+html"]:
+            self.assertFalse(is_json(media_type), media_type)
+
+    def test_select_encoding(self):
+        """
+        Test if only manipulated JSON responses are decoded
+        """
+        spec = OpenAPISpec("Media.json", {"components": {"responses": {"Photo": {"content": {"image/png": {}}}}}})
+        json_operation = {"responses": {"200": {"content": {"application/json": {}}},
+                                        "404": {"content": {"text/html": {}}}}}
+        endpoint = {"backend": [{"encoding": "json"}]}
+        manipulated = {"backend": [{"allow": ["id"]}]}
+
+        self.assertEqual(select_encoding(spec, json_operation, None, endpoint), ("no-op", "no response manipulation"))
+        self.assertEqual(select_encoding(spec, json_operation, None, manipulated), ("json", "response manipulation"))
+        self.assertEqual(select_encoding(spec, json_operation, None, {"extra_config": {"proxy": {}}, "backend": [{}]}),
+                         ("json", "response manipulation"))
+        self.assertEqual(select_encoding(spec, {"responses": {"200": {"$ref": "#/components/responses/Photo"}}}, None,
+                                         manipulated),
+                         ("no-op", "image/png response"))
+        self.assertEqual(select_encoding(spec, {**json_operation, "requestBody": {"content": {"text/csv": {}}}}, None,
+                                         manipulated),
+                         ("json", "response manipulation"))
+        self.assertEqual(select_encoding(spec, {**json_operation, "requestBody": {"content": {"text/csv": {}}}}, None,
+                                         endpoint),
+                         ("no-op", "text/csv request"))
+        self.assertEqual(select_encoding(spec, {"responses": {"204": {"description": "Deleted"}}}, None, manipulated),
+                         ("no-op", "no response body"))
+
+    def test_auto_encoding(self):
+        """
+        Test if only the manipulated JSON responses are decoded, also when backend.json uses the json encoding
+        Test if the encoding of backend.json is kept when the encoding is not selected automatically
+        """
+        converter = OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/encoding/", "tests/output", flat=True,
+                                     auto_encoding=True).convert()
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            encodings = {f"{endpoint['method']} {endpoint['endpoint']}":
+                             (endpoint["output_encoding"], endpoint["backend"][0]["encoding"])
+                         for endpoint in json.load(config_file)["endpoints"]}
+
+        self.assertEqual(encodings, {"GET /media/v1/drivers": ("json", "json"),
+                                     "GET /media/v1/drivers/{driver_id}": ("json", "json"),
+                                     "DELETE /media/v1/drivers/{driver_id}": ("no-op", "no-op"),
+                                     "GET /media/v1/drivers/{driver_id}/photo": ("no-op", "no-op"),
+                                     "PUT /media/v1/drivers/{driver_id}/photo": ("json", "json"),
+                                     "GET /media/v1/live": ("no-op", "no-op")})
+        self.assertEqual(converter.specs[0].encodings[3],
+                         ["GET", "/drivers/{driver_id}/photo", "no-op", "image/png response"])
+
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/encoding/", "tests/output", flat=True).convert()
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            endpoints = json.load(config_file)["endpoints"]
+
+        self.assertTrue(all(endpoint["backend"][0]["encoding"] == "json" for endpoint in endpoints))
+
+    def test_auto_encoding_warning(self):
+        """
+        Test if a warning is logged when the response manipulation of an endpoint is ignored, because its response is
+        not JSON
+        """
+        with self.assertLogs(level=logging.WARNING) as logs:
+            OpenAPIToKrakenD(logging.WARNING, "tests/mock_data/encoding/", "tests/output", flat=True,
+                             auto_encoding=True).convert()
+
+        warnings = [record.getMessage() for record in logs.records if "response manipulation" in record.getMessage()]
+
+        self.assertIn("Ignoring the response manipulation of GET /drivers/{driver_id}/photo (image/png response)",
+                      warnings)
+        self.assertFalse(any("DELETE" in warning for warning in warnings))
+
+    def test_incremental_auto_encoding(self):
+        """
+        Test if the encodings of unchanged specs are kept in incremental builds
+        """
+        converter = OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/encoding/", "tests/output", incremental=True,
+                                     auto_encoding=True).convert()
+        encodings = converter.specs[0].encodings
+
+        converter = OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/encoding/", "tests/output", incremental=True,
+                                     auto_encoding=True).convert()
+
+        self.assertTrue(encodings)
+        self.assertEqual(converter.specs[0].encodings, encodings)
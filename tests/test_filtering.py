@@ -0,0 +1,129 @@
+import json
+import logging
+import unittest
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.filtering import SchemaFlattener, get_allow_list, merge_fields
+from app.logic.spec import OpenAPISpec
+from tests.logic.test_setup_logic import create_output_folder, delete_output_folder
+
+
+# pylint:disable=duplicate-code
+
+class TestFiltering(unittest.TestCase):
+    """
+    Test generating allow lists from response schemas
+    """
+
+    def setUp(self):
+        """
+        Create the output folder and a spec with shared response models
+        """
+        create_output_folder()
+
+        self.spec = OpenAPISpec("Drivers.json", {"components": {"schemas": {
+            "Driver": {"type": "object", "properties": {"id": {"type": "string"},
+                                                        "team": {"$ref": "#/components/schemas/Team"},
+                                                        "results": {"type": "array", "items": {"type": "integer"}}}},
+            "Team": {"type": "object", "properties": {"name": {"type": "string"},
+                                                      "parent": {"$ref": "#/components/schemas/Team"}}},
+            "Standings": {"type": "object", "additionalProperties": {"type": "integer"}}
+        }}})
+        self.flattener = SchemaFlattener(self.spec.resolver)
+
+    def tearDown(self):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def test_flatten(self):
+        """
+        Test if nested objects use dot notation, and arrays and recursive models are allowed as a whole
+        """
+        self.assertEqual(self.flattener.flatten({"$ref": "#/components/schemas/Driver"}),
+                         ["id", "team.name", "team.parent", "results"])
+        self.assertEqual(self.flattener.flatten({"$ref": "#/components/schemas/Team"}), ["name", "parent"])
+
+    def test_unrestricted(self):
+        """
+        Test if schemas that do not restrict their fields are not flattened
+        """
+        for schema in [None, {}, {"type": "object"}, {"type": "array", "items": {"type": "object"}},
+                       {"$ref": "#/components/schemas/Standings"},
+                       {"allOf": [{"$ref": "#/components/schemas/Team"}, {"type": "object"}]}]:
+            self.assertIsNone(self.flattener.flatten(schema), schema)
+
+    def test_combined(self):
+        """
+        Test if the fields of allOf, oneOf and anyOf are merged, leaving out null variants
+        """
+        schema = {"allOf": [{"$ref": "#/components/schemas/Team"},
+                            {"properties": {"founded": {"type": "integer"}}}],
+                  "properties": {"driver": {"oneOf": [{"$ref": "#/components/schemas/Driver"}, {"type": "null"}]}}}
+
+        self.assertEqual(self.flattener.flatten(schema),
+                         ["driver.id", "driver.team.name", "driver.team.parent", "driver.results", "name", "parent",
+                          "founded"])
+
+    def test_memoized(self):
+        """
+        Test if every referenced schema is only flattened once
+        """
+        fields = self.flattener.flatten({"$ref": "#/components/schemas/Driver"})
+
+        self.assertIs(self.flattener.flatten({"$ref": "#/components/schemas/Driver"}), fields)
+
+    def test_merge_fields(self):
+        """
+        Test if fields allowed as a whole replace their nested fields
+        """
+        self.assertEqual(merge_fields([["id", "team.name"], ["team", "id", "season.year"]]),
+                         ["id", "team", "season.year"])
+
+    def test_get_allow_list(self):
+        """
+        Test if the fields of every successful JSON response are allowed, and other responses are not filtered
+        """
+        driver = {"schema": {"$ref": "#/components/schemas/Driver"}}
+        team = {"schema": {"$ref": "#/components/schemas/Team"}}
+
+        self.assertEqual(get_allow_list(self.spec, {"responses": {"200": {"content": {"application/json": driver}},
+                                                                  "201": {"content": {"application/json": team}},
+                                                                  "404": {"content": {"text/html": {}}}}},
+                                        None, self.flattener),
+                         ["id", "team.name", "team.parent", "results", "name", "parent"])
+
+        for responses in [{"200": {"content": {"application/json": driver, "text/csv": {}}}},
+                          {"200": {"content": {"application/json": {}}}},
+                          {"204": {"description": "No Content"}}]:
+            self.assertIsNone(get_allow_list(self.spec, {"responses": responses}, None, self.flattener), responses)
+
+    def test_allow_lists(self):
+        """
+        Test if the backends only allow the fields of the successful response schemas, decoding the filtered responses
+        Test if responses returning arrays or free-form objects are not filtered
+        """
+        for streaming in [False, True]:
+            OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/allow_lists/", "tests/output", flat=True,
+                             streaming=streaming, allow_lists=True).convert()
+
+            with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+                endpoints = {f"{endpoint['method']} {endpoint['endpoint']}": endpoint
+                             for endpoint in json.load(config_file)["endpoints"]}
+
+            driver = ["id", "name", "team.id", "team.name", "team.parent", "results", "metadata"]
+
+            self.assertEqual(endpoints["GET /drivers/v1/drivers/{driver_id}"]["backend"][0]["allow"], driver)
+            self.assertEqual(endpoints["POST /drivers/v1/drivers"]["backend"][0]["allow"], driver)
+            self.assertEqual(endpoints["GET /drivers/v1/drivers/{driver_id}/profile"]["backend"][0]["allow"],
+                             driver + ["biography", "helmet.color", "helmet.design"])
+            self.assertEqual(endpoints["GET /drivers/v1/teams/{team_id}"]["backend"][0]["allow"],
+                             ["id", "name", "parent"])
+            self.assertEqual(endpoints["GET /drivers/v1/teams/{team_id}"]["output_encoding"], "json")
+            self.assertEqual(endpoints["GET /drivers/v1/teams/{team_id}"]["backend"][0]["encoding"], "json")
+
+            for name in ["GET /drivers/v1/drivers", "DELETE /drivers/v1/drivers/{driver_id}",
+                         "GET /drivers/v1/standings"]:
+                self.assertNotIn("allow", endpoints[name]["backend"][0], name)
+                self.assertEqual(endpoints[name]["backend"][0]["encoding"], "no-op", name)
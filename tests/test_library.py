@@ -0,0 +1,248 @@
+import copy
+import json
+import logging
+import os
+import unittest
+from unittest import mock
+
+from app.logic.cache import ResultCache
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.emitter import MemorySink
+from app.logic.library import convert_specs, convert_specs_to_sink
+from app.utils.errors import InvalidOpenAPIError, OpenAPIFileNotFoundError
+from tests.logic.test_setup_logic import delete_output_folder, create_output_folder
+
+
+# pylint:disable=duplicate-code
+
+def load_specs(folder_path: str) -> dict:
+    """
+    Load the OpenAPI specifications of a mock data folder by filename
+    """
+    specs = {}
+
+    for filename in sorted(os.listdir(folder_path)):
+        if filename.endswith(".json"):
+            with open(os.path.join(folder_path, filename), "r", encoding="utf-8") as spec_file:
+                specs[filename] = json.load(spec_file)
+
+    return specs
+
+
+def load_config(folder_path: str) -> dict:
+    """
+    Load the custom configuration of a mock data folder by filename
+    """
+    config = {}
+
+    for filename in os.listdir(os.path.join(folder_path, "config")):
+        with open(os.path.join(folder_path, "config", filename), "r", encoding="utf-8") as config_file:
+            config[filename] = config_file.read() if filename == "Dockerfile" else json.load(config_file)
+
+    return config
+
+
+class TestLibrary(unittest.TestCase):
+    """
+    Test converting OpenAPI specifications in memory
+    """
+
+    @classmethod
+    def setUp(cls):
+        """
+        Create the output folder if it doesn't exist
+        """
+        create_output_folder()
+
+    @classmethod
+    def tearDown(cls):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def assert_same_as_folder(self, folder_path: str, files: dict, **options):
+        """
+        Assert that the files generated in memory are the same as the files generated into the output folder
+        """
+        OpenAPIToKrakenD(logging.ERROR, folder_path, "tests/output", **options).convert()
+
+        for path, content in files.items():
+            with open(os.path.join("tests/output", path), "r", encoding="utf-8", newline="") as output_file:
+                self.assertEqual(content, output_file.read(), path)
+
+        written = {os.path.relpath(os.path.join(folder, filename), "tests/output").replace(os.sep, "/")
+                   for folder, _, filenames in os.walk("tests/output") for filename in filenames}
+        self.assertEqual(set(files), written)
+
+    def test_convert_specs(self):
+        """
+        Test if the files generated in memory are the same as the files generated into an output folder
+        """
+        files = convert_specs(load_specs("tests/mock_data/multiple"))
+
+        self.assertIn("config/templates/Endpoints.tmpl", files)
+        self.assertIn("Dockerfile", files)
+        self.assert_same_as_folder("tests/mock_data/multiple", files)
+
+    def test_custom_config(self):
+        """
+        Test if custom configuration given in memory is the same as a custom configuration folder
+        """
+        files = convert_specs(load_specs("tests/mock_data/full"), load_config("tests/mock_data/full"))
+
+        self.assert_same_as_folder("tests/mock_data/full", files)
+
+    def test_custom_dockerfile(self):
+        """
+        Test if a custom Dockerfile given in memory is written
+        """
+        files = convert_specs(load_specs("tests/mock_data/full"), {"Dockerfile": "FROM devopsfaith/krakend:2.2\n"})
+
+        self.assertEqual(files["Dockerfile"], "FROM devopsfaith/krakend:2.2\n")
+
+    def test_env(self):
+        """
+        Test if the environment picks the matching server
+        """
+        files = convert_specs(load_specs("tests/mock_data/environment"), env="dev")
+
+        self.assert_same_as_folder("tests/mock_data/environment", files, env="dev")
+
+    def test_no_filesystem_writes(self):
+        """
+        Test if converting in memory does not create any files or folders
+        """
+        specs = load_specs("tests/mock_data/multiple")
+
+        with mock.patch("os.mkdir") as mkdir, mock.patch("os.replace") as replace:
+            convert_specs(specs)
+
+        mkdir.assert_not_called()
+        replace.assert_not_called()
+        self.assertEqual(os.listdir("tests/output"), [])
+
+    def test_specs_not_modified(self):
+        """
+        Test if the given specifications are not modified
+        """
+        specs = load_specs("tests/mock_data/full")
+        original = copy.deepcopy(specs)
+
+        convert_specs(specs)
+
+        self.assertEqual(specs, original)
+
+    def test_sink(self):
+        """
+        Test if the generated files are written to the given sink
+        """
+        sink = MemorySink()
+
+        convert_specs_to_sink(load_specs("tests/mock_data/multiple"), sink)
+
+        self.assertEqual(sink.files, convert_specs(load_specs("tests/mock_data/multiple")))
+
+    def test_invalid_spec(self):
+        """
+        Test if an invalid specification raises an InvalidOpenAPIError prefixed with its filename
+        """
+        with self.assertRaisesRegex(InvalidOpenAPIError, "^Users.json: no servers defined$"):
+            convert_specs({"Users.json": {"info": {"version": "1.0.0"}, "paths": {}}})
+
+    def test_no_specs(self):
+        """
+        Test if converting no specifications raises an OpenAPIFileNotFoundError
+        """
+        with self.assertRaises(OpenAPIFileNotFoundError):
+            convert_specs({})
+
+    def test_unknown_config(self):
+        """
+        Test if unknown or wrongly typed configuration files raise a ValueError
+        """
+        specs = load_specs("tests/mock_data/full")
+
+        with self.assertRaises(ValueError):
+            convert_specs(specs, {"service.json": {}})
+
+        with self.assertRaises(ValueError):
+            convert_specs(specs, {"Dockerfile": {}})
+
+    def test_flat(self):
+        """
+        Test if a flat configuration generated in memory is the same as one generated into an output folder
+        """
+        files = convert_specs(load_specs("tests/mock_data/multiple"), flat=True, compact=True)
+
+        self.assertEqual(set(files), {"config/krakend.json", "Dockerfile"})
+        self.assert_same_as_folder("tests/mock_data/multiple", files, flat=True, compact=True)
+
+    def test_validate(self):
+        """
+        Test if validating in memory reports the errors of every specification at once
+        """
+        specs = load_specs("tests/mock_data/multiple")
+        del specs["Bets.json"]["info"]["title"]
+        specs["Results.json"] = {"openapi": "3.0.2", "info": {"title": "Results", "version": "1.0.0"}, "paths": {}}
+
+        with self.assertRaises(InvalidOpenAPIError) as error_manager:
+            convert_specs(specs, validate=True)
+
+        self.assertEqual(str(error_manager.exception).splitlines(), [
+            "3 validation errors in 3 specs:",
+            "Bets.json: /info: missing required field 'title'",
+            "Results.json: no servers defined",
+            "Users.json: /paths/~1users~1{user_id}/get: path parameter 'user_id' is not defined"
+        ])
+
+    def test_cache(self):
+        """
+        Test if specifications converted before are reused, and generate the same files
+        """
+        cache = ResultCache()
+        specs = load_specs("tests/mock_data/multiple")
+
+        files = convert_specs(specs, cache=cache)
+
+        with mock.patch.object(OpenAPIToKrakenD, "_OpenAPIToKrakenD__write_spec") as write_spec:
+            self.assertEqual(convert_specs(specs, cache=cache), files)
+
+        write_spec.assert_not_called()
+        self.assertEqual(cache.hits, 3)
+
+        self.assertEqual(convert_specs(specs, {"backend.json": {"encoding": "json"}}, cache=cache),
+                         convert_specs(specs, {"backend.json": {"encoding": "json"}}))
+        self.assertEqual(cache.hits, 3)
+
+    def test_shards(self):
+        """
+        Test if every shard is written to a folder of its own, also when reusing cached specifications
+        """
+        cache = ResultCache()
+        specs = load_specs("tests/mock_data/multiple")
+
+        files = convert_specs(specs, shards=2, cache=cache)
+
+        self.assertIn("routing.json", files)
+        self.assertIn("shard-2/config/templates/RESULTS.tmpl", files)
+        self.assertNotIn("config/krakend.json", files)
+
+        self.assertEqual(convert_specs(specs, shards=2, cache=cache), files)
+        self.assertEqual(convert_specs(specs, shards=2), files)
+        self.assertEqual(cache.hits, 3)
+
+    def test_allow_lists(self):
+        """
+        Test if the filtering of backend.json is kept instead of generating allow lists
+        """
+        specs = load_specs("tests/mock_data/allow_lists")
+
+        files = convert_specs(specs, flat=True, allow_lists=True)
+        self.assertIn("team.name", files["config/krakend.json"])
+
+        files = convert_specs(specs, {"backend.json": {"deny": ["metadata"]}}, flat=True, allow_lists=True)
+
+        for endpoint in json.loads(files["config/krakend.json"])["endpoints"]:
+            self.assertEqual(endpoint["backend"][0]["deny"], ["metadata"])
+            self.assertNotIn("allow", endpoint["backend"][0])
@@ -0,0 +1,90 @@
+import io
+import unittest
+
+import yaml
+
+from app.logic.loader import YAMLLoader, load_document, load_yaml
+from app.logic.streaming import OPENAPI_SELECTION
+from app.utils.errors import InvalidOpenAPIError
+
+
+# pylint:disable=duplicate-code
+
+class TestLoader(unittest.TestCase):
+    """
+    Test the JSON and YAML document loader
+    """
+
+    def test_yaml_scalars(self):
+        """
+        Test if scalars are resolved to the same types as the regular YAML loader
+        """
+        document = ("a: yes\nb: No\nc: ~\nd:\ne: 1e3\nf: 0x1F\ng: .inf\nh: 2021-01-01\ni: 1:20\nj: '1'\n"
+                    "k: !!str 12\nl: -1\nm: [1, two, 3.0]\n200: OK\n")
+
+        self.assertEqual(load_yaml(io.StringIO(document)), yaml.load(document, Loader=YAMLLoader))
+
+    def test_yaml_spec(self):
+        """
+        Test if a YAML spec is loaded the same as with the regular YAML loader
+        """
+        with open("tests/mock_data/yaml/OpenAPI.yaml", "r", encoding="utf-8") as spec_file:
+            document = spec_file.read()
+
+        self.assertEqual(load_yaml(io.StringIO(document)), yaml.load(document, Loader=YAMLLoader))
+
+    def test_yaml_selection(self):
+        """
+        Test if only the selected parts of a YAML document are loaded
+        """
+        document = ("openapi: 3.0.2\nx-unused: {a: 1}\npaths:\n  /users:\n    get:\n"
+                    "      parameters: [{name: page, in: query}]\n      responses: {'200': {description: OK}}\n")
+
+        self.assertEqual(load_yaml(io.StringIO(document), OPENAPI_SELECTION),
+                         {"openapi": "3.0.2", "paths": {"/users": {"get": {"parameters": [{"name": "page",
+                                                                                            "in": "query"}],
+                                                                           "responses": {"200": {}}}}}})
+
+    def test_yaml_anchors(self):
+        """
+        Test if aliases are resolved, and if documents using merge keys or aliases to skipped values fall back to the
+        regular YAML loader
+        """
+        documents = [
+            "base: &base {a: 1}\ncopy: *base\n",
+            "base: &base {a: 1}\nmerged:\n  <<: *base\n  b: 2\n",
+            "paths: {}\nx-base: &base {a: 1}\ninfo: *base\n",
+            "set: !!set {a, b}\n"
+        ]
+
+        for document in documents:
+            self.assertEqual(load_yaml(io.StringIO(document), OPENAPI_SELECTION if "paths" in document else True),
+                             {key: value for key, value in yaml.load(document, Loader=YAMLLoader).items()
+                              if key != "x-base"})
+
+    def test_invalid_documents(self):
+        """
+        Test if invalid JSON and YAML documents raise an InvalidOpenAPIError
+        """
+        for document, path in [("a: [", "spec.yaml"), ("a: 1\n---\nb: 2\n", "spec.yml"), ("{", "spec.json")]:
+            with self.assertRaises(InvalidOpenAPIError):
+                load_document(io.StringIO(document), path)
+
+    def test_empty_yaml(self):
+        """
+        Test if an empty YAML document is parsed as None, but raises an InvalidOpenAPIError when loaded as a document
+        """
+        self.assertIsNone(load_yaml(io.StringIO("")))
+
+        with self.assertRaisesRegex(InvalidOpenAPIError, "empty document"):
+            load_document(io.StringIO(""), "spec.yaml")
+
+    def test_not_an_object(self):
+        """
+        Test if documents that are not an object raise an InvalidOpenAPIError
+        """
+        for document, path in [("- a\n- b\n", "spec.yaml"), ("openapi", "spec.yml"), ("[]", "spec.json"),
+                               ("1", "spec.json")]:
+            for selection in [True, OPENAPI_SELECTION]:
+                with self.assertRaisesRegex(InvalidOpenAPIError, "expected an object"):
+                    load_document(io.StringIO(document), path, selection)
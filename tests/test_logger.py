@@ -1,7 +1,9 @@
+import json
 import logging
 import unittest
+from unittest import mock
 
-from app.utils.customlogger import CustomLogger
+from app.utils.customlogger import CustomLogger, configure_logging
 
 
 # pylint:disable=duplicate-code
@@ -72,3 +74,66 @@ class TestLogger(unittest.TestCase):
 
         with self.assertLogs(logger.get_logger(), logging.DEBUG):
             logger.debug("testing logging_mode debug")
+
+    def test_single_handler(self):
+        """
+        Test if creating multiple loggers does not add duplicate handlers
+        Test if loggers of different levels don't change each other's level
+        """
+        first = CustomLogger(logging.INFO)
+        second = CustomLogger(logging.INFO)
+        third = CustomLogger(logging.ERROR)
+
+        self.assertIs(first.get_logger(), second.get_logger())
+        self.assertIs(first.stream_handler, third.stream_handler)
+        self.assertEqual(logging.getLogger("app.utils.customlogger").handlers.count(first.stream_handler), 1)
+        self.assertEqual(first.get_logger().handlers, [])
+
+        self.assertEqual(first.get_logger().level, logging.INFO)
+        self.assertEqual(third.get_logger().level, logging.ERROR)
+
+    def test_lazy_arguments(self):
+        """
+        Test if `%` arguments are formatted into the message
+        Test if the arguments of a disabled level are not formatted
+        """
+        logger = CustomLogger(logging.INFO)
+
+        with self.assertLogs(logger.get_logger(), logging.INFO) as context_manager:
+            logger.info("Converted %s in %.1fs", "Bets.json", 0.25)
+
+        self.assertEqual(context_manager.records[0].getMessage(), "Converted Bets.json in 0.2s")
+
+        with mock.patch.object(logging.LogRecord, "getMessage") as get_message:
+            logger.debug("Not formatted %s", "Bets.json")
+
+        get_message.assert_not_called()
+
+    def test_json_format(self):
+        """
+        Test if the JSON format writes a JSON object including the extra fields
+        Test if creating a logger does not change the format
+        """
+        configure_logging("json")
+
+        try:
+            logger = CustomLogger(logging.INFO)
+
+            record = logging.makeLogRecord({"msg": "Converted %s", "args": ("Bets.json",), "levelname": "INFO",
+                                            "spec": "Bets.json", "endpoints": 10})
+            entry = json.loads(logger.stream_handler.format(record))
+
+            self.assertEqual(entry["message"], "Converted Bets.json")
+            self.assertEqual(entry["level"], "INFO")
+            self.assertEqual(entry["spec"], "Bets.json")
+            self.assertEqual(entry["endpoints"], 10)
+            self.assertIn("time", entry)
+        finally:
+            configure_logging()
+
+    def test_unknown_format(self):
+        """
+        Test if an unknown log format raises a ValueError
+        """
+        with self.assertRaises(ValueError):
+            configure_logging("xml")
@@ -0,0 +1,81 @@
+import logging
+import os
+import unittest
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.options import ConverterOptions
+
+
+# pylint:disable=duplicate-code
+
+class TestOptions(unittest.TestCase):
+    """
+    Test the options of a conversion
+    """
+
+    def test_envs(self):
+        """
+        Test if a list of environments is moved to the environments written to a settings folder of their own
+        """
+        options = ConverterOptions(env=["prod", "dev"])
+
+        self.assertIsNone(options.env)
+        self.assertEqual(options.envs, ["prod", "dev"])
+        self.assertTrue(options.multiple_envs)
+        self.assertFalse(ConverterOptions(env="prod").multiple_envs)
+        self.assertTrue(ConverterOptions(all_envs=True).multiple_envs)
+
+    def test_jobs(self):
+        """
+        Test if zero jobs uses every CPU core
+        """
+        self.assertEqual(ConverterOptions(jobs=0).jobs, os.cpu_count())
+        self.assertEqual(ConverterOptions(jobs=2).jobs, 2)
+
+    def test_invalid_envs(self):
+        """
+        Test if invalid combinations of environments, or an unknown log format, raise a ValueError
+        """
+        invalid = [{"env": ["prod", "prod"]}, {"env": []}, {"env": ["../prod"]}, {"env": ["prod"], "flat": True},
+                   {"all_envs": True, "flat": True}, {"all_envs": True, "env": "prod"}, {"log_format": "xml"}]
+
+        for options in invalid:
+            with self.assertRaises(ValueError, msg=options):
+                ConverterOptions(**options)
+
+    def test_invalid_shards(self):
+        """
+        Test if invalid shard options raise a ValueError
+        """
+        invalid = [{"shards": 0}, {"shards": 2, "shard_by": "size"}, {"shards": 2, "shard_groups": {"a": ["*"]}},
+                   {"shard_groups": {"../a": ["*"]}}, {"shard_groups": {"routing.json": ["*"]}}]
+
+        for options in invalid:
+            with self.assertRaises(ValueError, msg=options):
+                ConverterOptions(**options)
+
+        self.assertTrue(ConverterOptions(shards=2).sharded)
+        self.assertFalse(ConverterOptions().sharded)
+
+    def test_converter_overrides(self):
+        """
+        Test if the options given to the converter by name override the given options, and are verified together
+        """
+        converter = OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output",
+                                     options=ConverterOptions(flat=True), compact=True)
+
+        self.assertTrue(converter.options.flat)
+        self.assertTrue(converter.options.compact)
+
+        with self.assertRaises(ValueError):
+            OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output",
+                             options=ConverterOptions(flat=True), env=["prod", "dev"])
+
+    def test_converter_positional(self):
+        """
+        Test if versioning and the environment can still be given to the converter by position
+        """
+        converter = OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output", True, "dev")
+
+        self.assertFalse(converter.options.versioning)
+        self.assertEqual(converter.options.env, "dev")
@@ -0,0 +1,131 @@
+import json
+import logging
+import unittest
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.profiler import PROFILE_VERSION, Profiler
+from tests.logic.test_setup_logic import delete_output_folder, create_output_folder
+
+
+# pylint:disable=duplicate-code
+
+class TestProfiler(unittest.TestCase):
+    """
+    Test the conversion profiler
+    """
+
+    @classmethod
+    def setUp(cls):
+        """
+        Create the output folder if it doesn't exist
+        """
+        create_output_folder()
+
+    @classmethod
+    def tearDown(cls):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def test_phases(self):
+        """
+        Test if phases and spec phases are measured, and if the peak memory of a phase includes nested phases
+        """
+        profiler = Profiler(enabled=True)
+        profiler.start()
+
+        with profiler.phase("specs"):
+            for _ in range(2):
+                with profiler.phase("load", "OpenAPI.json"):
+                    data = bytearray(1024 * 1024)
+                    del data
+
+        profiler.stop()
+
+        self.assertEqual(profiler.phases["specs"]["calls"], 1)
+        self.assertEqual(profiler.specs["OpenAPI.json"]["phases"]["load"]["calls"], 2)
+        self.assertGreaterEqual(profiler.specs["OpenAPI.json"]["phases"]["load"]["peak_memory"], 1024 * 1024)
+        self.assertGreaterEqual(profiler.phases["specs"]["peak_memory"], 1024 * 1024)
+        self.assertGreaterEqual(profiler.total["wall"], profiler.phases["specs"]["wall"])
+
+    def test_counts(self):
+        """
+        Test if operation counts are added up per spec
+        """
+        profiler = Profiler(enabled=True)
+
+        profiler.count("OpenAPI.json", "operations")
+        profiler.count("OpenAPI.json", "operations")
+        profiler.count("OpenAPI.json", "parameters", 3)
+
+        self.assertEqual(profiler.specs["OpenAPI.json"]["counts"], {"operations": 2, "parameters": 3})
+
+    def test_disabled(self):
+        """
+        Test if a disabled profiler does not record anything
+        """
+        profiler = Profiler()
+        profiler.start()
+
+        with profiler.phase("specs"):
+            profiler.count("OpenAPI.json", "operations")
+
+        profiler.stop()
+
+        self.assertEqual(profiler.report(), {"version": PROFILE_VERSION, "options": {}, "total": {}, "phases": {},
+                                             "specs": {}})
+
+    def test_worker_measurements(self):
+        """
+        Test if the measurements of a spec can be moved to another profiler, and if the slowest specs are sorted
+        """
+        worker = Profiler(enabled=True)
+        main = Profiler(enabled=True)
+
+        for filename in ["Fast.json", "Slow.json"]:
+            with worker.phase("format", filename):
+                sum(range(100000 if filename == "Slow.json" else 10))
+
+            main.add_spec(filename, worker.pop_spec(filename))
+
+        self.assertEqual(worker.specs, {})
+        self.assertEqual([filename for filename, _ in main.slowest_specs()], ["Slow.json", "Fast.json"])
+
+    def test_save(self):
+        """
+        Test if the report is written as JSON together with the options
+        """
+        profiler = Profiler(enabled=True)
+        profiler.start()
+        profiler.stop()
+        profiler.save("tests/output/reports/profile.json", jobs=2)
+
+        with open("tests/output/reports/profile.json", "r", encoding="utf-8") as report_file:
+            report = json.load(report_file)
+
+        self.assertEqual(report["options"], {"jobs": 2})
+        self.assertIn("wall", report["total"])
+
+    def test_profile(self):
+        """
+        Test if the phases and specs are profiled, both in this process and inside worker processes
+        """
+        for jobs in [1, 2]:
+            converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                         input_folder_path="tests/mock_data/multiple/",
+                                         output_folder_path="tests/output",
+                                         jobs=jobs,
+                                         profile=True)
+            converter.convert()
+            converter.write_profile("tests/output/profile.json")
+
+            with open("tests/output/profile.json", "r", encoding="utf-8") as report_file:
+                report = json.load(report_file)
+
+            self.assertEqual(report["options"]["jobs"], jobs)
+            self.assertEqual(set(report["phases"]), {"manifest", "create_folders", "specs", "endpoints_template",
+                                                     "routes", "service", "krakend", "dockerfile", "publish"})
+            self.assertEqual(set(report["specs"]), {"Bets.json", "Results.json", "Users.json"})
+            self.assertEqual(set(report["specs"]["Bets.json"]["phases"]), {"load", "verify", "format"})
+            self.assertEqual(report["specs"]["Bets.json"]["counts"]["endpoints"], 10)
@@ -0,0 +1,214 @@
+import json
+import logging
+import unittest
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.qos import get_duration, get_endpoint_qos, load_qos_policy, merge_qos
+from app.logic.spec import OpenAPISpec
+from app.utils.errors import InvalidOpenAPIError
+from tests.logic.test_setup_logic import create_output_folder, delete_output_folder
+
+
+# pylint:disable=duplicate-code
+
+class TestQoS(unittest.TestCase):
+    """
+    Test the cache, timeout and concurrency settings of the endpoints
+    """
+
+    @classmethod
+    def setUp(cls):
+        """
+        Create the output folder if it doesn't exist
+        """
+        create_output_folder()
+
+    @classmethod
+    def tearDown(cls):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def test_duration(self):
+        """
+        Test if durations and amounts of seconds are accepted, and anything else raises an InvalidOpenAPIError
+        Test if large and small amounts of seconds are written without exponent notation
+        """
+        self.assertEqual(get_duration("300ms", "x-krakend-timeout"), "300ms")
+        self.assertEqual(get_duration("1.5m", "x-krakend-timeout"), "1.5m")
+        self.assertEqual(get_duration(10, "x-krakend-timeout"), "10s")
+        self.assertEqual(get_duration(0.5, "x-krakend-timeout"), "0.5s")
+        self.assertEqual(get_duration(10000000, "x-krakend-timeout"), "10000000s")
+        self.assertEqual(get_duration(1e7, "x-krakend-timeout"), "10000000s")
+        self.assertEqual(get_duration(0.0000001, "x-krakend-timeout"), "0.0000001s")
+
+        for value in ["soon", "5", "-1s", -1, True, None, {}]:
+            with self.assertRaisesRegex(InvalidOpenAPIError, "x-krakend-timeout", msg=value):
+                get_duration(value, "x-krakend-timeout")
+
+    def test_extensions(self):
+        """
+        Test if the extensions of an operation are converted to the settings of the endpoint and its backend
+        """
+        spec = OpenAPISpec("Bets.json", {})
+        operation = {"x-krakend-cache-ttl": 60, "x-krakend-timeout": "5s", "x-krakend-concurrent-calls": 3}
+
+        self.assertEqual(get_endpoint_qos(spec, "post", "/bet", operation, None),
+                         ({"cache_ttl": "60s", "timeout": "5s", "concurrent_calls": 3},
+                          {"extra_config": {"qos/http-cache": {}}}))
+        self.assertEqual(get_endpoint_qos(spec, "get", "/bet", {}, None), ({}, {}))
+
+        for value in [0, 1.5, "2", True]:
+            with self.assertRaisesRegex(InvalidOpenAPIError, "x-krakend-concurrent-calls", msg=value):
+                get_endpoint_qos(spec, "get", "/bet", {"x-krakend-concurrent-calls": value}, None)
+
+    def test_http_cache(self):
+        """
+        Test if GET operations declaring a Cache-Control header are cached, unless caching is disabled
+        """
+        spec = OpenAPISpec("Bets.json", {"components": {"responses": {"Cached": {"headers": {"cache-control": {}}}}}})
+        cached = {"responses": {"200": {"$ref": "#/components/responses/Cached"}}}
+
+        self.assertEqual(get_endpoint_qos(spec, "get", "/bet", cached, None, http_cache=True),
+                         ({}, {"extra_config": {"qos/http-cache": {}}}))
+        self.assertEqual(get_endpoint_qos(spec, "get", "/bet", cached, None), ({}, {}))
+        self.assertEqual(get_endpoint_qos(spec, "post", "/bet", cached, None, http_cache=True), ({}, {}))
+        self.assertEqual(get_endpoint_qos(spec, "get", "/bet", {**cached, "x-krakend-cache-ttl": False}, None,
+                                          http_cache=True),
+                         ({}, {}))
+        self.assertEqual(get_endpoint_qos(spec, "get", "/bet", {"responses": {"404": cached["responses"]["200"]}}, None,
+                                          http_cache=True),
+                         ({}, {}))
+
+    def test_policy(self):
+        """
+        Test if the policy, the extensions of the spec and the extensions of the operation are applied in order, merging
+        the fields of rate limits and circuit breakers
+        """
+        spec = OpenAPISpec("Bets.json", {"info": {"version": "1.0.0"}, "x-krakend-timeout": "4s",
+                                         "x-krakend-circuit-breaker": {"interval": 60, "timeout": 10, "max_errors": 1}})
+        policy = {"tags": {"Bet": {"timeout": "1s", "rate-limit": {"max_rate": 10, "every": "1m"}}},
+                  "paths": {"/bets/v1/bet/*": {"timeout": "2s", "rate-limit": {"max_rate": 20}}}}
+        operation = {"tags": ["Bet"], "x-krakend-circuit-breaker": {"max_errors": 5}}
+
+        endpoint, backend = get_endpoint_qos(spec, "get", "/bet/{season}", operation, None, policy=policy)
+
+        self.assertEqual(endpoint, {"timeout": "4s",
+                                    "extra_config": {"qos/ratelimit/router": {"max_rate": 20, "every": "1m"}}})
+        self.assertEqual(backend, {"extra_config": {"qos/circuit-breaker": {"interval": 60, "timeout": 10,
+                                                                            "max_errors": 5}}})
+
+        _, backend = get_endpoint_qos(spec, "get", "/bet", {"x-krakend-circuit-breaker": False}, None, policy=policy)
+
+        self.assertEqual(backend, {})
+
+    def test_merge(self):
+        """
+        Test if the settings are merged field by field into the configuration, and incomplete or invalid limits raise an
+        InvalidOpenAPIError
+        """
+        backend = {"encoding": "no-op", "extra_config": {"qos/circuit-breaker": {"interval": 60, "timeout": 10,
+                                                                                 "max_errors": 1}}}
+
+        merge_qos(backend, {"extra_config": {"qos/circuit-breaker": {"max_errors": 3},
+                                             "qos/ratelimit/proxy": {"max_rate": 5, "capacity": 5}}})
+
+        self.assertEqual(backend["extra_config"],
+                         {"qos/circuit-breaker": {"interval": 60, "timeout": 10, "max_errors": 3},
+                          "qos/ratelimit/proxy": {"max_rate": 5, "capacity": 5}})
+
+        invalid = [{"qos/circuit-breaker": {"max_errors": 3}}, {"qos/ratelimit/proxy": {"max_rate": 0, "capacity": 1}},
+                   {"qos/ratelimit/router": {"every": "1s"}}, {"qos/ratelimit/router": {"max_rate": -1}},
+                   {"qos/ratelimit/router": {"client_max_rate": 1, "strategy": "header"}}]
+
+        for extra_config in invalid:
+            with self.assertRaises(InvalidOpenAPIError, msg=extra_config):
+                merge_qos({}, {"extra_config": extra_config})
+
+    def test_load_policy(self):
+        """
+        Test if a policy is loaded, and invalid policies raise a ValueError
+        """
+        policy = {"tags": {"Bet": {"rate-limit": {"max_rate": 10}}}, "paths": {"/bets/*": {"timeout": 5}}}
+
+        with open("tests/output/policy.json", "w", encoding="utf-8") as policy_file:
+            json.dump(policy, policy_file)
+
+        self.assertEqual(load_qos_policy("tests/output/policy.json"), policy)
+
+        invalid = [{"methods": {}}, {"tags": []}, {"tags": {"Bet": {"retries": 3}}},
+                   {"paths": {"/bets/*": {"rate-limit": {"max_rate": "fast"}}}}, {"tags": {"Bet": {"timeout": "soon"}}}]
+
+        for policy in invalid:
+            with open("tests/output/policy.json", "w", encoding="utf-8") as policy_file:
+                json.dump(policy, policy_file)
+
+            with self.assertRaisesRegex(ValueError, "policy.json", msg=policy):
+                load_qos_policy("tests/output/policy.json")
+
+    def test_qos(self):
+        """
+        Test if the cache, timeout and concurrency extensions only apply to their own endpoint, and take precedence over
+        endpoint.json
+        Test if GET endpoints declaring a Cache-Control header are cached using --http-cache
+        """
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/qos/", "tests/output", flat=True, http_cache=True).convert()
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            endpoints = {f"{endpoint['method']} {endpoint['endpoint']}": endpoint
+                         for endpoint in json.load(config_file)["endpoints"]}
+
+        self.assertEqual(endpoints["GET /bets/v1/users/{user_id}"]["cache_ttl"], "300s")
+        self.assertEqual(endpoints["PUT /bets/v1/bet"]["timeout"], "5s")
+        self.assertEqual(endpoints["PUT /bets/v1/bet"]["concurrent_calls"], 2)
+        self.assertEqual(endpoints["POST /bets/v1/bet"]["timeout"], "10s")
+        self.assertEqual(endpoints["DELETE /bets/v1/bet"]["timeout"], "3600s")
+        self.assertNotIn("concurrent_calls", endpoints["DELETE /bets/v1/bet"])
+
+        cached = [name for name, endpoint in endpoints.items()
+                  if "qos/http-cache" in endpoint["backend"][0].get("extra_config", {})]
+
+        self.assertEqual(cached, ["GET /bets/v1/users", "GET /bets/v1/users/{user_id}", "GET /bets/v1/seasons"])
+
+    def test_invalid_qos(self):
+        """
+        Test if an invalid extension raises an InvalidOpenAPIError naming the spec and the operation
+        """
+        with open("tests/mock_data/qos/Bets.json", "r", encoding="utf-8") as spec_file:
+            spec = json.load(spec_file)
+
+        spec["paths"]["/seasons"]["get"]["x-krakend-timeout"] = "soon"
+
+        converter = OpenAPIToKrakenD(logging.ERROR, None, "tests/output")
+
+        with self.assertRaisesRegex(InvalidOpenAPIError, "Bets.json: GET /seasons: x-krakend-timeout"):
+            converter.convert_documents({"Bets.json": spec})
+
+    def test_rate_limit(self):
+        """
+        Test if the rate limits and circuit breakers of the policy, the spec and the operations are merged with the
+        custom backend.json
+        """
+        policy = {"tags": {"Users": {"rate-limit": {"max_rate": 10}}}, "paths": {"/bets/v1/bet*": {"timeout": "2s"}}}
+
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/rate_limit/", "tests/output", flat=True,
+                         qos_policy=policy).convert()
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            endpoints = {f"{endpoint['method']} {endpoint['endpoint']}": endpoint
+                         for endpoint in json.load(config_file)["endpoints"]}
+
+        self.assertEqual(endpoints["GET /bets/v1/users"]["extra_config"]["qos/ratelimit/router"],
+                         {"max_rate": 100, "client_max_rate": 5, "strategy": "ip"})
+        self.assertEqual(endpoints["POST /bets/v1/users"]["extra_config"]["qos/ratelimit/router"], {"max_rate": 10})
+        self.assertNotIn("extra_config", endpoints["GET /bets/v1/seasons"])
+        self.assertEqual(endpoints["PUT /bets/v1/bet"]["timeout"], "2s")
+
+        backends = {name: endpoint["backend"][0]["extra_config"] for name, endpoint in endpoints.items()}
+
+        self.assertEqual(backends["PUT /bets/v1/bet"]["qos/circuit-breaker"],
+                         {"interval": 60, "timeout": 10, "max_errors": 3, "log_status_change": True})
+        self.assertEqual(backends["POST /bets/v1/bet"]["qos/circuit-breaker"]["max_errors"], 1)
+        self.assertEqual(backends["GET /bets/v1/seasons"]["qos/ratelimit/proxy"], {"max_rate": 50, "capacity": 50})
+        self.assertNotIn("qos/ratelimit/proxy", backends["DELETE /bets/v1/bet"])
@@ -0,0 +1,113 @@
+import os
+import unittest
+from unittest import mock
+
+from app.logic.loader import load_document
+from app.logic.refs import RefResolver
+from app.logic.spec import OpenAPISpec
+from app.utils.errors import InvalidOpenAPIError
+
+
+# pylint:disable=duplicate-code
+
+class TestRefs(unittest.TestCase):
+    """
+    Test the $ref resolver
+    """
+
+    def test_local_ref(self):
+        """
+        Test if a chain of local references is followed
+        """
+        document = {
+            "components": {
+                "parameters": {
+                    "Page": {"$ref": "#/components/parameters/Offset"},
+                    "Offset": {"name": "offset", "in": "query"}
+                }
+            }
+        }
+        resolver = RefResolver(document)
+
+        value, _ = resolver.resolve({"$ref": "#/components/parameters/Page"})
+
+        self.assertEqual(value, {"name": "offset", "in": "query"})
+
+    def test_escaped_pointer(self):
+        """
+        Test if "~1", "~0" and percent-encoded characters inside a pointer are unescaped
+        """
+        document = {"paths": {"/users/{id}": {"get": {}}, "a~b": {"c": 1}}}
+        resolver = RefResolver(document)
+
+        self.assertEqual(resolver.resolve({"$ref": "#/paths/~1users~1%7Bid%7D"})[0], {"get": {}})
+        self.assertEqual(resolver.resolve({"$ref": "#/paths/a~0b/c"})[0], 1)
+
+    def test_no_ref(self):
+        """
+        Test if a value without a $ref is returned as is
+        """
+        resolver = RefResolver({})
+        value = {"name": "page", "in": "query"}
+
+        self.assertIs(resolver.resolve(value)[0], value)
+
+    def test_file_ref(self):
+        """
+        Test if references to other files are resolved relative to the referring file
+        """
+        spec = OpenAPISpec.load("tests/mock_data/refs/OpenAPI.json")
+
+        path_item, base = spec.resolver.resolve(spec.data["paths"]["/results"])
+        parameter, _ = spec.resolver.resolve(path_item["get"]["parameters"][0], base)
+
+        self.assertTrue(base.endswith("common.json"))
+        self.assertEqual(parameter, {"name": "round", "in": "query"})
+        self.assertEqual(spec.resolver.documents, [os.path.abspath("tests/mock_data/refs/shared/common.json")])
+
+    def test_memoized(self):
+        """
+        Test if every referenced file is only loaded once and every reference is only looked up once
+        """
+        spec = OpenAPISpec.load("tests/mock_data/refs/OpenAPI.json")
+
+        with mock.patch("app.logic.refs.load_document", wraps=load_document) as load:
+            for _ in range(3):
+                spec.resolver.resolve({"$ref": "shared/common.json#/components/parameters/Page"})
+                spec.resolver.resolve({"$ref": "shared/common.json#/components/parameters/Fields"})
+
+        self.assertEqual(load.call_count, 1)
+
+    def test_circular_ref(self):
+        """
+        Test if a circular reference raises an InvalidOpenAPIError
+        """
+        document = {"a": {"$ref": "#/b"}, "b": {"$ref": "#/a"}}
+        resolver = RefResolver(document)
+
+        with self.assertRaises(InvalidOpenAPIError) as context_manager:
+            resolver.resolve({"$ref": "#/a"})
+
+        self.assertIn("circular $ref", str(context_manager.exception))
+
+    def test_unresolvable_ref(self):
+        """
+        Test if a reference to a value that does not exist raises an InvalidOpenAPIError
+        """
+        resolver = RefResolver({"components": {}}, "tests/mock_data/refs/OpenAPI.json")
+
+        with self.assertRaises(InvalidOpenAPIError):
+            resolver.resolve({"$ref": "#/components/parameters/Page"})
+
+        with self.assertRaises(InvalidOpenAPIError):
+            resolver.resolve({"$ref": "missing.json#/components/parameters/Page"})
+
+    def test_unsupported_ref(self):
+        """
+        Test if remote references and file references without a spec path raise an InvalidOpenAPIError
+        """
+        with self.assertRaises(InvalidOpenAPIError):
+            RefResolver({}, "OpenAPI.json").resolve({"$ref": "https://example.com/common.json#/Page"})
+
+        with self.assertRaises(InvalidOpenAPIError):
+            RefResolver({}).resolve({"$ref": "common.json#/Page"})
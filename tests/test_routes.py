@@ -0,0 +1,78 @@
+import unittest
+
+from app.logic.routes import RouteIndex
+
+
+# pylint:disable=duplicate-code
+
+class TestRoutes(unittest.TestCase):
+    """
+    Test the route index
+    """
+
+    def test_no_conflicts(self):
+        """
+        Test if different methods and paths do not conflict
+        """
+        routes = RouteIndex()
+
+        routes.add("GET", "/f1/v1/items", "F1.json")
+        routes.add("POST", "/f1/v1/items", "F1.json")
+        routes.add("GET", "/f1/v1/items/{id}", "F1.json")
+        routes.add("GET", "/f1/v1/items/{id}/details", "F1.json")
+        routes.add("GET", "/f1/v2/items/{item_id}", "F1.V2.json")
+
+        self.assertEqual(routes.errors, [])
+        self.assertEqual(routes.shadowed(), [])
+        self.assertEqual(routes.count, 5)
+
+    def test_duplicate(self):
+        """
+        Test if the same method and path in two specs is a duplicate
+        """
+        routes = RouteIndex()
+
+        routes.add("GET", "/f1/v1/items/{id}", "F1.json")
+        routes.add("GET", "/f1/v1/items/{id}", "F1.V1.json")
+
+        self.assertEqual(routes.errors,
+                         ["GET /f1/v1/items/{id} (F1.V1.json) duplicates GET /f1/v1/items/{id} (F1.json)"])
+
+    def test_parameter_conflict(self):
+        """
+        Test if parameters with different names at the same position conflict
+        """
+        routes = RouteIndex()
+
+        routes.add("GET", "/f1/v1/items/{id}", "F1.json")
+        routes.add("GET", "/f1/v1/items/{item_id}/details", "F1.json")
+
+        self.assertEqual(len(routes.errors), 1)
+        self.assertIn("parameters {item_id} and {id} at the same position", routes.errors[0])
+
+    def test_shadowed(self):
+        """
+        Test if a literal and a parameter at the same position are reported as a warning, not as an error
+        """
+        routes = RouteIndex()
+
+        routes.add("GET", "/f1/v1/items/{id}", "F1.json")
+        routes.add("GET", "/f1/v1/items/search", "F1.json")
+        routes.add("POST", "/f1/v1/items/search", "F1.json")
+
+        self.assertEqual(routes.errors, [])
+        self.assertEqual(routes.shadowed(),
+                         ["GET /f1/v1/items/search (F1.json) shadows GET /f1/v1/items/{id} (F1.json)"])
+
+    def test_many_routes(self):
+        """
+        Test if a large estate without conflicts has no errors
+        """
+        routes = RouteIndex()
+
+        for service in range(100):
+            for resource in range(100):
+                routes.add("GET", f"/service{service}/v1/resource{resource}/{{id}}", f"Service{service}.json")
+
+        self.assertEqual(routes.errors, [])
+        self.assertEqual(routes.count, 10000)
@@ -0,0 +1,176 @@
+import asyncio
+import http.client
+import io
+import json
+import logging
+import threading
+import unittest
+import zipfile
+
+from app.logic.library import convert_specs
+from app.logic.server import ConversionServer
+from app.utils.customlogger import JSONFormatter, configure_logging, get_stream_handler
+from tests.test_library import load_specs
+
+
+# pylint:disable=duplicate-code
+
+class TestServer(unittest.TestCase):
+    """
+    Test converting OpenAPI specifications using the HTTP server
+    """
+
+    def setUp(self):
+        """
+        Start the server on a free port inside a background thread
+        """
+        self.server = ConversionServer(port=0, logging_mode=logging.ERROR)
+        self.loop = asyncio.new_event_loop()
+        self.loop.run_until_complete(self.server.start())
+
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+        self.connection = http.client.HTTPConnection("127.0.0.1", self.server.port, timeout=10)
+
+    def tearDown(self):
+        """
+        Stop the server
+        """
+        self.connection.close()
+
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+    def request(self, method: str, path: str, body=None, headers: dict = None) -> tuple:
+        """
+        Send a request over the shared connection and return the status and content of the response
+        """
+        content = json.dumps(body).encode("utf-8") if body is not None and not isinstance(body, bytes) else body
+
+        self.connection.request(method, path, content, headers or {})
+        response = self.connection.getresponse()
+
+        return response.status, response.read()
+
+    def test_convert(self):
+        """
+        Test if the server returns the same files as converting in memory
+        """
+        specs = load_specs("tests/mock_data/multiple")
+
+        status, content = self.request("POST", "/convert", {"specs": specs, "options": {"env": None}})
+
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(content)["files"], convert_specs(specs))
+
+    def test_log_format(self):
+        """
+        Test if the log format of the run is kept after converting
+        """
+        configure_logging("json")
+        server = ConversionServer(logging_mode=logging.ERROR, log_format="json")
+
+        try:
+            server.convert({"specs": load_specs("tests/mock_data/multiple")}, False)
+
+            self.assertIsInstance(get_stream_handler().formatter, JSONFormatter)
+        finally:
+            server.executor.shutdown()
+            configure_logging()
+
+    def test_cache(self):
+        """
+        Test if unchanged specifications are reused by the next request, on the same connection
+        """
+        specs = load_specs("tests/mock_data/multiple")
+
+        _, first = self.request("POST", "/convert", {"specs": specs})
+        self.assertEqual((self.server.cache.hits, self.server.cache.misses), (0, 3))
+
+        _, second = self.request("POST", "/convert", {"specs": specs})
+        self.assertEqual((self.server.cache.hits, self.server.cache.misses), (3, 3))
+        self.assertEqual(first, second)
+
+        specs["Bets.json"]["info"]["version"] = "2.0.0"
+        _, third = self.request("POST", "/convert", {"specs": specs})
+        self.assertEqual((self.server.cache.hits, self.server.cache.misses), (5, 4))
+        self.assertIn("config/templates/BETS.tmpl", json.loads(third)["files"])
+
+        _, flat = self.request("POST", "/convert", {"specs": specs, "options": {"flat": True}})
+        self.assertEqual((self.server.cache.hits, self.server.cache.misses), (5, 7))
+        self.assertEqual(json.loads(flat)["files"], convert_specs(specs, flat=True))
+
+        status, content = self.request("GET", "/health")
+        self.assertEqual(status, 200)
+        self.assertEqual(json.loads(content), {"status": "ok", "cached_specs": 7, "hits": 5, "misses": 7})
+
+    def test_archive(self):
+        """
+        Test if the files are returned as a zip archive when requested
+        """
+        specs = load_specs("tests/mock_data/multiple")
+
+        status, content = self.request("POST", "/convert?format=zip", {"specs": specs})
+
+        self.assertEqual(status, 200)
+
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            files = {name: archive.read(name).decode("utf-8") for name in archive.namelist()}
+
+        self.assertEqual(files, convert_specs(specs))
+
+    def test_yaml_text(self):
+        """
+        Test if specifications can be given as YAML text
+        """
+        with open("tests/mock_data/yaml/OpenAPI.yaml", "r", encoding="utf-8") as spec_file:
+            spec = spec_file.read()
+
+        status, content = self.request("POST", "/convert", {"specs": {"OpenAPI.yaml": spec}})
+
+        self.assertEqual(status, 200)
+        self.assertIn("config/templates/OPENAPI.tmpl", json.loads(content)["files"])
+
+    def test_invalid_requests(self):
+        """
+        Test if invalid requests are answered with an error, and the connection stays usable
+        """
+        specs = load_specs("tests/mock_data/multiple")
+
+        cases = [
+            ("POST", "/convert", b"{", 400, "invalid JSON"),
+            ("POST", "/convert", {"files": {}}, 400, "'specs'"),
+            ("POST", "/convert", {"specs": {}}, 400, "No OpenAPI specifications given"),
+            ("POST", "/convert", {"specs": {"../Users.json": {}}}, 400, "invalid specification filename"),
+            ("POST", "/convert", {"specs": {"Users.json": {"info": {}}}}, 400, "Users.json: no servers defined"),
+            ("POST", "/convert", {"specs": {"Users.yaml": "a: ["}}, 400, "Users.yaml: invalid YAML"),
+            ("POST", "/convert", {"specs": specs, "options": {"unknown": True}}, 400, "unknown option"),
+            ("POST", "/convert", {"specs": specs, "options": {"flat": "yes"}}, 400, "has the wrong type"),
+            ("POST", "/convert", {"specs": specs, "options": {"compact": True}}, 400, "requires 'flat'"),
+            ("POST", "/convert", {"specs": specs, "config": {"service.json": {}}}, 400, "service.json"),
+            ("GET", "/convert", None, 405, "use POST"),
+            ("GET", "/unknown", None, 404, "unknown path")
+        ]
+
+        for method, path, body, expected_status, message in cases:
+            status, content = self.request(method, path, body)
+
+            self.assertEqual(status, expected_status, message)
+            self.assertIn(message, json.loads(content)["error"])
+
+        status, _ = self.request("GET", "/health")
+        self.assertEqual(status, 200)
+
+    def test_body_too_large(self):
+        """
+        Test if a request body larger than the maximum is refused
+        """
+        self.server.max_body_size = 10
+
+        status, content = self.request("POST", "/convert", {"specs": {}})
+
+        self.assertEqual(status, 413)
+        self.assertIn("larger than 10 bytes", json.loads(content)["error"])
@@ -0,0 +1,108 @@
+import unittest
+
+import yaml
+
+from app.logic.sharding import ShardPlan, load_shard_groups
+from app.logic.spec import OpenAPISpec
+from tests.logic.test_setup_logic import create_output_folder, delete_output_folder
+
+
+# pylint:disable=duplicate-code
+
+def new_spec(filename: str, endpoints: int) -> OpenAPISpec:
+    """
+    Create a converted spec with an amount of endpoints
+    """
+    spec = OpenAPISpec(filename, {"info": {"version": "1.0.0"}})
+    spec.routes = [["GET", f"/{index}"] for index in range(endpoints)]
+
+    return spec
+
+
+class TestSharding(unittest.TestCase):
+    """
+    Test assigning specs to shards
+    """
+
+    @classmethod
+    def setUp(cls):
+        """
+        Create the output folder if it doesn't exist
+        """
+        create_output_folder()
+
+    @classmethod
+    def tearDown(cls):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def test_operations(self):
+        """
+        Test if the amount of endpoints is balanced across the shards
+        """
+        specs = [new_spec("A.json", 4), new_spec("B.json", 10), new_spec("C.json", 6)]
+
+        plan = ShardPlan(specs, 2)
+
+        self.assertEqual(plan.shards, {"shard-1": ["/b/v1"], "shard-2": ["/a/v1", "/c/v1"]})
+        self.assertEqual(plan.routing_map()["shards"]["shard-1"]["endpoints"], 10)
+        self.assertEqual(plan.routing_map()["shards"]["shard-2"]["endpoints"], 10)
+
+    def test_prefix(self):
+        """
+        Test if a prefix stays inside the same shard when other specs are added
+        """
+        specs = [new_spec(f"API{index}.json", 1) for index in range(20)]
+
+        before = ShardPlan(specs[:10], 3, "prefix").routing_map()["prefixes"]
+        after = ShardPlan(specs, 3, "prefix").routing_map()["prefixes"]
+
+        self.assertEqual(len(after), 20)
+        self.assertEqual({prefix: after[prefix] for prefix in before}, before)
+        self.assertEqual(set(after.values()), {"shard-1", "shard-2", "shard-3"})
+
+    def test_shared_prefix(self):
+        """
+        Test if specs with the same prefix always end up inside the same shard
+        """
+        specs = [new_spec("Bets.json", 5), new_spec("Users.json", 5), new_spec("Bets.yaml", 5)]
+
+        plan = ShardPlan(specs, 3)
+
+        self.assertEqual(plan.specs("shard-1"), [specs[0], specs[2]])
+        self.assertEqual(plan.specs("shard-3"), [])
+
+    def test_groups(self):
+        """
+        Test if the specs are assigned to the first group with a matching filename pattern
+        Test if a spec without group or a prefix inside multiple groups raises a ValueError
+        """
+        specs = [new_spec("Bets.json", 1), new_spec("Users.json", 1), new_spec("Results.json", 1)]
+
+        plan = ShardPlan(specs, groups={"public": ["Bets.json", "Results.*"], "internal": ["*"]})
+
+        self.assertEqual(plan.routing_map()["prefixes"],
+                         {"/bets/v1": "public", "/results/v1": "public", "/users/v1": "internal"})
+
+        with self.assertRaisesRegex(ValueError, "Users.json"):
+            ShardPlan(specs, groups={"public": ["Bets.json", "Results.json"]})
+
+        with self.assertRaisesRegex(ValueError, "/bets/v1"):
+            ShardPlan(specs + [new_spec("Bets.yaml", 1)], groups={"json": ["*.json"], "yaml": ["*.yaml"]})
+
+    def test_load_groups(self):
+        """
+        Test if groups are loaded from YAML, and invalid groups raise a ValueError
+        """
+        with open("tests/output/groups.yaml", "w", encoding="utf-8") as groups_file:
+            yaml.safe_dump({"public": ["Bets.json"], "internal": ["*"]}, groups_file)
+
+        self.assertEqual(load_shard_groups("tests/output/groups.yaml"), {"public": ["Bets.json"], "internal": ["*"]})
+
+        with open("tests/output/groups.yaml", "w", encoding="utf-8") as groups_file:
+            yaml.safe_dump({"public": "Bets.json"}, groups_file)
+
+        with self.assertRaisesRegex(ValueError, "public"):
+            load_shard_groups("tests/output/groups.yaml")
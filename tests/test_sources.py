@@ -0,0 +1,237 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.sources import SOURCES_CACHE_FILENAME, SourceFetcher, load_sources
+from app.utils.customlogger import CustomLogger
+from app.utils.errors import SpecFetchError
+from tests.logic.test_setup_logic import create_output_folder, delete_output_folder
+
+
+# pylint:disable=duplicate-code
+
+class SpecHandler(BaseHTTPRequestHandler):
+    """
+    Serve the specs of the stand-in server, answering conditional requests with 304 Not Modified
+    """
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Serve a spec
+        """
+        server = self.server
+
+        with server.lock:
+            server.requests.append(self.path)
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+
+        try:
+            time.sleep(server.delay)
+
+            if self.path not in server.specs:
+                self.send_error(404)
+                return
+
+            content = server.specs[self.path]
+            etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+
+            if self.headers.get("If-None-Match") == etag:
+                with server.lock:
+                    server.not_modified += 1
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", "Sat, 01 Jan 2022 00:00:00 GMT")
+            self.end_headers()
+            self.wfile.write(content)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        """
+        Don't log requests
+        """
+
+
+class TestSources(unittest.TestCase):
+    """
+    Test fetching OpenAPI specifications from their sources
+    """
+
+    input_folder = "tests/output/input"
+
+    def setUp(self):
+        """
+        Create the output folder and start the stand-in server serving the specs of the mock data
+        """
+        create_output_folder()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), SpecHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.active = 0
+        self.server.max_active = 0
+        self.server.not_modified = 0
+        self.server.delay = 0
+        self.server.specs = {}
+
+        for filename in ("Bets.json", "Results.json", "Users.json"):
+            with open(os.path.join("tests/mock_data/multiple", filename), "rb") as spec_file:
+                self.server.specs[f"/{filename.lower()}/openapi.json"] = spec_file.read()
+
+        self.thread = threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+        self.sources = {filename: {"url": self.url(f"/{filename.lower()}/openapi.json"), "headers": {}}
+                        for filename in ("Bets.json", "Results.json", "Users.json")}
+
+    def tearDown(self):
+        """
+        Stop the stand-in server and delete the output folder
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+        delete_output_folder()
+
+    def url(self, path: str) -> str:
+        """
+        Get the URL of a path on the stand-in server
+        """
+        return f"http://127.0.0.1:{self.server.server_address[1]}{path}"
+
+    def fetch(self, max_workers: int = 8) -> list:
+        """
+        Fetch the sources into the input folder
+        """
+        fetcher = SourceFetcher(self.input_folder, self.sources, max_workers, logger=CustomLogger(logging.CRITICAL))
+
+        return fetcher.fetch()
+
+    def test_fetch(self):
+        """
+        Test if every spec is fetched into the input folder, and converts the same as the mock data
+        """
+        self.assertEqual(sorted(self.fetch()), ["Bets.json", "Results.json", "Users.json"])
+
+        for filename in ("Bets.json", "Results.json", "Users.json"):
+            with open(os.path.join(self.input_folder, filename), "rb") as spec_file, \
+                    open(os.path.join("tests/mock_data/multiple", filename), "rb") as mock_file:
+                self.assertEqual(spec_file.read(), mock_file.read())
+
+        OpenAPIToKrakenD(logging.ERROR, self.input_folder, "tests/output").convert()
+
+        self.assertTrue(os.path.exists("tests/output/config/templates/BETS.tmpl"))
+        self.assertFalse(os.path.exists("tests/output/config/templates/.SOURCES.tmpl"))
+
+    def test_not_modified(self):
+        """
+        Test if unchanged specs are answered with 304 Not Modified and their files are not touched
+        """
+        self.fetch()
+        modified = os.stat(os.path.join(self.input_folder, "Bets.json")).st_mtime_ns
+
+        self.assertEqual(self.fetch(), [])
+        self.assertEqual(self.server.not_modified, 3)
+        self.assertEqual(os.stat(os.path.join(self.input_folder, "Bets.json")).st_mtime_ns, modified)
+
+        self.server.specs["/bets.json/openapi.json"] = self.server.specs["/users.json/openapi.json"]
+
+        self.assertEqual(self.fetch(), ["Bets.json"])
+        self.assertEqual(self.server.not_modified, 5)
+
+    def test_local_change(self):
+        """
+        Test if a spec changed inside the input folder is fetched again instead of using a conditional request
+        """
+        self.fetch()
+
+        with open(os.path.join(self.input_folder, "Bets.json"), "w", encoding="utf-8") as spec_file:
+            spec_file.write("{}")
+
+        self.assertEqual(self.fetch(), ["Bets.json"])
+        self.assertEqual(self.server.not_modified, 2)
+
+    def test_removed_source(self):
+        """
+        Test if a spec that is no longer a source is removed, and other files are kept
+        """
+        self.fetch()
+
+        with open(os.path.join(self.input_folder, "Local.json"), "w", encoding="utf-8") as spec_file:
+            spec_file.write("{}")
+
+        del self.sources["Users.json"]
+
+        self.assertEqual(self.fetch(), ["Users.json"])
+        self.assertEqual(sorted(os.listdir(self.input_folder)),
+                         [SOURCES_CACHE_FILENAME, "Bets.json", "Local.json", "Results.json"])
+
+    def test_errors(self):
+        """
+        Test if every failing source is reported at once, and the other specs are still fetched
+        """
+        self.sources["Missing.json"] = {"url": self.url("/missing/openapi.json"), "headers": {}}
+        self.sources["Offline.json"] = {"url": "http://127.0.0.1:1/openapi.json", "headers": {}}
+
+        with self.assertRaises(SpecFetchError) as error_manager:
+            self.fetch()
+
+        message = str(error_manager.exception)
+        self.assertIn("Could not fetch 2 of 5 specs", message)
+        self.assertIn("Missing.json: " + self.url("/missing/openapi.json") + " returned 404", message)
+        self.assertIn("Offline.json: http://127.0.0.1:1/openapi.json could not be fetched", message)
+        self.assertTrue(os.path.exists(os.path.join(self.input_folder, "Bets.json")))
+
+    def test_bounded_concurrency(self):
+        """
+        Test if the specs are fetched concurrently, but never more than the maximum at the same time
+        """
+        self.server.delay = 0.2
+
+        self.fetch(max_workers=2)
+        self.assertEqual(self.server.max_active, 2)
+
+        self.server.max_active = 0
+        start = time.perf_counter()
+        self.fetch(max_workers=3)
+
+        self.assertEqual(self.server.max_active, 3)
+        self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_load_sources(self):
+        """
+        Test if a sources manifest is loaded, and invalid sources raise a ValueError
+        """
+        path = "tests/output/sources.json"
+        sources = {"Users.json": "http://users/openapi.json",
+                   "Bets.yaml": {"url": "http://bets/openapi.yaml", "headers": {"Authorization": "Bearer token"}}}
+
+        with open(path, "w", encoding="utf-8") as sources_file:
+            json.dump(sources, sources_file)
+
+        self.assertEqual(load_sources(path), {
+            "Users.json": {"url": "http://users/openapi.json", "headers": {}},
+            "Bets.yaml": {"url": "http://bets/openapi.yaml", "headers": {"Authorization": "Bearer token"}}
+        })
+
+        for invalid in ({"../Users.json": "http://users"}, {"Users.txt": "http://users"}, {"Users.json": 1}, []):
+            with open(path, "w", encoding="utf-8") as sources_file:
+                json.dump(invalid, sources_file)
+
+            with self.assertRaises(ValueError):
+                load_sources(path)
@@ -0,0 +1,76 @@
+import unittest
+
+from app.logic.loader import find_specs
+from app.logic.spec import OpenAPISpec
+
+
+# pylint:disable=duplicate-code
+
+class TestSpec(unittest.TestCase):
+    """
+    Test the OpenAPI spec loader
+    """
+
+    def test_load(self):
+        """
+        Test if the spec is parsed and the filename is stored
+        """
+        spec = OpenAPISpec.load("tests/mock_data/full/OpenAPI.json")
+
+        self.assertEqual(spec.filename, "OpenAPI.json")
+        self.assertEqual(spec.template_name, "OPENAPI")
+        self.assertEqual(spec.servers[0]["url"], "https://f1-betting.app")
+
+    def test_automatic_versioning(self):
+        """
+        Test if the name and prefix contain the version from the 'version' field
+        """
+        spec = OpenAPISpec("OpenAPI.v1.json", {"info": {"version": "2.0.0"}})
+
+        self.assertEqual(spec.version, "V2")
+        self.assertEqual(spec.name, "OPENAPIV2")
+        self.assertEqual(spec.prefix, "openapi/v2")
+
+    def test_filename_versioning(self):
+        """
+        Test if the name and prefix contain the version from the filename when versioning is disabled
+        """
+        spec = OpenAPISpec("OpenAPI.v1.json", {"info": {"version": "2.0.0"}}, versioning=False)
+
+        self.assertEqual(spec.name, "OPENAPIV1")
+        self.assertEqual(spec.prefix, "openapi/v1")
+
+    def test_no_versioning(self):
+        """
+        Test if the name and prefix do not contain a version when versioning is disabled
+        """
+        spec = OpenAPISpec("OpenAPI.json", {}, versioning=False)
+
+        self.assertEqual(spec.name, "OPENAPI")
+        self.assertEqual(spec.prefix, "openapi")
+
+    def test_load_yaml(self):
+        """
+        Test if a YAML spec is parsed and the extension is removed from the template name
+        """
+        spec = OpenAPISpec.load("tests/mock_data/yaml/OpenAPI.yaml", streaming=True)
+
+        self.assertEqual(spec.template_name, "OPENAPI")
+        self.assertEqual(spec.servers[0]["url"], "https://f1-betting.app")
+
+    def test_numeric_version(self):
+        """
+        Test if an unquoted YAML version, which is parsed as a number, is supported
+        """
+        spec = OpenAPISpec("OpenAPI.yml", {"info": {"version": 2.0}})
+
+        self.assertEqual(spec.version, "V2")
+        self.assertEqual(spec.template_name, "OPENAPI")
+
+    def test_find_specs(self):
+        """
+        Test if JSON and YAML specs are found, and other files and folders are ignored
+        """
+        self.assertEqual(find_specs("tests/mock_data/yaml_duplicate"),
+                         ["tests/mock_data/yaml_duplicate/OpenAPI.json", "tests/mock_data/yaml_duplicate/OpenAPI.yml"])
+        self.assertEqual(find_specs("tests/mock_data/yaml"), ["tests/mock_data/yaml/OpenAPI.yaml"])
@@ -0,0 +1,69 @@
+import io
+import json
+import unittest
+
+from app.logic.streaming import OPENAPI_SCHEMA_SELECTION, SelectiveJSONReader, load_selected
+from app.utils.errors import InvalidOpenAPIError
+
+
+# pylint:disable=duplicate-code
+
+class TestStreaming(unittest.TestCase):
+    """
+    Test the selective streaming parser
+    """
+
+    def test_full_document(self):
+        """
+        Test if selecting everything returns the same document as json.load for every chunk size
+        """
+        with open("tests/mock_data/full/OpenAPI.json", "r", encoding="utf-8") as openapi_file:
+            document = openapi_file.read()
+
+        for chunk_size in [1, 7, 64 * 1024]:
+            self.assertEqual(SelectiveJSONReader(io.StringIO(document), chunk_size).read(True), json.loads(document))
+
+    def test_selection(self):
+        """
+        Test if only the parts used by the converter are kept
+        """
+        with open("tests/mock_data/full/OpenAPI.json", "r", encoding="utf-8") as openapi_file:
+            data = load_selected(openapi_file)
+
+        self.assertEqual(data["info"]["version"], "1.4.1")
+        self.assertEqual(list(data["components"]), ["securitySchemes"])
+        self.assertEqual(list(data["paths"]["/bet"]["put"]), ["tags", "parameters", "responses", "security"])
+        self.assertTrue(all(media_type == {} for response in data["paths"]["/bet"]["put"]["responses"].values()
+                            for media_type in response["content"].values()))
+
+    def test_schema_selection(self):
+        """
+        Test if the response schemas are kept when generating allow lists, without the other parts of the components
+        """
+        with open("tests/mock_data/allow_lists/Drivers.json", "r", encoding="utf-8") as openapi_file:
+            document = json.load(openapi_file)
+            openapi_file.seek(0)
+            data = load_selected(openapi_file, OPENAPI_SCHEMA_SELECTION)
+
+        self.assertEqual(data["components"]["schemas"], document["components"]["schemas"])
+        self.assertEqual(data["paths"]["/drivers"]["post"]["responses"]["201"],
+                         {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Driver"}}}})
+
+    def test_strings(self):
+        """
+        Test if brackets and escaped quotes inside skipped and selected strings are handled across chunks
+        """
+        document = '{"skip": ["\\\\", "}{\\"]", {"a": "["}], "keep": {"value": "}\\"{"}, "number": -1.5e3}'
+
+        for chunk_size in range(1, 10):
+            data = SelectiveJSONReader(io.StringIO(document), chunk_size).read({"keep": True, "number": True})
+
+            self.assertEqual(data, {"keep": {"value": "}\"{"}, "number": -1500.0})
+
+    def test_invalid(self):
+        """
+        Test if an InvalidOpenAPIError is raised for invalid JSON
+        """
+        for document in ['{"info": ', '{"info" {}}', '{"info": {}} {}', '{"skip": "']:
+            with self.assertRaises(InvalidOpenAPIError):
+                load_selected(io.StringIO(document))
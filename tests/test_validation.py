@@ -0,0 +1,203 @@
+import copy
+import json
+import logging
+import os
+import unittest
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.validation import get_validator, validate_openapi
+from app.utils.errors import InvalidOpenAPIError
+from tests.logic.test_setup_logic import create_output_folder, delete_output_folder
+
+
+# pylint:disable=duplicate-code
+
+def load_spec(path: str) -> dict:
+    """
+    Load an OpenAPI specification of the mock data
+    """
+    with open(path, "r", encoding="utf-8") as spec_file:
+        return json.load(spec_file)
+
+
+class TestValidation(unittest.TestCase):
+    """
+    Test validating OpenAPI specifications
+    """
+
+    @classmethod
+    def setUp(cls):
+        """
+        Create the output folder if it doesn't exist
+        """
+        create_output_folder()
+
+    @classmethod
+    def tearDown(cls):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def test_valid(self):
+        """
+        Test if valid OpenAPI 3.0 and 3.1 specifications have no errors
+        """
+        self.assertEqual(validate_openapi(load_spec("tests/mock_data/full/OpenAPI.json")), [])
+        self.assertEqual(validate_openapi(load_spec("tests/mock_data/multiple/Bets.json")), [])
+
+        spec = load_spec("tests/mock_data/multiple/Bets.json")
+        spec["openapi"] = "3.1.0"
+        spec["info"]["summary"] = "Bets"
+        del spec["paths"]
+
+        self.assertEqual(validate_openapi(spec), [])
+
+    def test_unsupported_version(self):
+        """
+        Test if a document that isn't OpenAPI 3.0 or 3.1 has a single error
+        """
+        self.assertEqual(validate_openapi({"swagger": "2.0"}),
+                         ["/openapi: unsupported OpenAPI version 'None', expected 3.0.x or 3.1.x"])
+        self.assertEqual(len(validate_openapi({"openapi": "3.2.0"})), 1)
+        self.assertEqual(len(validate_openapi([])), 1)
+
+    def test_every_error(self):
+        """
+        Test if every error is reported with its location, instead of only the first
+        """
+        spec = load_spec("tests/mock_data/multiple/Bets.json")
+        del spec["info"]["title"]
+        spec["servers"][0]["url"] = 8000
+        spec["unknown"] = True
+        spec["x-logo"] = {"url": "logo.png"}
+        operation = spec["paths"]["/users"]["get"]
+        operation["parameters"] = [{"name": "page", "in": "body"}]
+        del operation["responses"]["200"]["description"]
+        operation["responses"]["600"] = {"description": "Unknown"}
+
+        self.assertEqual(validate_openapi(spec), [
+            "/info: missing required field 'title'",
+            "/servers/0/url: expected string, got integer",
+            "/paths/~1users/get/responses/200: missing required field 'description'",
+            "/paths/~1users/get/responses: unexpected field '600'",
+            "/paths/~1users/get/parameters/0/in: 'body' is not one of query, header, path, cookie",
+            "/: unexpected field 'unknown'"
+        ])
+
+    def test_security_scheme(self):
+        """
+        Test if the fields required by the type of security scheme are required
+        """
+        spec = load_spec("tests/mock_data/full/OpenAPI.json")
+        spec["components"]["securitySchemes"] = {"Key": {"type": "apiKey", "name": "X-Key"},
+                                                 "Mutual": {"type": "mutualTLS"}}
+
+        self.assertEqual(validate_openapi(spec), [
+            "/components/securitySchemes/Key: missing required field 'in' for type 'apiKey'",
+            "/components/securitySchemes/Mutual/type: 'mutualTLS' is not one of apiKey, http, oauth2, openIdConnect"
+        ])
+
+        spec["openapi"] = "3.1.0"
+
+        self.assertEqual(validate_openapi(spec),
+                         ["/components/securitySchemes/Key: missing required field 'in' for type 'apiKey'"])
+
+    def test_semantics(self):
+        """
+        Test if unresolvable references, duplicate operation ids and wrong path parameters are reported
+        """
+        spec = load_spec("tests/mock_data/multiple/Bets.json")
+        spec["paths"]["/users"]["get"]["responses"]["200"]["content"]["application/json"]["schema"] = \
+            {"$ref": "#/components/schemas/Unknown"}
+        spec["paths"]["/users"]["post"]["operationId"] = spec["paths"]["/users"]["get"]["operationId"]
+        spec["paths"]["/items/{id}"] = {
+            "get": {"parameters": [{"name": "item_id", "in": "path", "required": True}],
+                    "responses": {"200": {"description": "OK"}}},
+            "delete": {"parameters": [{"name": "id", "in": "path"}], "responses": {"200": {"description": "OK"}}}
+        }
+
+        self.assertEqual(validate_openapi(spec), [
+            "/paths/~1users/get/responses/200/content/application~1json/schema: "
+            "$ref '#/components/schemas/Unknown' can not be resolved",
+            "/paths/~1users/post: operationId 'get_all_users' is also used by /paths/~1users/get",
+            "/paths/~1items~1{id}/get: path parameter 'item_id' is not part of the path",
+            "/paths/~1items~1{id}/get: path parameter 'id' is not defined",
+            "/paths/~1items~1{id}/delete: path parameter 'id' must be required"
+        ])
+
+    def test_referenced_path_parameters(self):
+        """
+        Test if path parameters defined using a $ref are resolved, and parameters inside other files are trusted
+        """
+        spec = load_spec("tests/mock_data/multiple/Bets.json")
+        spec["components"]["parameters"] = {"Id": {"name": "id", "in": "path", "required": True}}
+        spec["paths"]["/items/{id}"] = {"parameters": [{"$ref": "#/components/parameters/Id"}],
+                                        "get": {"responses": {"200": {"description": "OK"}}}}
+        spec["paths"]["/other/{id}"] = {"parameters": [{"$ref": "shared.json#/components/parameters/Id"}],
+                                        "get": {"responses": {"200": {"description": "OK"}}}}
+
+        self.assertEqual(validate_openapi(spec), [])
+
+    def test_compiled_once(self):
+        """
+        Test if the validator of a version is compiled once and reused
+        """
+        self.assertIs(get_validator("3.0"), get_validator("3.0"))
+        self.assertIsNot(get_validator("3.0"), get_validator("3.1"))
+
+        with self.assertRaises(ValueError):
+            get_validator("2.0")
+
+    def test_not_modified(self):
+        """
+        Test if validating does not modify the specification
+        """
+        spec = load_spec("tests/mock_data/full/OpenAPI.json")
+        original = copy.deepcopy(spec)
+
+        validate_openapi(spec)
+
+        self.assertEqual(spec, original)
+
+    def test_validate(self):
+        """
+        Test if validating reports the errors of every spec at once, also when converting in parallel
+        """
+        for jobs in (1, 2):
+            converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                         input_folder_path="tests/mock_data/validation/",
+                                         output_folder_path="tests/output",
+                                         jobs=jobs,
+                                         validate=True)
+
+            with self.assertLogs(converter.logger.get_logger(), logging.ERROR) as context_manager:
+                with self.assertRaises(InvalidOpenAPIError) as error_manager:
+                    converter.convert()
+
+            self.assertEqual(len(context_manager.records), 4)
+            self.assertEqual(str(error_manager.exception).splitlines(), [
+                "4 validation errors in 2 specs:",
+                "Results.json: /info: missing required field 'title'",
+                "Results.json: /paths/~1seasons/get/responses/200/content/application~1json/schema: "
+                "$ref '#/components/schemas/Season' can not be resolved",
+                "Results.json: /paths/~1seasons/get: operationId 'get_all_users' is also used by /paths/~1users/get",
+                "Users.json: invalid JSON (Expecting property name enclosed in double quotes: line 20 column 3 "
+                "(char 477))"
+            ])
+            self.assertEqual([filenames for _, _, filenames in os.walk("tests/output") if filenames], [])
+
+    def test_validate_valid(self):
+        """
+        Test if validating valid specs writes the same output as not validating
+        """
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/full/", "tests/output").convert()
+
+        with open("tests/output/config/templates/Endpoints.tmpl", "r", encoding="utf-8") as endpoints_file:
+            expected = endpoints_file.read()
+
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/full/", "tests/output", validate=True,
+                         streaming=True).convert()
+
+        with open("tests/output/config/templates/Endpoints.tmpl", "r", encoding="utf-8") as endpoints_file:
+            self.assertEqual(endpoints_file.read(), expected)
@@ -0,0 +1,212 @@
+import logging
+import os
+import shutil
+import threading
+import time
+import unittest
+from unittest import mock
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.watcher import ConverterWatcher, InotifyWatcher, PollingWatcher
+from tests.logic.test_setup_logic import create_output_folder, delete_output_folder
+
+
+# pylint:disable=duplicate-code
+
+class TestWatcher(unittest.TestCase):
+    """
+    Test the watch mode
+    """
+
+    @classmethod
+    def setUp(cls):
+        """
+        Create the output folder and copy the OpenAPI files to it
+        """
+        create_output_folder()
+        shutil.copytree("tests/mock_data/multiple", "tests/output/input")
+
+    @classmethod
+    def tearDown(cls):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def test_polling_watcher(self):
+        """
+        Test if the polling watcher detects created files
+        """
+        watcher = PollingWatcher(["tests/output/input"], interval=0.01)
+
+        shutil.copy("tests/mock_data/full/OpenAPI.json", "tests/output/input/OpenAPI.json")
+
+        self.assertEqual(watcher.poll(1), {"tests/output/input/OpenAPI.json"})
+        self.assertEqual(watcher.poll(0), set())
+
+    def test_inotify_watcher(self):
+        """
+        Test if the inotify watcher detects created files
+        Test if the inotify watcher starts watching folders that are created after it started
+        """
+        try:
+            watcher = InotifyWatcher(["tests/output/input", "tests/output/input/config"])
+        except (OSError, TypeError):
+            self.skipTest("inotify is not available")
+
+        try:
+            shutil.copy("tests/mock_data/full/OpenAPI.json", "tests/output/input/OpenAPI.json")
+            self.assertIn("tests/output/input/OpenAPI.json", watcher.poll(1))
+
+            os.mkdir("tests/output/input/config")
+            watcher.poll(1)
+            shutil.copy("tests/mock_data/full/config/krakend.json", "tests/output/input/config/krakend.json")
+            self.assertIn("tests/output/input/config/krakend.json", watcher.poll(1))
+        finally:
+            watcher.close()
+
+    def test_rebuild(self):
+        """
+        Test if only the changed OpenAPI file is converted again
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/output/input",
+                                     output_folder_path="tests/output")
+        watcher = ConverterWatcher(converter)
+        self.assertTrue(watcher.rebuild(set()))
+
+        shutil.copy("tests/mock_data/headers/OpenAPI.json", "tests/output/input/Bets.json")
+
+        with mock.patch.object(OpenAPIToKrakenD, "convert_spec", wraps=converter.convert_spec) as convert_spec:
+            self.assertTrue(watcher.rebuild({"tests/output/input/Bets.json"}))
+
+        convert_spec.assert_called_once_with("tests/output/input/Bets.json")
+
+    def test_rebuild_config_envs(self):
+        """
+        Test if the multi-env Dockerfile is kept after the configuration folder changed
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/output/input",
+                                     output_folder_path="tests/output",
+                                     all_envs=True)
+        watcher = ConverterWatcher(converter)
+        self.assertTrue(watcher.rebuild(set()))
+
+        os.mkdir("tests/output/input/config")
+        shutil.copy("tests/mock_data/full/config/krakend.json", "tests/output/input/config/krakend.json")
+
+        self.assertTrue(watcher.rebuild({"tests/output/input/config/krakend.json"}))
+
+        with open("app/config/Dockerfile.envs", "r", encoding="utf-8") as expected, \
+                open("tests/output/Dockerfile", "r", encoding="utf-8") as dockerfile:
+            self.assertEqual(dockerfile.read(), expected.read())
+
+    def test_rebuild_refs(self):
+        """
+        Test if the folders of referenced files are watched, and a changed referenced file converts its spec again
+        """
+        shutil.copytree("tests/mock_data/refs", "tests/output/refs")
+
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/output/refs",
+                                     output_folder_path="tests/output")
+        watcher = ConverterWatcher(converter)
+        self.assertTrue(watcher.rebuild(set()))
+
+        common_path = os.path.abspath("tests/output/refs/shared/common.json")
+        self.assertIn(os.path.dirname(common_path), watcher.get_folders())
+
+        with open(common_path, "a", encoding="utf-8") as common_file:
+            common_file.write("\n")
+
+        with mock.patch.object(OpenAPIToKrakenD, "convert_spec", wraps=converter.convert_spec) as convert_spec:
+            self.assertTrue(watcher.rebuild({common_path}))
+
+        convert_spec.assert_called_once_with("tests/output/refs/OpenAPI.json")
+
+    def test_rebuild_invalid(self):
+        """
+        Test if an invalid OpenAPI file is logged instead of stopping the watcher
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/output/input",
+                                     output_folder_path="tests/output")
+        watcher = ConverterWatcher(converter)
+        watcher.rebuild(set())
+
+        shutil.copy("tests/mock_data/no_server/OpenAPI.json", "tests/output/input/Bets.json")
+
+        with self.assertLogs(converter.logger.get_logger(), logging.ERROR) as context_manager:
+            self.assertFalse(watcher.rebuild({"tests/output/input/Bets.json"}))
+
+        self.assertTrue(any("Bets.json: no servers defined" in r for r in context_manager.output))
+
+    def test_rebuild_invalid_config(self):
+        """
+        Test if a half-written configuration file is logged instead of stopping the watcher
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/output/input",
+                                     output_folder_path="tests/output")
+        watcher = ConverterWatcher(converter)
+        watcher.rebuild(set())
+
+        os.mkdir("tests/output/input/config")
+        with open("tests/output/input/config/endpoint.json", "w", encoding="utf-8") as config_file:
+            config_file.write('{"timeout": ')
+
+        with self.assertLogs(converter.logger.get_logger(), logging.ERROR) as context_manager:
+            self.assertFalse(watcher.rebuild({"tests/output/input/config/endpoint.json"}))
+
+        self.assertTrue(any("config/endpoint.json" in r for r in context_manager.output))
+
+        with open("tests/output/input/config/endpoint.json", "w", encoding="utf-8") as config_file:
+            config_file.write('{"timeout": "3s"}')
+
+        self.assertTrue(watcher.rebuild({"tests/output/input/config/endpoint.json"}))
+
+    def test_rebuild_empty(self):
+        """
+        Test if an empty YAML file saved by an editor is logged instead of stopping the watcher
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/output/input",
+                                     output_folder_path="tests/output")
+        watcher = ConverterWatcher(converter)
+        watcher.rebuild(set())
+
+        with open("tests/output/input/Empty.yaml", "w", encoding="utf-8"):
+            pass
+
+        with self.assertLogs(converter.logger.get_logger(), logging.ERROR) as context_manager:
+            self.assertFalse(watcher.rebuild({"tests/output/input/Empty.yaml"}))
+
+        self.assertTrue(any("Empty.yaml: empty document" in r for r in context_manager.output))
+
+    def test_run(self):
+        """
+        Test if a new OpenAPI file is converted while watching
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/output/input",
+                                     output_folder_path="tests/output")
+        watcher = ConverterWatcher(converter, debounce=0.05)
+
+        thread = threading.Thread(target=watcher.run)
+        thread.start()
+
+        try:
+            deadline = time.monotonic() + 5
+            while not os.path.exists("tests/output/.manifest.json") and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            shutil.copy("tests/mock_data/full/OpenAPI.json", "tests/output/input/OpenAPI.json")
+
+            while not os.path.exists("tests/output/config/templates/OPENAPI.tmpl") and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            watcher.stop()
+            thread.join()
+
+        self.assertTrue(os.path.exists("tests/output/config/templates/OPENAPI.tmpl"))
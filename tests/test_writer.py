@@ -0,0 +1,323 @@
+import json
+import logging
+import os
+import unittest
+from unittest import mock
+
+from app.logic.converter import OpenAPIToKrakenD
+from app.logic.spec import OpenAPISpec
+from tests.logic.test_setup_logic import delete_output_folder, create_output_folder
+
+
+# pylint:disable=duplicate-code
+
+class TestWriter(unittest.TestCase):
+    """
+    Test writing the configuration files shared by the specs
+    """
+
+    @classmethod
+    def setUp(cls):
+        """
+        Create the output folder if it doesn't exist
+        """
+        create_output_folder()
+
+    @classmethod
+    def tearDown(cls):
+        """
+        Delete the output folder if it exists
+        """
+        delete_output_folder()
+
+    def test_flat(self):
+        """
+        Test if the flat krakend.json contains every endpoint with its prefix and host filled in
+        Test if it is formatted the same as json.dumps with indent=4
+        Test if no templates are written and the flat Dockerfile is used
+        """
+        for jobs in [1, 2]:
+            converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                         input_folder_path="tests/mock_data/multiple/",
+                                         output_folder_path="tests/output",
+                                         jobs=jobs,
+                                         flat=True)
+            converter.convert()
+
+            with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+                config = config_file.read()
+
+            config_json = json.loads(config)
+
+            self.assertEqual(config, json.dumps(config_json, indent=4))
+            self.assertEqual(len(config_json["endpoints"]), 30)
+            self.assertEqual(config_json["endpoints"][0]["endpoint"], "/bets/v1/users")
+            self.assertEqual(config_json["endpoints"][0]["backend"][0]["host"], ["https://f1-betting.app"])
+            self.assertNotIn("{{", config)
+            self.assertFalse(os.path.exists("tests/output/config/templates"))
+            self.assertFalse(os.path.exists("tests/output/config/settings"))
+
+            with open("tests/output/Dockerfile", "r", encoding="utf-8") as dockerfile:
+                self.assertNotIn("FC_ENABLE", dockerfile.read())
+
+            delete_output_folder()
+            create_output_folder()
+
+    def test_flat_compact(self):
+        """
+        Test if the compact flat krakend.json contains the same configuration without any whitespace
+        """
+        configs = []
+
+        for compact in [False, True]:
+            converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                         input_folder_path="tests/mock_data/full/",
+                                         output_folder_path="tests/output",
+                                         flat=True,
+                                         compact=compact)
+            converter.convert()
+
+            with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+                configs.append(config_file.read())
+
+        self.assertNotIn("\n", configs[1])
+        self.assertEqual(configs[1], json.dumps(json.loads(configs[0]), separators=(",", ":")))
+        self.assertEqual(json.loads(configs[1])["name"], "Test gateway")
+
+    def test_flat_env(self):
+        """
+        Test if the flat krakend.json uses the host of the chosen environment
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/environment/",
+                                     output_folder_path="tests/output",
+                                     env="dev",
+                                     flat=True)
+        converter.convert()
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            config_json = json.load(config_file)
+
+        with open("tests/mock_data/environment/OpenAPI.json", "r", encoding="utf-8") as spec_file:
+            servers = json.load(spec_file)["servers"]
+
+        host = next(server["url"] for server in servers if server.get("description") == "dev")
+
+        self.assertEqual({endpoint["backend"][0]["host"][0] for endpoint in config_json["endpoints"]}, {host})
+
+    def test_flat_template_value(self):
+        """
+        Test if a custom endpoint configuration containing "}}{{" is written unchanged to the flat krakend.json
+        """
+        converter = OpenAPIToKrakenD(logging_mode=logging.ERROR,
+                                     input_folder_path="tests/mock_data/template_value/",
+                                     output_folder_path="tests/output",
+                                     flat=True)
+        converter.convert()
+
+        with open("tests/output/config/krakend.json", "r", encoding="utf-8") as config_file:
+            config_json = json.load(config_file)
+
+        self.assertEqual(config_json["endpoints"][0]["extra_config"]["proxy"]["static"]["data"]["template"],
+                         "{{ .Host }}{{ .Path }}")
+
+    def test_multiple_envs(self):
+        """
+        Test if every environment gets its own service.json, sharing templates that are the same as a single
+        environment conversion, while parsing every spec once
+        """
+        expected = {}
+
+        for env in ("prod", "dev"):
+            OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple_environments/", "tests/output", env=env).convert()
+
+            with open("tests/output/config/settings/service.json", "r", encoding="utf-8") as service_file:
+                expected[env] = service_file.read()
+
+        with open("tests/output/config/templates/Endpoints.tmpl", "r", encoding="utf-8") as endpoints_file:
+            endpoints = endpoints_file.read()
+
+        delete_output_folder()
+        create_output_folder()
+
+        with mock.patch("app.logic.converter.OpenAPISpec.load", wraps=OpenAPISpec.load) as load:
+            OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple_environments/", "tests/output",
+                             env=["prod", "dev"]).convert()
+
+        self.assertEqual(load.call_count, 2)
+        self.assertFalse(os.path.exists("tests/output/config/settings/service.json"))
+
+        for env in ("prod", "dev"):
+            with open(f"tests/output/config/settings/{env}/service.json", "r", encoding="utf-8") as service_file:
+                self.assertEqual(service_file.read(), expected[env])
+
+        with open("tests/output/config/templates/Endpoints.tmpl", "r", encoding="utf-8") as endpoints_file:
+            self.assertEqual(endpoints_file.read(), endpoints)
+
+        with open("tests/output/Dockerfile", "r", encoding="utf-8") as dockerfile:
+            self.assertIn('FC_SETTINGS="config/settings/${ENVIRONMENT}"', dockerfile.read())
+
+    def test_all_envs(self):
+        """
+        Test if every environment described by the servers of any spec is written, falling back to the first server
+        of specs without the environment
+        """
+        OpenAPIToKrakenD(logging.CRITICAL, "tests/mock_data/multiple_environments/", "tests/output",
+                         all_envs=True).convert()
+
+        self.assertEqual(sorted(os.listdir("tests/output/config/settings")), ["dev", "prod", "staging"])
+
+        with open("tests/output/config/settings/staging/service.json", "r", encoding="utf-8") as service_file:
+            self.assertEqual(json.load(service_file), {"BETSV1": "https://bets.f1-betting.staging",
+                                                       "USERSV1": "https://users.f1-betting.app"})
+
+    def test_all_envs_invalid_name(self):
+        """
+        Test if servers whose description can not be used as the name of a settings folder are skipped with a warning
+        """
+        os.makedirs("tests/output/input")
+
+        for filename in ("Bets.json", "Users.json"):
+            with open(f"tests/mock_data/multiple_environments/{filename}", "r", encoding="utf-8") as spec_file:
+                spec = json.load(spec_file)
+
+            for server in spec["servers"]:
+                if server["description"] == "staging":
+                    server["description"] = "Staging (EU/US)"
+
+            with open(f"tests/output/input/{filename}", "w", encoding="utf-8") as spec_file:
+                json.dump(spec, spec_file)
+
+        converter = OpenAPIToKrakenD(logging.WARNING, "tests/output/input", "tests/output", all_envs=True)
+
+        with self.assertLogs(converter.logger.get_logger(), logging.WARNING) as context_manager:
+            converter.convert()
+
+        self.assertEqual(sorted(os.listdir("tests/output/config/settings")), ["dev", "prod"])
+        self.assertIn("Staging (EU/US)", "".join(context_manager.output))
+
+    def test_switch_envs(self):
+        """
+        Test if the settings of the previous conversion are removed when switching between a single and multiple
+        environments
+        """
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple_environments/", "tests/output", env="prod").convert()
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple_environments/", "tests/output",
+                         env=["prod", "dev"]).convert()
+
+        self.assertEqual(sorted(os.listdir("tests/output/config/settings")), ["dev", "prod"])
+
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple_environments/", "tests/output",
+                         env=["prod"]).convert()
+
+        self.assertEqual(os.listdir("tests/output/config/settings"), ["prod"])
+
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple_environments/", "tests/output", env="dev").convert()
+
+        self.assertEqual(os.listdir("tests/output/config/settings"), ["service.json"])
+
+    def test_multiple_envs_incremental(self):
+        """
+        Test if a removed service.json of an environment is written again by an incremental build
+        """
+        converter = OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple_environments/", "tests/output",
+                                     env=["prod", "dev"], incremental=True)
+        converter.convert()
+
+        os.remove("tests/output/config/settings/dev/service.json")
+
+        with mock.patch("app.logic.converter.OpenAPISpec.load") as load:
+            converter.convert()
+
+        load.assert_not_called()
+        self.assertTrue(os.path.exists("tests/output/config/settings/dev/service.json"))
+
+    def test_shards(self):
+        """
+        Test if every shard gets its own configuration, with the same templates as a conversion without shards
+        Test if the routing map lists the shard of every prefix
+        """
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output").convert()
+
+        with open("tests/output/config/templates/BETS.tmpl", "r", encoding="utf-8") as template_file:
+            template = template_file.read()
+
+        delete_output_folder()
+        create_output_folder()
+
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output", shards=2).convert()
+
+        self.assertEqual(sorted(os.listdir("tests/output")), ["routing.json", "shard-1", "shard-2"])
+
+        with open("tests/output/routing.json", "r", encoding="utf-8") as routing_file:
+            routing = json.load(routing_file)
+
+        self.assertEqual(routing["prefixes"], {"/bets/v1": "shard-1", "/results/v2": "shard-2", "/users/v1": "shard-1"})
+        self.assertEqual(routing["shards"]["shard-1"]["specs"], ["Bets.json", "Users.json"])
+
+        with open("tests/output/shard-1/config/templates/BETS.tmpl", "r", encoding="utf-8") as template_file:
+            self.assertEqual(template_file.read(), template)
+
+        with open("tests/output/shard-2/config/settings/service.json", "r", encoding="utf-8") as service_file:
+            self.assertEqual(list(json.load(service_file)), ["RESULTSV2"])
+
+        self.assertEqual(sorted(os.listdir("tests/output/shard-2/config/templates")),
+                         ["Endpoints.tmpl", "RESULTS.tmpl"])
+        self.assertTrue(os.path.exists("tests/output/shard-1/Dockerfile"))
+        self.assertTrue(os.path.exists("tests/output/shard-2/config/krakend.json"))
+
+    def test_shards_flat(self):
+        """
+        Test if every shard gets a flat krakend.json containing only the endpoints of its specs
+        """
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output", flat=True,
+                         shard_groups={"public": ["Bets.json", "Results.json"], "internal": ["*"]}).convert()
+
+        with open("tests/output/internal/config/krakend.json", "r", encoding="utf-8") as config_file:
+            endpoints = json.load(config_file)["endpoints"]
+
+        self.assertEqual(len(endpoints), 10)
+        self.assertTrue(all(endpoint["endpoint"].startswith("/users/v1/") for endpoint in endpoints))
+
+    def test_stale_shards(self):
+        """
+        Test if the shards of a previous conversion that are not part of the current conversion are removed
+        """
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output", shards=3).convert()
+
+        self.assertEqual(sorted(os.listdir("tests/output")), ["routing.json", "shard-1", "shard-2", "shard-3"])
+
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output", shards=2).convert()
+
+        self.assertEqual(sorted(os.listdir("tests/output")), ["routing.json", "shard-1", "shard-2"])
+
+        OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output", flat=True,
+                         shard_groups={"public": ["Bets.json", "Results.json"], "internal": ["*"]}).convert()
+
+        self.assertEqual(sorted(os.listdir("tests/output")), ["internal", "public", "routing.json"])
+
+    def test_shards_incremental(self):
+        """
+        Test if building shards incrementally logs a warning, as shards are always generated completely
+        """
+        with self.assertLogs("app.utils.customlogger", logging.WARNING) as context_manager:
+            OpenAPIToKrakenD(logging.WARNING, "tests/mock_data/multiple/", "tests/output", shards=2, incremental=True)
+
+        self.assertIn("ignoring incremental", "".join(context_manager.output))
+
+    def test_invalid_shards(self):
+        """
+        Test if invalid shard options raise a ValueError
+        """
+        invalid = [{"shards": 0}, {"shards": 2, "shard_by": "size"}, {"shards": 2, "shard_groups": {"a": ["*"]}},
+                   {"shard_groups": {"../a": ["*"]}}]
+
+        for options in invalid:
+            with self.assertRaises(ValueError, msg=options):
+                OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output", **options)
+
+        with self.assertRaises(ValueError):
+            OpenAPIToKrakenD(logging.ERROR, "tests/mock_data/multiple/", "tests/output",
+                             shard_groups={"public": ["Bets.json"]}).convert()
+
+        self.assertEqual(os.listdir("tests/output"), [])